@@ -0,0 +1,96 @@
+"""
+    Board memory benchmark:
+    Compares the memory of the in-memory Board representations: the former dictionary per Board and the slotted
+    BoardRecord. For every representation the given number of small Boards is built like the server does it and the
+    allocated memory is measured with tracemalloc. The payload strings are shared, so only the overhead is measured.
+
+    Usage: python -m benchmarks.board_memory_benchmark [-n <boards>]
+"""
+
+# =====Imports=========================================
+import sys
+import time
+import getopt
+import tracemalloc
+
+from src.board_record import BoardRecord
+
+
+# =====Constants=======================================
+DATA = "x" * 16
+
+
+# =====Functions=======================================
+def build_dicts(boards: int) -> dict:
+    """
+    Build the Boards as dictionaries (the representation before BoardRecord).
+
+    param - {int} - boards - The number of Boards
+
+    return boards by name
+    """
+    return {f"board{index}": {"valid_sec": float(index % 1000), "entry_time": time.time(), "data": DATA,
+                              "version": index % 7}
+            for index in range(boards)}
+
+
+def build_records(boards: int) -> dict:
+    """
+    Build the Boards as BoardRecords.
+
+    param - {int} - boards - The number of Boards
+
+    return boards by name
+    """
+    return {f"board{index}": BoardRecord(float(index % 1000), time.time(), DATA, index % 7)
+            for index in range(boards)}
+
+
+def measure(build, boards: int) -> tuple:
+    """
+    Measure the memory allocated for the Boards built by the given function.
+
+    param - {function} - build - Builds the Boards
+    param - {int} - boards - The number of Boards
+
+    return (total bytes, bytes per Board)
+    """
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = build(boards)
+        total = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del result
+    return total, total / boards
+
+
+def main(argv: list) -> None:
+    """
+    Parse the arguments, measure both representations and print the results as a table.
+
+    param - {list} - argv - A list of the arguments
+    """
+    try:
+        opts, args = getopt.getopt(argv, "n:", ["boards="])
+    except getopt.GetoptError:
+        print("[ERROR] Invalid arguments.")
+        sys.exit()
+    boards = 1000000
+    for o, a in opts:
+        if o in ("-n", "--boards"):
+            boards = int(a)
+
+    results = [("dict", *measure(build_dicts, boards)), ("BoardRecord", *measure(build_records, boards))]
+
+    print(f"{boards} Boards with a shared payload of {len(DATA)} characters (names and dictionary included)")
+    print(f"{'representation':<16}{'total MB':>10}{'B/Board':>10}")
+    for name, total, per_board in results:
+        print(f"{name:<16}{total / 1024 / 1024:>10.1f}{per_board:>10.1f}")
+    print(f"Saved per Board: {results[0][2] - results[1][2]:.1f} bytes "
+          f"({(1 - results[1][1] / results[0][1]) * 100:.0f}% of the total)")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
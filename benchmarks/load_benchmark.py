@@ -0,0 +1,347 @@
+"""
+    Load benchmark:
+    Measures the throughput and latency of the RPC server end to end. A server is started on localhost in a temporary
+    directory and driven by concurrent RPyC clients, every client runs in its own process with its own connection.
+    Each client picks its operations randomly according to the configured mix (create, display, read, status, list)
+    for the given duration. The calls of the warm-up phase are not measured.
+    The ops/s and the p50/p95/p99 latency per method are printed and optionally written to a json file, so the
+    results of different releases or server options can be compared.
+
+    Usage: python -m benchmarks.load_benchmark [-c <clients>] [-d <seconds>] [-w <warm-up seconds>]
+                                               [-m <mix, e.g. read=60,display=20,status=10,create=5,list=5>]
+                                               [-s <payload size>] [-b <boards>] [--storage <mode>]
+                                               [--server-args "<further server options>"] [-p <port>]
+                                               [-o <json file>]
+"""
+
+# =====Imports=========================================
+import os
+import sys
+import time
+import json
+import shlex
+import random
+import getopt
+import platform
+import tempfile
+import subprocess
+import multiprocessing
+from queue import Empty
+from datetime import datetime
+import rpyc
+
+from benchmarks.server_modes_benchmark import SERVER, percentile
+
+
+# =====Constants=======================================
+# The exposed method called for every operation of the mix
+OPERATIONS = {"create": "create_blackboard", "display": "display_blackboard", "read": "read_blackboard",
+              "status": "get_blackboard_status", "list": "list_blackboards"}
+DEFAULT_MIX = {"read": 60, "display": 20, "status": 10, "create": 5, "list": 5}
+# Time in seconds the results of the clients are awaited after the end of the run
+RESULT_TIMEOUT = 30
+
+
+# =====Functions=======================================
+def parse_mix(text: str) -> dict:
+    """
+    Parse an operation mix like "read=60,display=40".
+
+    param - {str} - text - The operations with their weights
+
+    return weights by operation
+    """
+    mix = {}
+    for item in text.split(","):
+        operation, weight = item.split("=")
+        if operation not in OPERATIONS:
+            raise ValueError(f"Unknown operation '{operation}'")
+        if float(weight) > 0:
+            mix[operation] = float(weight)
+    if len(mix) == 0:
+        raise ValueError("The weights of the mix must not all be 0")
+    return mix
+
+
+def start_server(port: int, directory: str, server_args: list) -> subprocess.Popen:
+    """
+    Start a server process and wait until it accepts connections.
+
+    param - {int} - port - The port of the server
+    param - {str} - directory - The working directory (for the persistence files and log.csv)
+    param - {list} - server_args - Further options of the server (e.g. the storage)
+
+    return process
+    """
+    process = subprocess.Popen([sys.executable, SERVER, "-p", str(port), "--log-level", "OFF", *server_args],
+                               cwd=directory, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 10
+    while time.time() < deadline:
+        try:
+            rpyc.connect("localhost", port).close()
+            return process
+        except OSError:
+            if process.poll() is not None:
+                break
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError(f"The server with the options {server_args} did not start.")
+
+
+def create_boards(port: int, boards: int, payload_size: int) -> None:
+    """
+    Create the Boards the clients work on and fill them with data.
+
+    param - {int} - port - The port of the server
+    param - {int} - boards - The number of Boards
+    param - {int} - payload_size - The size of the data in bytes
+    """
+    connection = rpyc.connect("localhost", port)
+    try:
+        data = "x" * payload_size
+        names = [f"board{index}" for index in range(boards)]
+        for name in names:
+            connection.root.create_blackboard(name, 3600)
+        # Pass the data as tuple, RPyC transfers lists by reference
+        for start in range(0, boards, 1000):
+            connection.root.display_blackboards(tuple((name, data) for name in names[start:start + 1000]))
+    finally:
+        connection.close()
+
+
+def run_client(index: int, port: int, config: dict, measure_from: float, end: float,
+               results: multiprocessing.Queue) -> None:
+    """
+    Client process: Call random operations of the mix until the end and put the latencies of the calls after
+    measure_from into the result queue. The result is put even if the client fails, with the error as message.
+
+    param - {int} - index - The number of the client (seed of the random operations)
+    param - {int} - port - The port of the server
+    param - {dict} - config - The configuration of the benchmark (mix, boards, payload_size)
+    param - {float} - measure_from - The time the measurement starts (end of the warm-up)
+    param - {float} - end - The time the client stops
+    param - {Queue} - results - Receives (latencies by operation, errors by operation, error message OR None)
+    """
+    rand = random.Random(index)
+    operations = list(config["mix"])
+    weights = [config["mix"][operation] for operation in operations]
+    data = "x" * config["payload_size"]
+    latencies = {operation: [] for operation in operations}
+    errors = {operation: 0 for operation in operations}
+    created = 0
+    failure = None
+
+    try:
+        connection = rpyc.connect("localhost", port)
+    except OSError as e:
+        results.put((latencies, errors, f"Client {index} could not connect: {e}"))
+        return
+    try:
+        methods = {operation: getattr(connection.root, OPERATIONS[operation]) for operation in operations}
+        while True:
+            now = time.time()
+            if now >= end:
+                break
+            operation = rand.choices(operations, weights)[0]
+            if operation == "create":
+                args = (f"client{index}-{created}", 3600)
+                created += 1
+            elif operation == "display":
+                args = (f"board{rand.randrange(config['boards'])}", data)
+            elif operation == "list":
+                args = ()
+            else:
+                args = (f"board{rand.randrange(config['boards'])}",)
+
+            start = time.perf_counter()
+            result = methods[operation](*args)
+            latency = time.perf_counter() - start
+            if now >= measure_from:
+                latencies[operation].append(latency)
+                if not result[0]:
+                    errors[operation] += 1
+    except Exception as e:
+        failure = f"Client {index} failed: {e!r}"
+    finally:
+        connection.close()
+        results.put((latencies, errors, failure))
+
+
+def collect_results(results: multiprocessing.Queue, clients: list, deadline: float) -> list:
+    """
+    Read the result of every client. Stops waiting if the clients which didn't report died (e.g. killed) or the
+    deadline passed, so a lost client doesn't block the benchmark.
+
+    param - {Queue} - results - The result queue of the clients
+    param - {list} - clients - The client processes
+    param - {float} - deadline - The time until the results are awaited
+
+    return results of the clients
+    """
+    client_results = []
+    while len(client_results) < len(clients):
+        try:
+            client_results.append(results.get(timeout=1))
+        except Empty:
+            # Every client puts its result before it exits, so a queue still empty after all exited means a lost one
+            if all(client.exitcode is not None for client in clients) and results.empty():
+                break
+            if time.time() > deadline:
+                break
+    lost = len(clients) - len(client_results)
+    if lost > 0:
+        exit_codes = [client.exitcode for client in clients]
+        print(f"[WARNING] {lost} clients did not report their results (exit codes: {exit_codes}).")
+    return client_results
+
+
+def summarize(latencies: list, errors: int, duration: float) -> dict:
+    """
+    Return the statistics of the calls of one operation.
+
+    param - {list} - latencies - The latencies in seconds
+    param - {int} - errors - The number of calls which returned False
+    param - {float} - duration - The measured time in seconds
+
+    return statistics (the latencies are None without calls)
+    """
+    latencies = sorted(latencies)
+    measured = len(latencies) > 0
+    return {
+        "calls": len(latencies),
+        "errors": errors,
+        "ops_per_s": len(latencies) / duration,
+        "mean_ms": sum(latencies) / len(latencies) * 1000 if measured else None,
+        "p50_ms": percentile(latencies, 0.50) * 1000 if measured else None,
+        "p95_ms": percentile(latencies, 0.95) * 1000 if measured else None,
+        "p99_ms": percentile(latencies, 0.99) * 1000 if measured else None,
+    }
+
+
+def benchmark(config: dict) -> dict:
+    """
+    Start the server, create the Boards, run the clients and collect the results.
+
+    param - {dict} - config - The configuration of the benchmark
+
+    return results
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        process = start_server(config["port"], directory, ["-s", config["storage"], *config["server_args"]])
+        try:
+            create_boards(config["port"], config["boards"], config["payload_size"])
+
+            # The clients start together after a short delay for the process start
+            results = multiprocessing.Queue()
+            start = time.time() + 1
+            measure_from = start + config["warmup"]
+            end = measure_from + config["duration"]
+            clients = [multiprocessing.Process(target=run_client, args=(index, config["port"], config, measure_from,
+                                                                         end, results))
+                       for index in range(config["clients"])]
+            for client in clients:
+                client.start()
+            # Read the results before joining, a process with a full queue doesn't terminate
+            client_results = collect_results(results, clients, end + RESULT_TIMEOUT)
+            for client in clients:
+                client.join()
+        finally:
+            process.terminate()
+            process.wait()
+
+    latencies = {operation: [] for operation in config["mix"]}
+    errors = {operation: 0 for operation in config["mix"]}
+    for client_latencies, client_errors, failure in client_results:
+        if failure is not None:
+            print(f"[WARNING] {failure}")
+        for operation in config["mix"]:
+            latencies[operation].extend(client_latencies[operation])
+            errors[operation] += client_errors[operation]
+
+    duration = config["duration"]
+    return {
+        "total": summarize([latency for values in latencies.values() for latency in values],
+                           sum(errors.values()), duration),
+        "methods": {OPERATIONS[operation]: summarize(latencies[operation], errors[operation], duration)
+                    for operation in config["mix"]},
+    }
+
+
+def revision() -> str:
+    """
+    Return the git commit of the benchmarked code.
+
+    return commit hash OR "unknown"
+    """
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=os.path.dirname(SERVER), capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main(argv: list) -> None:
+    """
+    Parse the arguments, run the benchmark, print the results as a table and write them to the json file.
+
+    param - {list} - argv - A list of the arguments
+    """
+    try:
+        opts, args = getopt.getopt(argv, "c:d:w:m:s:b:p:o:", ["clients=", "duration=", "warmup=", "mix=",
+                                                              "payload-size=", "boards=", "storage=",
+                                                              "server-args=", "port=", "output="])
+    except getopt.GetoptError:
+        print("[ERROR] Invalid arguments.")
+        sys.exit()
+    config = {"clients": 8, "duration": 10.0, "warmup": 1.0, "mix": DEFAULT_MIX, "payload_size": 100,
+              "boards": 1000, "storage": "json", "server_args": [], "port": 18950}
+    output = None
+    try:
+        for o, a in opts:
+            if o in ("-c", "--clients"):
+                config["clients"] = int(a)
+            elif o in ("-d", "--duration"):
+                config["duration"] = float(a)
+            elif o in ("-w", "--warmup"):
+                config["warmup"] = float(a)
+            elif o in ("-m", "--mix"):
+                config["mix"] = parse_mix(a)
+            elif o in ("-s", "--payload-size"):
+                config["payload_size"] = int(a)
+            elif o in ("-b", "--boards"):
+                config["boards"] = int(a)
+            elif o == "--storage":
+                config["storage"] = a
+            elif o == "--server-args":
+                config["server_args"] = shlex.split(a)
+            elif o in ("-p", "--port"):
+                config["port"] = int(a)
+            elif o in ("-o", "--output"):
+                output = a
+    except ValueError as e:
+        print(f"[ERROR] Invalid arguments: {e}")
+        sys.exit()
+    if config["clients"] < 1 or config["boards"] < 1 or config["duration"] <= 0:
+        print("[ERROR] Clients, Boards and duration must be greater than 0.")
+        sys.exit()
+
+    results = benchmark(config)
+
+    print(f"{config['clients']} clients for {config['duration']:g} s, {config['boards']} Boards with "
+          f"{config['payload_size']} bytes, storage {config['storage']} {' '.join(config['server_args'])}")
+    print(f"{'method':<24}{'calls':>9}{'errors':>8}{'ops/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for method, result in [*results["methods"].items(), ("total", results["total"])]:
+        print(f"{method:<24}{result['calls']:>9}{result['errors']:>8}{result['ops_per_s']:>10.0f}"
+              + "".join(f"{result[key]:>9.2f}" if result[key] is not None else f"{'-':>9}"
+                        for key in ("p50_ms", "p95_ms", "p99_ms")))
+
+    if output is not None:
+        with open(output, 'w') as file:
+            json.dump({"benchmark": "load", "time": datetime.now().isoformat(), "revision": revision(),
+                       "python": platform.python_version(), "platform": platform.platform(), "config": config,
+                       **results}, file, indent=4)
+        print(f"[INFO] Results written to {output}.")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
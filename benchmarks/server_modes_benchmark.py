@@ -0,0 +1,217 @@
+"""
+    Server modes benchmark:
+    Compares the threaded server (one thread per client) with the event-loop server (fixed pool of worker threads).
+    For every mode a server is started in a temporary directory. The benchmark opens many idle connections, measures
+    the threads and memory of the server process and then the latency of reads from concurrent active clients.
+
+    Usage: python -m benchmarks.server_modes_benchmark [-c <connections>] [-a <active clients>] [-r <requests>]
+"""
+
+# =====Imports=========================================
+import os
+import sys
+import time
+import getopt
+import tempfile
+import subprocess
+from threading import Thread
+import rpyc
+
+
+# =====Constants=======================================
+SERVER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "blackboard_server.py")
+MODES = {"threaded": [], "event-loop": ["--event-loop", "--threads", "8"]}
+
+
+# =====Functions=======================================
+def start_server(mode: str, port: int, directory: str) -> subprocess.Popen:
+    """
+    Start a server process in the given mode and wait until it accepts connections.
+
+    param - {str} - mode - The key of the mode in MODES
+    param - {int} - port - The port of the server
+    param - {str} - directory - The working directory (for boards.json and log.csv)
+
+    return process
+    """
+    process = subprocess.Popen([sys.executable, SERVER, "-p", str(port), "--log-level", "OFF"] + MODES[mode],
+                               cwd=directory, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 10
+    while time.time() < deadline:
+        try:
+            rpyc.connect("localhost", port).close()
+            return process
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError(f"The server ({mode}) did not start.")
+
+
+def process_status(pid: int) -> dict:
+    """
+    Return the number of threads and the resident memory (in kB) of a process (Linux only).
+
+    param - {int} - pid - The process id
+
+    return {"threads": ..., "rss_kb": ...}
+    """
+    status = {"threads": None, "rss_kb": None}
+    try:
+        with open(f"/proc/{pid}/status", 'r') as file:
+            for line in file:
+                if line.startswith("Threads:"):
+                    status["threads"] = int(line.split()[1])
+                elif line.startswith("VmRSS:"):
+                    status["rss_kb"] = int(line.split()[1])
+    except OSError:
+        pass
+    return status
+
+
+def percentile(values: list, share: float) -> float:
+    """
+    Return the percentile of the given (sorted) values.
+
+    param - {list} - values - The sorted values
+    param - {float} - share - The percentile between 0 and 1
+
+    return value
+    """
+    if len(values) == 0:
+        return float("nan")
+    return values[min(len(values) - 1, int(share * len(values)))]
+
+
+def run_clients(port: int, active: int, requests: int) -> tuple:
+    """
+    Let several clients read a Board concurrently, each with its own connection.
+
+    param - {int} - port - The port of the server
+    param - {int} - active - The number of concurrent clients
+    param - {int} - requests - The number of reads per client
+
+    return (sorted latencies in seconds, duration in seconds)
+    """
+    latencies = []
+
+    def client():
+        connection = rpyc.connect("localhost", port)
+        try:
+            own = []
+            for _ in range(requests):
+                start = time.perf_counter()
+                connection.root.read_blackboard("benchmark")
+                own.append(time.perf_counter() - start)
+            latencies.extend(own)
+        finally:
+            connection.close()
+
+    threads = [Thread(target=client) for _ in range(active)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sorted(latencies), time.perf_counter() - start
+
+
+def benchmark(mode: str, port: int, connections: int, active: int, requests: int) -> dict:
+    """
+    Run the benchmark for one server mode.
+
+    param - {str} - mode - The key of the mode in MODES
+    param - {int} - port - The port of the server
+    param - {int} - connections - The number of idle connections
+    param - {int} - active - The number of concurrent active clients
+    param - {int} - requests - The number of reads per active client
+
+    return results
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        process = start_server(mode, port, directory)
+        idle = []
+        try:
+            setup = rpyc.connect("localhost", port)
+            setup.root.create_blackboard("benchmark", 60)
+            setup.root.display_blackboard("benchmark", "x" * 100)
+            setup.close()
+            baseline = process_status(process.pid)
+
+            # Open the idle connections
+            start = time.perf_counter()
+            for _ in range(connections):
+                try:
+                    idle.append(rpyc.connect("localhost", port))
+                except OSError:
+                    break
+            connect_time = time.perf_counter() - start
+            # Give the server time to start the threads of the connections
+            time.sleep(1)
+            loaded = process_status(process.pid)
+
+            latencies, duration = run_clients(port, active, requests)
+        finally:
+            for connection in idle:
+                connection.close()
+            process.terminate()
+            process.wait()
+
+    return {
+        "mode": mode,
+        "connections": len(idle),
+        "connect_time_s": connect_time,
+        "threads": loaded["threads"],
+        "rss_mb": (loaded["rss_kb"] or 0) / 1024,
+        "rss_per_connection_kb": ((loaded["rss_kb"] or 0) - (baseline["rss_kb"] or 0)) / max(1, len(idle)),
+        "ops_per_s": len(latencies) / duration,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+    }
+
+
+def main(argv: list) -> None:
+    """
+    Parse the arguments, run the benchmark for every server mode and print the results as a table.
+
+    param - {list} - argv - A list of the arguments
+    """
+    try:
+        opts, args = getopt.getopt(argv, "c:a:r:p:", ["connections=", "active=", "requests=", "port="])
+    except getopt.GetoptError:
+        print("[ERROR] Invalid arguments.")
+        sys.exit()
+    connections = 2000
+    active = 16
+    requests = 500
+    port = 18900
+    for o, a in opts:
+        if o in ("-c", "--connections"):
+            connections = int(a)
+        elif o in ("-a", "--active"):
+            active = int(a)
+        elif o in ("-r", "--requests"):
+            requests = int(a)
+        elif o in ("-p", "--port"):
+            port = int(a)
+
+    # Every connection needs a file descriptor in the client and in the server
+    try:
+        import resource
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+    except (ImportError, ValueError, OSError):
+        pass
+
+    results = [benchmark(mode, port + index, connections, active, requests) for index, mode in enumerate(MODES)]
+
+    print(f"{connections} idle connections, {active} active clients with {requests} reads each")
+    print(f"{'mode':<12}{'conns':>8}{'connect s':>11}{'threads':>9}{'RSS MB':>9}{'kB/conn':>9}"
+          f"{'ops/s':>10}{'p50 ms':>9}{'p99 ms':>9}")
+    for result in results:
+        print(f"{result['mode']:<12}{result['connections']:>8}{result['connect_time_s']:>11.2f}"
+              f"{str(result['threads']):>9}{result['rss_mb']:>9.1f}{result['rss_per_connection_kb']:>9.1f}"
+              f"{result['ops_per_s']:>10.0f}{result['p50_ms']:>9.2f}{result['p99_ms']:>9.2f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,128 @@
+"""
+    Startup benchmark:
+    Measures how long BlackBoardHost.load_boards takes (the time before the server accepts connections) for different
+    numbers of Boards and the three ways to load them:
+    "json": Parse the complete board.json file.
+    "journal": Replay a journal with a create and a display record per Board.
+    "snapshot": Load a binary snapshot and replay a short journal tail.
+    The files are generated in a temporary directory before the measurement.
+
+    Usage: python -m benchmarks.startup_benchmark [-s <sizes, e.g. 1000,10000>] [-t <tail records>]
+"""
+
+# =====Imports=========================================
+import os
+import sys
+import time
+import getopt
+import tempfile
+
+import src.logger as logger
+import src.payload as payload
+from blackboard_server import BlackBoardHost
+from src.board_record import BoardRecord
+from src.journal import Journal
+from src.snapshot import write_snapshot
+
+
+# =====Functions=======================================
+def build_boards(size: int) -> dict:
+    """
+    Build the given number of Boards with small data.
+
+    param - {int} - size - The number of Boards
+
+    return BoardRecords by name
+    """
+    now = time.time()
+    return {f"board{index}": BoardRecord(1000.0, now, f"data{index}", 1) for index in range(size)}
+
+
+def write_files(path: str, boards: dict, tail: int) -> None:
+    """
+    Write the persistence files of all modes.
+
+    param - {str} - path - The storage path without extension
+    param - {dict} - boards - The BoardRecords by name
+    param - {int} - tail - The number of journal records after the snapshot
+    """
+    with open(path + '-json.json', 'w') as file:
+        payload.dump(boards, file, sort_keys=True, indent=4)
+
+    journal = Journal(path + '-journal.journal')
+    records = []
+    for name, board in boards.items():
+        records.append({"op": "create", "name": name, "valid_sec": board.valid_sec, "entry_time": board.entry_time})
+        records.append({"op": "display", "name": name, "entry_time": board.entry_time, "data": board.data,
+                        "version": board.version})
+        if len(records) >= 10000:
+            journal.write(records)
+            records = []
+    journal.write(records)
+    journal.close()
+
+    write_snapshot(path + '-snapshot.snapshot', "benchmark", boards)
+    journal = Journal(path + '-snapshot.journal')
+    journal.append({"op": "checkpoint", "id": "benchmark"})
+    names = list(boards)
+    journal.write([{"op": "display", "name": names[index % len(names)], "entry_time": time.time(),
+                    "data": f"tail{index}", "version": 2 + index} for index in range(tail)])
+    journal.close()
+
+
+def measure(mode: str, path: str) -> float:
+    """
+    Measure the time of load_boards for one mode.
+
+    param - {str} - mode - "json", "journal" or "snapshot"
+    param - {str} - path - The storage path without extension
+
+    return seconds
+    """
+    BlackBoardHost.set_storage("json" if mode == "json" else "journal")
+    BlackBoardHost.set_storage_path(f"{path}-{mode}")
+    BlackBoardHost.set_snapshot_records(0)
+    start = time.perf_counter()
+    BlackBoardHost.load_boards()
+    duration = time.perf_counter() - start
+    BlackBoardHost.close_storage()
+    return duration
+
+
+def main(argv: list) -> None:
+    """
+    Parse the arguments, run the benchmark for every size and print the results as a table.
+
+    param - {list} - argv - A list of the arguments
+    """
+    try:
+        opts, args = getopt.getopt(argv, "s:t:", ["sizes=", "tail="])
+    except getopt.GetoptError:
+        print("[ERROR] Invalid arguments.")
+        sys.exit()
+    sizes = [1000, 10000, 100000, 1000000]
+    tail = 1000
+    for o, a in opts:
+        if o in ("-s", "--sizes"):
+            sizes = [int(size) for size in a.split(",")]
+        elif o in ("-t", "--tail"):
+            tail = int(a)
+
+    logger.set_log_level("OFF")
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            path = os.path.join(directory, f"boards{size}")
+            write_files(path, build_boards(size), tail)
+            results.append((size, *(measure(mode, path) for mode in ("json", "journal", "snapshot"))))
+            for name in os.listdir(directory):
+                os.remove(os.path.join(directory, name))
+
+    print(f"Time of load_boards in seconds (snapshot with a journal tail of {tail} records)")
+    print(f"{'boards':>10}{'json':>10}{'journal':>10}{'snapshot':>10}")
+    for size, json_time, journal_time, snapshot_time in results:
+        print(f"{size:>10}{json_time:>10.3f}{journal_time:>10.3f}{snapshot_time:>10.3f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -6,24 +6,128 @@
 
 # =====Imports=========================================
 import sys
+import gc
 import time
-import json
+import os
 import getopt
-from threading import Lock
+import signal
+import functools
+import subprocess
+from threading import Lock, Thread, Event
+from contextlib import nullcontext
 from datetime import datetime
 import rpyc
 from rpyc.utils.server import ThreadedServer
 from typing import Union  # for better type hints
 
 import src.logger as logger
-from src.lock_timeout import lock_timeout
+import src.payload as payload
+from src.lock_timeout import lock_timeout, locks_timeout
+from src.rw_lock import ReadWriteLock
+from src.journal import apply_record
+from src.group_commit import GroupCommitter, parse_durability
+from src.notifier import Notifier
+from src.event_loop_server import EventLoopServer, blocking
+from src.admission import AdmissionController
+from src.shard_router import ShardRouter
+from src.replication import ReplicationLog, Replicator
+from src.expiry_index import ExpiryIndex
+from src.name_index import NameIndex
+from src.board_record import BoardRecord
+from src.storage import StorageBackend, MemoryStorage, JsonStorage, JournalStorage, ON_DISK
+from src.disk_store import DiskStore
 
 
 # =====Service Class===================================
 class BlackBoardHost(rpyc.Service):
     # static variables
     __boards = {}
-    __board_lock = Lock()
+    # The board lock protects the structure of __boards (create, delete, list), the striped locks the single Boards.
+    # Both are reader-writer locks, so reading operations don't wait on each other.
+    __board_lock = ReadWriteLock()
+    # The last version given to a Board. All Boards take their versions from this one sequence, so a deleted and
+    # recreated Board never gets a version again which a client may still hold (see __next_version)
+    __last_version = 0
+    __version_lock = Lock()
+    __stripe_locks = [ReadWriteLock() for _ in range(64)]
+    # In copy-on-write mode __boards is an immutable snapshot which is replaced by the writers
+    __copy_on_write = False
+    __publish_lock = Lock()
+    __notifier = Notifier()
+    # Maximum waiting time of a long-poll (below the 30 seconds request timeout of RPyC)
+    MAX_POLL_TIMEOUT = 25
+    # Maximum number of names per page of exposed_list_blackboards_page
+    MAX_PAGE_SIZE = 1000
+    __storage = "json"
+    # Path of the persistence files without extension (<path>.json, <path>.journal or <path>.sqlite)
+    __storage_path = "boards"
+    # Persists the Boards, replaced by load_boards (until then the Boards are stored in the json file)
+    __backend = JsonStorage(__storage_path)
+    __durability = ("always", 0)
+    # Sqlite mode: Maximum size of the cached data in bytes
+    __cache_bytes = 64 * 1024 * 1024
+    __committer = None
+    # Limits the concurrently served requests (None: no limit)
+    __admission = None
+    # Replication: A primary keeps the latest mutation records for its replicas, a replica runs a replicator
+    __replication_log = None
+    __replication_max_records = 10000
+    __replicator = None
+    # The Boards with data ordered by the time the data expires, maintained by __publish
+    __expiry = ExpiryIndex()
+    # The sorted names of all Boards, maintained by __publish
+    __names = NameIndex()
+    __sweeper = None
+    __sweeper_stop = Event()
+    # Maximum size of the data of a Board in bytes (None: no limit)
+    __max_payload_size = None
+    # Data larger than this size in bytes is kept compressed in memory and in the persistence file (None: never)
+    __compression_threshold = None
+    # Journal mode: A snapshot is written as soon as the journal has this number of records (0: never)
+    __snapshot_records = 100000
+    __compaction_lock = Lock()
+    __compactor = None
+    __compactor_stop = Event()
+
+    def __admission_controlled(method):
+        """
+        Decorator for the exposed methods: The call is only served if the admission control admits it. Otherwise it
+        is rejected immediately with an [OVERLOAD] message instead of waiting for the locks.
+
+        param - {function} - method - The exposed method
+
+        return wrapped method
+        """
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            admission = BlackBoardHost.__admission
+            if admission is None:
+                return method(self, *args, **kwargs)
+            with admission.admit() as admitted:
+                if admitted:
+                    return method(self, *args, **kwargs)
+            return_value = (False, "[OVERLOAD] The server is overloaded. Request rejected. Try again later.")
+            self.log_call(method.__name__, (*args, *kwargs.values()), return_value)
+            return return_value
+        return wrapper
+
+    def __primary_only(method):
+        """
+        Decorator for the mutating exposed methods: A read-only replica rejects the call, the changes have to be sent
+        to the primary.
+
+        param - {function} - method - The exposed method
+
+        return wrapped method
+        """
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if BlackBoardHost.__replicator is None:
+                return method(self, *args, **kwargs)
+            return_value = (False, "[ERROR] This server is a read-only replica! Please send changes to the primary.")
+            self.log_call(method.__name__, (*args, *kwargs.values()), return_value)
+            return return_value
+        return wrapper
 
     def __init__(self):
         """
@@ -51,8 +155,11 @@ class BlackBoardHost(rpyc.Service):
 
         param - {rpyc.core.protocol.Connection} - conn - The (former) connection with the client
         """
+        self.__notifier.unsubscribe_owner(self)
         logger.write_in_log([datetime.now(), "Client-Disconnect", *self.__client_address])
 
+    @__primary_only
+    @__admission_controlled
     def exposed_create_blackboard(self, name: str, valid_sec: Union[float, int, str]) -> tuple:
         """
         Create a new empty Blackboard.
@@ -80,51 +187,64 @@ class BlackBoardHost(rpyc.Service):
         if return_value is None and valid_sec <= 0:
             return_value = (False, f"[ERROR] The valid time must be greater or equal to 0! Given value: {valid_sec}.")
 
+        ticket = 0
         if return_value is None:
-            with lock_timeout(self.__board_lock, 10) as acquired:
+            with locks_timeout([self.__board_lock.write, self.__stripe_lock(name).write], 10) as acquired:
                 if acquired:
                     if name in self.__boards:
                         # Blackboard name already used
                         return_value = (False, f"[ERROR] Board name '{name}' already exists!")
                     else:
                         # Create new Blackboard
-                        new_blackboard = {
-                            "valid_sec": valid_sec,
-                            "entry_time": time.time(),
-                            "data": None
-                        }
+                        new_blackboard = BoardRecord(valid_sec, time.time(), version=self.__next_version())
                         # Add to __boards
-                        self.__boards[name] = new_blackboard
-                        self.__save_boards()
+                        self.__publish(name, new_blackboard)
+                        ticket = self.__persist({"op": "create", "name": name, "valid_sec": valid_sec,
+                                                 "entry_time": new_blackboard.entry_time,
+                                                 "version": new_blackboard.version})
                         return_value = (True, f"[INFO] Successfully created Board '{name}'!")
                 else:
                     # Timeout
                     return_value = (False, "[TIMEOUT] The server is too busy. Board not created. Try again later.")
 
+        # Wait until the Board is persisted according to the durability policy
+        return_value = self.__wait_for_durability(ticket, return_value)
+
         # Log and return
         self.log_call("exposed_create_blackboard", (name, valid_sec), return_value)
         return return_value
 
-    def exposed_display_blackboard(self, name: str, data: str) -> tuple:
+    @__primary_only
+    @__admission_controlled
+    def exposed_display_blackboard(self, name: str, data: Union[str, bytes]) -> tuple:
         """
         Update the data of the Blackboard and refresh the timestamp.
+        Binary data (bytes) is stored and returned as it is, any other data is converted to a string.
 
         param - {str} - name - Name of the existing Blackboard
-        param - {str} - data - Given data written to the Blackboard
+        param - {str or bytes} - data - Given data written to the Blackboard
 
         return (successful?, message)
         """
         # To be sure the string parameters are a string
         name = str(name)
-        data = str(data)
+        data = payload.normalize_data(data)
+        # Compress large data before the lock is taken
+        stored_data = self.__stored_data(data)
 
-        with lock_timeout(self.__board_lock, 10) as acquired:
+        ticket = 0
+        with lock_timeout(self.__stripe_lock(name).write, 10) as acquired:
             if acquired:
-                if name in self.__boards:
-                    # Update the Blackboard information
-                    self.__boards[name]["entry_time"] = time.time()
-                    self.__boards[name]["data"] = data
-                    self.__save_boards()
+                if not self.__payload_size_allowed(data):
+                    return_value = self.__payload_too_large()
+                elif name in self.__boards:
+                    # Update the Blackboard information (replaced as a whole, so a concurrent save sees no half update)
+                    entry_time = time.time()
+                    version = self.__next_version(self.__boards[name])
+                    self.__publish(name, self.__boards[name].replace(entry_time=entry_time, data=stored_data,
+                                                                     version=version))
+                    ticket = self.__persist({"op": "display", "name": name, "entry_time": entry_time,
+                                             "data": stored_data, "version": version})
                     return_value = (True, "[INFO] Board successfully updated!")
                 else:
                     # Blackboard does not exist
@@ -133,10 +253,76 @@ class BlackBoardHost(rpyc.Service):
                 # Timeout
                 return_value = (False, "[TIMEOUT] The server is too busy. Board not updated. Try again later.")
 
+        # Wait until the change is persisted according to the durability policy
+        return_value = self.__wait_for_durability(ticket, return_value)
+
         # Log and return
         self.log_call("exposed_display_blackboard", (name, data), return_value)
         return return_value
 
+    @__primary_only
+    @__admission_controlled
+    def exposed_compare_and_set_blackboard(self, name: str, expected_version: Union[int, str],
+                                           data: Union[str, bytes]) -> tuple:
+        """
+        Update the data of the Blackboard only if it still has the expected version (compare-and-set).
+        Every change of the data gives the Board a new, greater version (also across deleting and recreating the
+        Board, so an old version never matches again). Read the version with
+        exposed_read_blackboard_versioned; on a conflict the current version is returned, so the client can retry
+        without reading again.
+
+        param - {str} - name - Name of the existing Blackboard
+        param - {int or str} - expected_version - The version the client has read
+        param - {str or bytes} - data - Given data written to the Blackboard
+
+        return (True, new_version, message) OR (False, current_version, message) on a conflict OR (False, message)
+        """
+        # To be sure the string parameters are a string
+        name = str(name)
+        data = payload.normalize_data(data)
+        # Compress large data before the lock is taken
+        stored_data = self.__stored_data(data)
+
+        try:
+            expected_version = int(expected_version)
+        except (TypeError, ValueError):
+            return_value = (False, "[ERROR] Invalid parameters! Please give the version as Int!")
+            self.log_call("exposed_compare_and_set_blackboard", (name, expected_version, data), return_value)
+            return return_value
+
+        ticket = 0
+        with lock_timeout(self.__stripe_lock(name).write, 10) as acquired:
+            if acquired:
+                board = self.__boards.get(name)
+                if not self.__payload_size_allowed(data):
+                    return_value = self.__payload_too_large()
+                elif board is None:
+                    # Blackboard does not exist
+                    return_value = (False, "[ERROR] Board does not exist!")
+                elif board.version != expected_version:
+                    # Another client changed the Board in between
+                    return_value = (False, board.version,
+                                    "[WARNING] Board not updated, it was changed in between! Version conflict.")
+                else:
+                    entry_time = time.time()
+                    version = self.__next_version(board)
+                    self.__publish(name, board.replace(entry_time=entry_time, data=stored_data, version=version))
+                    ticket = self.__persist({"op": "display", "name": name, "entry_time": entry_time,
+                                             "data": stored_data, "version": version})
+                    return_value = (True, version, "[INFO] Board successfully updated!")
+            else:
+                # Timeout
+                return_value = (False, "[TIMEOUT] The server is too busy. Board not updated. Try again later.")
+
+        # Wait until the change is persisted according to the durability policy
+        return_value = self.__wait_for_durability(ticket, return_value)
+
+        # Log and return
+        self.log_call("exposed_compare_and_set_blackboard", (name, expected_version, data), return_value)
+        return return_value
+
+    @__primary_only
+    @__admission_controlled
     def exposed_clear_blackboard(self, name: str) -> tuple:
         """
         Clear the given Blackboard data and set to invalid status.
@@ -148,12 +334,14 @@ class BlackBoardHost(rpyc.Service):
         # To be sure the string parameters are a string
         name = str(name)
 
-        with lock_timeout(self.__board_lock, 10) as acquired:
+        ticket = 0
+        with lock_timeout(self.__stripe_lock(name).write, 10) as acquired:
             if acquired:
                 if name in self.__boards:
                     # Update the Blackboard information
-                    self.__boards[name]["data"] = None
-                    self.__save_boards()
+                    version = self.__next_version(self.__boards[name])
+                    self.__publish(name, self.__boards[name].replace(data=None, version=version))
+                    ticket = self.__persist({"op": "clear", "name": name, "version": version})
                     return_value = (True, "[INFO] Board successfully cleared!")
                 else:
                     # Blackboard does not exist
@@ -162,10 +350,14 @@ class BlackBoardHost(rpyc.Service):
                 # Timeout
                 return_value = (False, "[TIMEOUT] The server is too busy. Board not cleared. Try again later.")
 
+        # Wait until the change is persisted according to the durability policy
+        return_value = self.__wait_for_durability(ticket, return_value)
+
         # Log and return
         self.log_call("exposed_clear_blackboard", (name,), return_value)
         return return_value
 
+    @__admission_controlled
     def exposed_read_blackboard(self, name: str) -> tuple:
         """
         Return the data and valid state of the given Blackboard.
@@ -177,26 +369,9 @@ class BlackBoardHost(rpyc.Service):
         # To be sure the string parameters are a string
         name = str(name)
 
-        with lock_timeout(self.__board_lock, 10) as acquired:
+        with self.__read_lock(self.__stripe_lock(name)) as acquired:
             if acquired:
-                if name in self.__boards:
-                    # Read Blackboard
-                    is_valid = self.__board_is_valid(name)
-                    if self.__boards[name]["data"] is None:
-                        # Return value with empty data (always invalid)
-                        return_value = (True, self.__boards[name]["data"], False,
-                                        "[WARNING] Successfully read but data is empty!")
-                    elif not is_valid:
-                        # Return value with invalid data
-                        return_value = (True, self.__boards[name]["data"], is_valid,
-                                        "[WARNING] Successfully read but data is invalid!")
-                    else:
-                        # Return value with valid data
-                        return_value = (True, self.__boards[name]["data"], is_valid,
-                                        "[INFO] Successfully read with valid data!")
-                else:
-                    # Blackboard does not exist
-                    return_value = (False, "[ERROR] Board does not exist!")
+                return_value = self.__read_result(name, self.__boards.get(name))
             else:
                 # Timeout
                 return_value = (False, "[TIMEOUT] The server is too busy. Board not read. Try again later.")
@@ -205,6 +380,114 @@ class BlackBoardHost(rpyc.Service):
         self.log_call("exposed_read_blackboard", (name,), return_value)
         return return_value
 
+    @__admission_controlled
+    def exposed_read_blackboard_versioned(self, name: str) -> tuple:
+        """
+        Return the data, valid state and version of the given Blackboard.
+        The version is used for a following exposed_compare_and_set_blackboard.
+
+        param - {str} - name - Unique name of the Blackboard
+
+        return (True, data, is_valid, version, message) OR (False, message)
+        """
+        # To be sure the string parameters are a string
+        name = str(name)
+
+        with self.__read_lock(self.__stripe_lock(name)) as acquired:
+            if acquired:
+                board = self.__boards.get(name)
+                return_value = self.__read_result(name, board)
+                if return_value[0]:
+                    return_value = (*return_value[:3], board.version, return_value[3])
+            else:
+                # Timeout
+                return_value = (False, "[TIMEOUT] The server is too busy. Board not read. Try again later.")
+
+        # Log and return
+        self.log_call("exposed_read_blackboard_versioned", (name,), return_value)
+        return return_value
+
+    def exposed_read_blackboard_if_newer(self, name: str, since_entry_time: Union[float, int, str],
+                                         timeout: Union[float, int, str]) -> tuple:
+        """
+        Long-poll: Wait until the entry time of the given Blackboard is newer than since_entry_time and return its
+        data and valid state. If the Board doesn't change within the timeout (at most MAX_POLL_TIMEOUT seconds), a
+        "not modified" result without the data is returned.
+        In event-loop mode the wait runs outside the worker pool (see event_loop_server.blocking). If too many
+        long-polls wait already, the call is rejected with an [OVERLOAD] message.
+
+        param - {str} - name - Unique name of the Blackboard
+        param - {float or int or str} - since_entry_time - The entry time the client already knows
+        param - {float or int or str} - timeout - Maximum time to wait in seconds
+
+        return (True, modified?, data, is_valid, entry_time, message) OR (False, message)
+        """
+        # To be sure the string parameters are a string
+        name = str(name)
+
+        try:
+            since_entry_time = float(since_entry_time)
+            timeout = min(max(float(timeout), 0.0), self.MAX_POLL_TIMEOUT)
+        except ValueError:
+            return_value = (False, "[ERROR] Invalid parameters! Please give entry time and timeout as Float or Int!")
+            self.log_call("exposed_read_blackboard_if_newer", (name, since_entry_time, timeout), return_value)
+            return return_value
+
+        # A long-poll without timeout doesn't wait, so it needs no spare worker
+        with blocking() if timeout > 0 else nullcontext(True) as admitted:
+            if admitted:
+                return_value = self.__wait_if_not_newer(name, since_entry_time, timeout)
+            else:
+                return_value = (False, "[OVERLOAD] Too many long-polls are waiting. Request rejected. Try again later.")
+
+        # Log and return
+        self.log_call("exposed_read_blackboard_if_newer", (name, since_entry_time, timeout), return_value)
+        return return_value
+
+    def __wait_if_not_newer(self, name: str, since_entry_time: float, timeout: float) -> tuple:
+        """
+        Wait until the entry time of the given Blackboard is newer than since_entry_time (see
+        exposed_read_blackboard_if_newer).
+
+        param - {str} - name - Unique name of the Blackboard
+        param - {float} - since_entry_time - The entry time the client already knows
+        param - {float} - timeout - Maximum time to wait in seconds
+
+        return (True, modified?, data, is_valid, entry_time, message) OR (False, message)
+        """
+        deadline = time.time() + timeout
+        while True:
+            # Register before reading, so a change between reading and waiting is not missed
+            waiter = self.__notifier.add_waiter(name)
+            try:
+                with self.__read_lock(self.__stripe_lock(name)) as acquired:
+                    board = self.__boards.get(name) if acquired else None
+                if not acquired:
+                    # Timeout
+                    return_value = (False, "[TIMEOUT] The server is too busy. Board not read. Try again later.")
+                    break
+                if board is None:
+                    # Blackboard does not exist
+                    return_value = (False, "[ERROR] Board does not exist!")
+                    break
+                if board.entry_time > since_entry_time:
+                    # Modified: Return value like exposed_read_blackboard
+                    read_result = self.__read_result(name, board)
+                    return_value = (True, True, read_result[1], read_result[2], board.entry_time, read_result[3])
+                    break
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    # Not modified: Return value without the data
+                    is_valid = self.__board_is_valid(board) and board.data is not None
+                    return_value = (True, False, None, is_valid, board.entry_time,
+                                    "[INFO] Board not modified since the given entry time!")
+                    break
+                waiter.wait(remaining)
+            finally:
+                self.__notifier.remove_waiter(name, waiter)
+        return return_value
+
+    @__admission_controlled
     def exposed_get_blackboard_status(self, name: str) -> tuple:
         """
         Return current state of the given Blackboard.
@@ -216,20 +499,9 @@ class BlackBoardHost(rpyc.Service):
         # To be sure the string parameters are a string
         name = str(name)
 
-        with lock_timeout(self.__board_lock, 10) as acquired:
+        with self.__read_lock(self.__stripe_lock(name)) as acquired:
             if acquired:
-                if name in self.__boards:
-                    # Get Blackboard state
-                    if self.__boards[name]["data"] is None:
-                        is_empty = True
-                    else:
-                        is_empty = False
-                    is_valid = self.__board_is_valid(name)
-                    return_value = (True, is_empty, self.__boards[name]["entry_time"], is_valid and not is_empty,
-                                    "[INFO] Successfully read Board status!")
-                else:
-                    # Blackboard does not exist
-                    return_value = (False, "[ERROR] Board does not exist!")
+                return_value = self.__status_result(self.__boards.get(name))
             else:
                 # Timeout
                 return_value = (False, "[TIMEOUT] The server is too busy. Board not read. Try again later.")
@@ -238,9 +510,126 @@ class BlackBoardHost(rpyc.Service):
         self.log_call("exposed_get_blackboard_status", (name,), return_value)
         return return_value
 
+    @__admission_controlled
+    def exposed_read_blackboards(self, names: tuple) -> tuple:
+        """
+        Return the data and valid state of several Blackboards with one call.
+        The Boards are read under one lock acquisition and the call is logged once.
+        Pass the names as tuple, RPyC transfers lists by reference (one round trip per access).
+
+        param - {tuple} - names - Unique names of the Blackboards
+
+        return (True, ((name, result of exposed_read_blackboard), ...), message) OR (False, message)
+        """
+        # To be sure the string parameters are a string
+        names = tuple(str(name) for name in names)
+
+        with self.__read_lock(self.__board_lock) as acquired:
+            if acquired:
+                # Boards are replaced as a whole by the writers, so each one is read consistently
+                boards = self.__boards
+                results = tuple((name, self.__read_result(name, boards.get(name))) for name in names)
+                return_value = self.__batch_result(results, "read")
+            else:
+                # Timeout
+                return_value = (False, "[TIMEOUT] The server is too busy. Boards not read. Try again later.")
+
+        # Log and return
+        self.log_call("exposed_read_blackboards", (names,), return_value)
+        return return_value
+
+    @__admission_controlled
+    def exposed_get_blackboard_statuses(self, names: tuple) -> tuple:
+        """
+        Return the current state of several Blackboards with one call.
+        The Boards are read under one lock acquisition and the call is logged once.
+        Pass the names as tuple, RPyC transfers lists by reference (one round trip per access).
+
+        param - {tuple} - names - Unique names of the Blackboards
+
+        return (True, ((name, result of exposed_get_blackboard_status), ...), message) OR (False, message)
+        """
+        # To be sure the string parameters are a string
+        names = tuple(str(name) for name in names)
+
+        with self.__read_lock(self.__board_lock) as acquired:
+            if acquired:
+                # Boards are replaced as a whole by the writers, so each one is read consistently
+                boards = self.__boards
+                results = tuple((name, self.__status_result(boards.get(name))) for name in names)
+                return_value = self.__batch_result(results, "read")
+            else:
+                # Timeout
+                return_value = (False, "[TIMEOUT] The server is too busy. Boards not read. Try again later.")
+
+        # Log and return
+        self.log_call("exposed_get_blackboard_statuses", (names,), return_value)
+        return return_value
+
+    @__primary_only
+    @__admission_controlled
+    def exposed_display_blackboards(self, boards: Union[dict, tuple]) -> tuple:
+        """
+        Update the data of several Blackboards with one call and refresh their timestamps.
+        The Boards are updated under one lock acquisition, persisted together and the call is logged once.
+        Pass the Boards as tuple of (name, data) pairs, RPyC transfers dictionaries by reference (one round trip per
+        access).
+
+        param - {dict or tuple} - boards - The data (str or bytes) per Board name as dictionary or tuple of
+                                           (name, data) pairs
+
+        return (True, ((name, result of exposed_display_blackboard), ...), message) OR (False, message)
+        """
+        # To be sure the string parameters are a string
+        if isinstance(boards, dict):
+            # Only iteration and item access are allowed on a dictionary of the client
+            boards = tuple((name, boards[name]) for name in boards)
+        updates = tuple((str(name), payload.normalize_data(data)) for name, data in boards)
+        # Compress large data before the locks are taken
+        stored = tuple(self.__stored_data(data) for _, data in updates)
+
+        # Lock every affected stripe once, in ascending order like delete_all to avoid deadlocks
+        stripes = [self.__stripe_locks[index] for index in sorted({self.__stripe_index(name) for name, _ in updates})]
+
+        ticket = 0
+        with locks_timeout([lock.write for lock in stripes], 10) as acquired:
+            if acquired:
+                results = []
+                records = []
+                entry_time = time.time()
+                for (name, data), stored_data in zip(updates, stored):
+                    if not self.__payload_size_allowed(data):
+                        results.append((name, self.__payload_too_large()))
+                    elif name in self.__boards:
+                        # Update the Blackboard information
+                        version = self.__next_version(self.__boards[name])
+                        self.__publish(name, self.__boards[name].replace(entry_time=entry_time, data=stored_data,
+                                                                         version=version))
+                        records.append({"op": "display", "name": name, "entry_time": entry_time,
+                                        "data": stored_data, "version": version})
+                        results.append((name, (True, "[INFO] Board successfully updated!")))
+                    else:
+                        # Blackboard does not exist
+                        results.append((name, (False, "[ERROR] Board does not exist!")))
+                if len(records) > 0:
+                    ticket = self.__persist(*records)
+                return_value = self.__batch_result(tuple(results), "updated")
+            else:
+                # Timeout
+                return_value = (False, "[TIMEOUT] The server is too busy. Boards not updated. Try again later.")
+
+        # Wait until the changes are persisted according to the durability policy
+        return_value = self.__wait_for_durability(ticket, return_value)
+
+        # Log and return
+        self.log_call("exposed_display_blackboards", (updates,), return_value)
+        return return_value
+
+    @__admission_controlled
     def exposed_list_blackboards(self) -> tuple:
         """
         Return a complete list of the Blackboards.
+        The names are returned as tuple, RPyC transfers lists by reference (one round trip per access).
 
         return (True, list_of_boards, message) or (False, list_of_boards, message)
         """
@@ -250,7 +639,7 @@ class BlackBoardHost(rpyc.Service):
         # Initialize return_value variable
         return_value = None
 
-        with lock_timeout(self.__board_lock, 10) as acquired:
+        with lock_timeout(self.__board_lock.read, 10) as acquired:
             if acquired:
                 # Get all Blackboard names
                 for name in self.__boards:
@@ -261,6 +650,7 @@ class BlackBoardHost(rpyc.Service):
                                 "[TIMEOUT] The server is too busy. Could not list existing boards. Try again later.")
 
         if return_value is None:
+            list_of_boards = tuple(list_of_boards)
             # Check for empty list to return a different message
             if len(list_of_boards) == 0:
                 return_value = (True, list_of_boards, "[WARNING] No Boards found! Please create one first!")
@@ -271,6 +661,111 @@ class BlackBoardHost(rpyc.Service):
         self.log_call("exposed_list_blackboards", (), return_value)
         return return_value
 
+    @__admission_controlled
+    def exposed_get_compression_stats(self) -> tuple:
+        """
+        Return how much memory the compression of the Board data saves.
+        The sizes are the sum over all Boards with data, the ratio is original size / stored size.
+
+        return (True, compressed_boards, original_bytes, stored_bytes, saved_bytes, ratio, message) OR (False, message)
+        """
+        with lock_timeout(self.__board_lock.read, 10) as acquired:
+            if acquired:
+                boards = list(self.__boards.values())
+            else:
+                boards = None
+
+        if boards is None:
+            # Timeout
+            return_value = (False, "[TIMEOUT] The server is too busy. Could not read the statistics. Try again later.")
+        else:
+            sizes = self.__backend.get_sizes()
+            if sizes is not None:
+                # The backend keeps the data (sqlite mode): The sizes of the committed data
+                compressed_boards, original_bytes, stored_bytes = sizes
+            else:
+                compressed_boards = 0
+                original_bytes = 0
+                stored_bytes = 0
+                for board in boards:
+                    original, stored = payload.stored_size(board.data)
+                    original_bytes += original
+                    stored_bytes += stored
+                    if isinstance(board.data, payload.CompressedData):
+                        compressed_boards += 1
+            saved_bytes = original_bytes - stored_bytes
+            ratio = original_bytes / stored_bytes if stored_bytes > 0 else 1.0
+            return_value = (True, compressed_boards, original_bytes, stored_bytes, saved_bytes, ratio,
+                            f"[INFO] {compressed_boards} compressed Boards save {saved_bytes} bytes "
+                            f"(ratio {ratio:.2f})!")
+
+        # Log and return
+        self.log_call("exposed_get_compression_stats", (), return_value)
+        return return_value
+
+    @__admission_controlled
+    def exposed_get_cache_stats(self) -> tuple:
+        """
+        Return the state of the cache of the disk store (only in sqlite mode).
+        The hits and misses are counted since the start of the server.
+
+        return (True, cached_boards, cached_bytes, budget_bytes, hits, misses, message) OR (False, message)
+        """
+        stats = self.__backend.get_cache_stats()
+        if stats is None:
+            return_value = (False, "[ERROR] The Boards are not stored in the disk store!")
+        else:
+            cached_boards, cached_bytes, budget_bytes, hits, misses, _ = stats
+            return_value = (True, cached_boards, cached_bytes, budget_bytes, hits, misses,
+                            f"[INFO] {cached_boards} Boards with {cached_bytes} of {budget_bytes} bytes cached "
+                            f"({hits} hits, {misses} misses)!")
+
+        # Log and return
+        self.log_call("exposed_get_cache_stats", (), return_value)
+        return return_value
+
+    @__admission_controlled
+    def exposed_list_blackboards_page(self, prefix: str = "", cursor: Union[str, None] = None,
+                                      limit: Union[int, str] = 100) -> tuple:
+        """
+        Return one page of the Blackboard names with the given prefix in sorted order.
+        The names are taken from a sorted index, so the time depends on the page size and not on the number of
+        Boards, and the global lock is not needed. Pass the returned cursor to get the next page.
+
+        param - {str} - prefix - The prefix of the names (default: all names)
+        param - {str or None} - cursor - The cursor returned with the previous page (default: first page)
+        param - {int or str} - limit - The maximum number of names (at most MAX_PAGE_SIZE, default: 100)
+
+        return (True, names, cursor of the next page or None, message) OR (False, message)
+        """
+        # To be sure the string parameters are a string
+        prefix = str(prefix)
+        cursor = None if cursor is None else str(cursor)
+
+        # Initialize return_value variable
+        return_value = None
+
+        try:
+            limit = int(limit)
+        except ValueError:
+            return_value = (False, "[ERROR] Invalid parameters! Please give the limit as Int!")
+
+        if return_value is None and limit <= 0:
+            return_value = (False, f"[ERROR] The limit must be greater than 0! Given value: {limit}.")
+
+        if return_value is None:
+            names, next_cursor = self.__names.page(prefix, cursor, min(limit, self.MAX_PAGE_SIZE))
+            if next_cursor is not None:
+                return_value = (True, names, next_cursor, f"[INFO] Successfully read {len(names)} Board names!")
+            else:
+                return_value = (True, names, None, f"[INFO] Successfully read the last {len(names)} Board names!")
+
+        # Log and return
+        self.log_call("exposed_list_blackboards_page", (prefix, cursor, limit), return_value)
+        return return_value
+
+    @__primary_only
+    @__admission_controlled
     def exposed_delete_blackboard(self, name: str) -> tuple:
         """
         Delete the given Blackboard.
@@ -282,12 +777,13 @@ class BlackBoardHost(rpyc.Service):
         # To be sure the string parameters are a string
         name = str(name)
 
-        with lock_timeout(self.__board_lock, 10) as acquired:
+        ticket = 0
+        with locks_timeout([self.__board_lock.write, self.__stripe_lock(name).write], 10) as acquired:
             if acquired:
                 if name in self.__boards:
                     # Delete Blackboard
-                    del self.__boards[name]
-                    self.__save_boards()
+                    self.__publish(name, None)
+                    ticket = self.__persist({"op": "delete", "name": name})
                     return_value = (True, "[INFO] Board successfully deleted!")
                 else:
                     # Blackboard does not exist
@@ -296,131 +792,1144 @@ class BlackBoardHost(rpyc.Service):
                 # Timeout
                 return_value = (False, "[TIMEOUT] The server is too busy. Board not deleted. Try again later.")
 
+        # Wait until the change is persisted according to the durability policy
+        return_value = self.__wait_for_durability(ticket, return_value)
+
         # Log and return
         self.log_call("exposed_delete_blackboard", (name,), return_value)
         return return_value
 
+    @__admission_controlled
+    def exposed_subscribe(self, name: str, callback) -> tuple:
+        """
+        Subscribe to the changes of the given Blackboard.
+        The callback is invoked with (name, event, data, entry_time) when the Board is updated, cleared or deleted
+        ("updated", "cleared", "deleted"). The callbacks are invoked by a delivery thread per client, so the client
+        has to serve its connection (e.g. rpyc.BgServingThread). If the client is too slow, the oldest pending
+        notifications are dropped. The subscriptions end when the Board is deleted or the client disconnects.
+
+        param - {str} - name - Unique name of the Blackboard
+        param - {function} - callback - The callback of the client
+
+        return (True, subscription_id, message) OR (False, message)
+        """
+        # To be sure the string parameters are a string
+        name = str(name)
+
+        with self.__read_lock(self.__stripe_lock(name)) as acquired:
+            if acquired:
+                if name in self.__boards:
+                    subscription_id = self.__notifier.subscribe(name, callback, self)
+                    return_value = (True, subscription_id, f"[INFO] Successfully subscribed to Board '{name}'!")
+                else:
+                    # Blackboard does not exist
+                    return_value = (False, "[ERROR] Board does not exist!")
+            else:
+                # Timeout
+                return_value = (False, "[TIMEOUT] The server is too busy. Board not subscribed. Try again later.")
+
+        # Log and return (without the callback, its conversion would call the client)
+        self.log_call("exposed_subscribe", (name,), return_value)
+        return return_value
+
+    @__admission_controlled
+    def exposed_unsubscribe(self, subscription_id: int) -> tuple:
+        """
+        End a subscription of this client.
+
+        param - {int} - subscription_id - The id returned by exposed_subscribe
+
+        return (successful?, message)
+        """
+        if self.__notifier.unsubscribe(subscription_id, self):
+            return_value = (True, "[INFO] Successfully unsubscribed!")
+        else:
+            return_value = (False, "[ERROR] Subscription does not exist!")
+
+        # Log and return
+        self.log_call("exposed_unsubscribe", (subscription_id,), return_value)
+        return return_value
+
+    @__primary_only
+    @__admission_controlled
     def exposed_delete_all_blackboards(self) -> tuple:
         """
         Delete all existing Blackboards.
 
         return (successful?,  message)
         """
-        with lock_timeout(self.__board_lock, 10) as acquired:
+        ticket = 0
+        with locks_timeout([self.__board_lock.write, *[lock.write for lock in self.__stripe_locks]], 10) as acquired:
             if acquired:
-                # Delete all Blackboards
-                self.__boards.clear()
-                self.__save_boards()
+                # Delete all Blackboards (by a new dictionary, so a published snapshot stays unchanged)
+                BlackBoardHost.__boards = {}
+                self.__backend.discard_all()
+                self.__expiry.reset()
+                self.__names.reset()
+                self.__notifier.publish_all("deleted")
+                self.__notifier.remove_boards()
+                ticket = self.__persist({"op": "delete_all"})
                 return_value = (True, "[INFO] Successfully deleted all Boards!")
             else:
                 # Timeout
                 return_value = (False, "[TIMEOUT] The server is too busy. Boards not deleted. Try again later.")
 
+        # Wait until the change is persisted according to the durability policy
+        return_value = self.__wait_for_durability(ticket, return_value)
+
         # Log and return
         self.log_call("exposed_delete_all_blackboards", (), return_value)
         return return_value
 
-    def log_call(self, method: str, args: tuple, return_value: tuple) -> None:
+    def exposed_list_expired_blackboards(self) -> tuple:
         """
-        Log a method call from a client.
+        Return the names of the Blackboards whose data is expired (cleared Boards are not listed).
+        Uses the expiry index, so the time depends on the number of expired Boards and not on all Boards.
 
-        param - {str} - name - The name of the called method
-        param - {tuple} - name - The call arguments
-        param - {tuple} - name - The return_value of the method
+        return (True, names, message)
         """
-        # Convert the args to a pretty string
-        if len(args) == 0:
-            args = "()"
-        elif len(args) == 1:
-            args = "(" + str(args[0]) + ")"
+        names = tuple(self.__expiry.expired(time.time()))
+        if len(names) == 0:
+            return_value = (True, names, "[INFO] No expired Boards found!")
         else:
-            args = str(args)
+            return_value = (True, names, f"[INFO] Found {len(names)} expired Boards!")
 
-        # Simple conversion of the return value -> Length always >= 2
-        return_value = str(return_value)
-
-        # Log
-        logger.write_in_log([datetime.now(), "Method-Call", *self.__client_address, method, args, return_value])
+        # Log and return
+        self.log_call("exposed_list_expired_blackboards", (), return_value)
+        return return_value
 
-    @staticmethod
-    def load_boards() -> None:
+    def exposed_fetch_changes(self, log_id: str, sequence: int, timeout: Union[float, int, str]) -> tuple:
         """
-        Load all Boards from the board.json file.
-        If no such file exist a new one is created.
-        If an error occurs while reading an exiting board.json file the server is resumed with an empty Board
-        dictionary and the old file is overwritten with the first __save_boards call.
+        Replication (called by the replicas of a primary): Wait until there are mutation records after the given
+        sequence number (at most timeout seconds) and return them. If the records are not available anymore or the
+        log id differs (e.g. the primary was restarted), a snapshot of all Boards is returned instead.
+        The payload is transferred as json text, RPyC transfers lists and dictionaries by reference.
+
+        param - {str or None} - log_id - The id of the replication log the sequence number belongs to
+        param - {int} - sequence - The sequence number of the last applied record
+        param - {float or int or str} - timeout - Maximum time to wait in seconds
+
+        return (True, log_id, sequence, is_snapshot, json records or json boards, time of the record with the
+                sequence, last sequence of the primary, message) OR (False, message)
         """
+        # Initialize return_value variable
+        return_value = None
+
         try:
-            with open('boards.json', 'r') as file:
-                BlackBoardHost.__boards = json.load(file)
-                print("[INFO] Successfully read Boards.")
-        except Exception as e:
-            if isinstance(e, FileNotFoundError):
-                BlackBoardHost.__save_boards()
-                print("[WARNING] Found no existing board.json file. Created a new one.")
+            sequence = int(sequence)
+            timeout = min(max(float(timeout), 0.0), self.MAX_POLL_TIMEOUT)
+        except ValueError:
+            return_value = (False, "[ERROR] Invalid parameters! Please give sequence number and timeout as Int!")
+
+        replication_log = BlackBoardHost.__replication_log
+        if return_value is None and replication_log is None:
+            return_value = (False, "[ERROR] This server is not a primary!")
+
+        if return_value is None:
+            changes = replication_log.since(sequence, timeout) if log_id == replication_log.id else None
+            if changes is not None:
+                last_sequence, last_time, records, head_sequence, _ = changes
+                return_value = (True, replication_log.id, last_sequence, False, payload.dumps(records), last_time,
+                                head_sequence, f"[INFO] Successfully fetched {len(records)} changes!")
             else:
-                print("[ERROR] Error while loading board.json file.")
-            BlackBoardHost.__boards = {}
+                # Snapshot: Blocking all writers, so the Boards and the sequence number match
+                with locks_timeout([self.__board_lock.read, *[lock.read for lock in self.__stripe_locks]],
+                                   10) as acquired:
+                    if acquired:
+                        boards = {name: self.__board_with_data(name, board) for name, board in self.__boards.items()}
+                        sequence, sequence_time = replication_log.get_head()
+                if acquired:
+                    return_value = (True, replication_log.id, sequence, True, payload.dumps(boards), sequence_time,
+                                    sequence, "[INFO] Successfully fetched a snapshot of all Boards!")
+                else:
+                    # Timeout
+                    return_value = (False, "[TIMEOUT] The server is too busy. Snapshot not read. Try again later.")
 
-    @staticmethod
-    def __save_boards() -> None:
-        """
-        Stores all Boards in the board.json file.
-        If no such file exist a new one is created.
+        # Log and return
+        self.log_call("exposed_fetch_changes", (log_id, sequence, timeout), return_value)
+        return return_value
+
+    def exposed_get_replication_status(self) -> tuple:
         """
-        try:
-            with open('boards.json', 'w') as file:
-                json.dump(BlackBoardHost.__boards, file, sort_keys=True, indent=4)
-                print("[INFO] Successfully stored Boards.")
-        except:
-            print("[ERROR] Error while saving the Boards.")
+        Return the replication role of this server and the replication lag of a replica.
+        The lag in records is the sequence number of the primary minus the applied one. The lag in seconds is the age
+        of the last applied record while the replica is behind (0 if it applied all records), but at least the time
+        since the last contact with the primary while it is disconnected.
 
-    @staticmethod
-    def __board_is_valid(name: str) -> bool:
+        return (True, role, applied sequence number, sequence number of the primary, lag in seconds, message)
         """
-        Return true, if the data on the board is valid.
-        Else it returns false.
+        replicator = BlackBoardHost.__replicator
+        replication_log = BlackBoardHost.__replication_log
+        if replicator is not None:
+            connected, applied, primary_sequence, records_behind, lag = replicator.get_status()
+            if connected and records_behind == 0:
+                return_value = (True, "replica", applied, primary_sequence, lag, "[INFO] Replica is up to date!")
+            elif connected:
+                return_value = (True, "replica", applied, primary_sequence, lag,
+                                f"[INFO] Replica is {records_behind} changes ({lag:.3f} s) behind the primary!")
+            else:
+                return_value = (True, "replica", applied, primary_sequence, lag,
+                                "[WARNING] Replica is not connected to the primary!")
+        elif replication_log is not None:
+            sequence = replication_log.get_sequence()
+            return_value = (True, "primary", sequence, sequence, 0.0, "[INFO] Server is a primary!")
+        else:
+            return_value = (True, "standalone", 0, 0, 0.0, "[INFO] Server is not replicated!")
 
-        param - {str} - name - Unique name of the Blackboard
+        # Log and return
+        self.log_call("exposed_get_replication_status", (), return_value)
+        return return_value
 
-        return valid?
+    def exposed_promote_to_primary(self) -> tuple:
         """
-        return BlackBoardHost.__boards[name]["entry_time"] + BlackBoardHost.__boards[name]["valid_sec"] >= time.time()
+        Turn this replica into a primary (e.g. the primary failed). The replication stops, the Boards stay as they
+        are and the server accepts changes from now on. Other replicas can replicate from this server afterwards.
 
+        return (successful?, message)
+        """
+        if BlackBoardHost.__replicator is None:
+            return_value = (False, "[ERROR] This server is not a replica!")
+        else:
+            # The replica already holds all Boards, nothing has to be loaded
+            BlackBoardHost.__replicator.stop()
+            BlackBoardHost.__replication_log = ReplicationLog(BlackBoardHost.__replication_max_records)
+            BlackBoardHost.__replicator = None
+            # Continue after every version the old primary gave out
+            BlackBoardHost.__seed_versions(BlackBoardHost.__boards)
+            return_value = (True, "[INFO] Successfully promoted to primary!")
 
-# =====Functions=======================================
-def show_help() -> None:
-    """
-    Print a help text on the console.
-    """
-    print("BlackBoardServer v0.1")
-    print("Arguments:")
-    print("-p / --port: Set the used port (default=8080)")
-    print("-h / --help: Show this text")
+        # Log and return
+        self.log_call("exposed_promote_to_primary", (), return_value)
+        return return_value
 
+    def log_call(self, method: str, args: tuple, return_value: tuple) -> None:
+        """
+        Log a method call from a client.
+        The level of the entry depends on the message of the return value ([INFO], [WARNING], [TIMEOUT], [OVERLOAD],
+        [ERROR]).
+        The arguments and the return value are only converted to (shortened) strings if the entry is written.
 
-# =====Main============================================
-def main(argv: list) -> None:
-    """
-    The main-function of the server.
-    Parses the given arguments to determine the server port (default: 8080).
+        param - {str} - name - The name of the called method
+        param - {tuple} - name - The call arguments
+        param - {tuple} - name - The return_value of the method
+        """
+        level = self.__log_level(return_value[-1])
+        if not logger.is_enabled(level, method):
+            return
+
+        # Log
+        logger.write_in_log([datetime.now(), "Method-Call", *self.__client_address, method,
+                             logger.LazyText(self.__format_args, args), logger.LazyText(logger.short_repr, return_value)],
+                            level)
+
+    @staticmethod
+    def __log_level(message: str) -> str:
+        """
+        Return the log level of a method call by the prefix of the returned message.
+
+        param - {str} - message - The returned message
+
+        return level
+        """
+        if message.startswith("[ERROR]"):
+            return "ERROR"
+        if message.startswith("[WARNING]") or message.startswith("[TIMEOUT]") or message.startswith("[OVERLOAD]"):
+            return "WARNING"
+        return "INFO"
+
+    @staticmethod
+    def __format_args(args: tuple, max_length: int) -> str:
+        """
+        Convert the call arguments to a pretty string. Called by the log writer.
+
+        param - {tuple} - args - The call arguments
+        param - {int} - max_length - The maximum length of the string
+
+        return text
+        """
+        if len(args) == 0:
+            return "()"
+        elif len(args) == 1:
+            return "(" + logger.short_str(args[0], max_length) + ")"
+        else:
+            return logger.short_repr(args, max_length)
+
+    @staticmethod
+    def set_storage(storage: str) -> None:
+        """
+        Set the persistence mode of the Blackboards. Has to be called before load_boards.
+        "json": The complete board.json file is rewritten on every mutation.
+        "journal": Every mutation is appended as one record to the boards.journal file.
+        "sqlite": Every mutation is applied to the boards.sqlite database. Only the index of the Boards is kept in
+                  memory, the data is read on demand and cached (see set_cache_size).
+        "memory": Nothing is persisted, the Boards are lost when the server stops (maximum throughput).
+        See the storage backends in src.storage.
+
+        param - {str} - storage - The persistence mode ("json", "journal", "sqlite" or "memory")
+        """
+        if storage not in ("json", "journal", "sqlite", "memory"):
+            raise ValueError(f"Unknown storage '{storage}'")
+        BlackBoardHost.__storage = storage
+
+    @staticmethod
+    def set_storage_path(path: str) -> None:
+        """
+        Set the path of the persistence files without extension (default: "boards"). Has to be called before
+        load_boards.
+
+        param - {str} - path - The path, the extension .json, .journal or .sqlite is added
+        """
+        BlackBoardHost.__storage_path = path
+
+    @staticmethod
+    def set_cache_size(cache_bytes: int) -> None:
+        """
+        Set the maximum size of the cached data in sqlite mode (default: 64 MiB). Has to be called before
+        load_boards.
+
+        param - {int} - cache_bytes - Maximum size of the cached data in bytes
+        """
+        BlackBoardHost.__cache_bytes = cache_bytes
+
+    @staticmethod
+    def set_copy_on_write(enabled: bool) -> None:
+        """
+        Enable or disable the copy-on-write mode.
+        In this mode __boards is published as an immutable snapshot: writers build a new version and swap the
+        reference, so reading a Board and its status needs no lock at all. Every write copies the Board dictionary,
+        so this mode is meant for read-heavy workloads.
+
+        param - {bool} - enabled - Use the copy-on-write mode
+        """
+        BlackBoardHost.__copy_on_write = enabled
+
+    @staticmethod
+    def set_admission(max_active: int, max_queued: int = 0, max_wait: float = 1) -> None:
+        """
+        Limit the number of requests which are served at the same time (0: no limit).
+        Requests which find all slots busy wait in a bounded queue. If the queue is full, they are rejected
+        immediately with an [OVERLOAD] message. Long-polls are not limited, since they wait most of the time.
+
+        param - {int} - max_active - Maximum number of requests which are served at the same time
+        param - {int} - max_queued - Maximum number of requests which wait for a free slot
+        param - {float} - max_wait - Maximum time a request waits for a free slot
+        """
+        if max_active == 0:
+            BlackBoardHost.__admission = None
+        else:
+            BlackBoardHost.__admission = AdmissionController(max_active, max_queued, max_wait)
+
+    @staticmethod
+    def set_primary(max_records: int = 10000) -> None:
+        """
+        Make this server a primary: The latest mutation records are kept for the replicas (see exposed_fetch_changes).
+
+        param - {int} - max_records - Maximum number of records kept, a replica which is further behind gets a
+                                      snapshot
+        """
+        BlackBoardHost.__replication_max_records = max_records
+        BlackBoardHost.__replication_log = ReplicationLog(max_records)
+
+    @staticmethod
+    def start_replication(host: str, port: int) -> None:
+        """
+        Make this server a read-only replica of the given primary. Has to be called after load_boards.
+        The Boards loaded from the own persistence file are replaced by a snapshot of the primary at first, the
+        following changes are applied and persisted like the changes of a client.
+
+        param - {str} - host - Host of the primary server
+        param - {int} - port - Port of the primary server
+        """
+        BlackBoardHost.__replicator = Replicator(host, port, BlackBoardHost.__apply_replicated,
+                                                 BlackBoardHost.__restore_replicated)
+        BlackBoardHost.__replicator.start()
+
+    @staticmethod
+    def __apply_replicated(records: tuple) -> None:
+        """
+        Called by the replicator to apply the mutation records of the primary.
+        All Boards are locked once per batch, the subscribers are notified like for the changes of a client.
+
+        param - {tuple} - records - The records describing the mutations
+        """
+        ticket = 0
+        acquired = False
+        while not acquired:
+            with locks_timeout([BlackBoardHost.__board_lock.write,
+                                *[lock.write for lock in BlackBoardHost.__stripe_locks]], 10) as acquired:
+                if acquired:
+                    for record in records:
+                        try:
+                            if record["op"] in ("delete_all", "restore"):
+                                boards = {}
+                                apply_record(boards, record)
+                                BlackBoardHost.__advance_versions(max((board.version for board in boards.values()),
+                                                                      default=0))
+                                BlackBoardHost.__boards = BlackBoardHost.__offload(boards)
+                                BlackBoardHost.__expiry.reset(boards)
+                                BlackBoardHost.__names.reset(boards)
+                                BlackBoardHost.__notifier.publish_all("deleted")
+                                BlackBoardHost.__notifier.remove_boards()
+                            else:
+                                # Apply the record to the single Board and publish the result
+                                name = record["name"]
+                                board = BlackBoardHost.__boards.get(name)
+                                boards = {} if board is None else {name: board}
+                                apply_record(boards, record)
+                                if name in boards:
+                                    BlackBoardHost.__advance_versions(boards[name].version)
+                                BlackBoardHost.__publish(name, boards.get(name))
+                        except (ValueError, KeyError):
+                            print("[WARNING] Skipped invalid replication record.")
+                    ticket = BlackBoardHost.__persist(*records)
+                else:
+                    print("[WARNING] Timeout while applying the replicated changes. Trying again.")
+
+        # Wait until the changes are persisted according to the durability policy
+        BlackBoardHost.__wait_for_durability(ticket)
+
+    @staticmethod
+    def __restore_replicated(boards: dict) -> None:
+        """
+        Called by the replicator to replace all Boards by a snapshot of the primary.
+
+        param - {dict} - boards - All Boards of the primary
+        """
+        BlackBoardHost.__apply_replicated(({"op": "restore", "boards": boards},))
+
+    @staticmethod
+    def start_sweeper(policy: str, interval: float = 1) -> None:
+        """
+        Start the background sweeper which handles the Boards with expired data. Has to be called after load_boards.
+        "none": No sweeper, the expired data stays (it is reported as invalid).
+        "clear": The expired data is cleared like by exposed_clear_blackboard.
+        "evict": The Boards with expired data are deleted like by exposed_delete_blackboard.
+        A replica doesn't sweep, it receives the changes of the primary.
+
+        param - {str} - policy - The expiry policy ("none", "clear" or "evict")
+        param - {float} - interval - The time between two sweeps in seconds
+        """
+        if policy not in ("none", "clear", "evict"):
+            raise ValueError(f"Unknown expiry policy '{policy}'")
+        BlackBoardHost.stop_sweeper()
+        if policy == "none":
+            return
+        BlackBoardHost.__sweeper_stop = Event()
+        BlackBoardHost.__sweeper = Thread(target=BlackBoardHost.__sweep_periodically,
+                                          args=(policy, interval, BlackBoardHost.__sweeper_stop),
+                                          name="Sweeper", daemon=True)
+        BlackBoardHost.__sweeper.start()
+
+    @staticmethod
+    def stop_sweeper() -> None:
+        """
+        Stop the background sweeper and wait for it.
+        """
+        if BlackBoardHost.__sweeper is not None:
+            BlackBoardHost.__sweeper_stop.set()
+            BlackBoardHost.__sweeper.join()
+            BlackBoardHost.__sweeper = None
+
+    @staticmethod
+    def __sweep_periodically(policy: str, interval: float, stop: Event) -> None:
+        """
+        Sweeper thread: Sweeps the expired Boards every interval until it is stopped.
+
+        param - {str} - policy - The expiry policy ("clear" or "evict")
+        param - {float} - interval - The time between two sweeps in seconds
+        param - {Event} - stop - Set to stop the thread
+        """
+        while not stop.wait(interval):
+            if BlackBoardHost.__replicator is None:
+                swept = BlackBoardHost.__sweep(policy)
+                if swept > 0:
+                    logger.write_in_log([datetime.now(), "Sweep", "", "", policy, swept])
+
+    @staticmethod
+    def __sweep(policy: str) -> int:
+        """
+        Clear or delete all Boards with expired data. Every Board is checked again under its lock, since it may have
+        been updated meanwhile. Boards which can't be locked are swept the next time.
+
+        param - {str} - policy - The expiry policy ("clear" or "evict")
+
+        return number of swept Boards
+        """
+        swept = 0
+        for name in BlackBoardHost.__expiry.expired(time.time()):
+            ticket = 0
+            if policy == "evict":
+                locks = [BlackBoardHost.__board_lock.write, BlackBoardHost.__stripe_lock(name).write]
+            else:
+                locks = [BlackBoardHost.__stripe_lock(name).write]
+            with locks_timeout(locks, 1) as acquired:
+                board = BlackBoardHost.__boards.get(name) if acquired else None
+                if board is not None and board.data is not None and not BlackBoardHost.__board_is_valid(board):
+                    if policy == "evict":
+                        BlackBoardHost.__publish(name, None)
+                        ticket = BlackBoardHost.__persist({"op": "delete", "name": name})
+                    else:
+                        version = BlackBoardHost.__next_version(board)
+                        BlackBoardHost.__publish(name, board.replace(data=None, version=version))
+                        ticket = BlackBoardHost.__persist({"op": "clear", "name": name, "version": version})
+                    swept += 1
+            BlackBoardHost.__wait_for_durability(ticket)
+        return swept
+
+    @staticmethod
+    def set_max_payload_size(size: Union[int, None]) -> None:
+        """
+        Set the maximum size of the data of a Blackboard in bytes (strings are counted UTF-8 encoded).
+
+        param - {int or None} - size - The maximum size (None: no limit)
+        """
+        if size is not None and size <= 0:
+            raise ValueError(f"The maximum payload size must be greater than 0! Given value: {size}.")
+        BlackBoardHost.__max_payload_size = size
+
+    @staticmethod
+    def set_compression_threshold(threshold: Union[int, None]) -> None:
+        """
+        Set the size in bytes above which the data of a Blackboard is kept zlib compressed in memory and in the
+        persistence file. Only data written afterwards is affected.
+
+        param - {int or None} - threshold - The size threshold (None: no compression)
+        """
+        if threshold is not None and threshold < 0:
+            raise ValueError(f"The compression threshold must be greater or equal to 0! Given value: {threshold}.")
+        BlackBoardHost.__compression_threshold = threshold
+
+    @staticmethod
+    def set_snapshot_records(records: int) -> None:
+        """
+        Set the number of journal records after which a snapshot is written and the journal is compacted (journal
+        mode only). Has to be called before load_boards.
+
+        param - {int} - records - The number of records (0: never)
+        """
+        if records < 0:
+            raise ValueError(f"The number of records must be greater or equal to 0! Given value: {records}.")
+        BlackBoardHost.__snapshot_records = records
+
+    @staticmethod
+    def set_durability(durability: tuple) -> None:
+        """
+        Set the durability policy of the Blackboard writes. Has to be called before load_boards.
+
+        param - {tuple} - durability - The durability policy as returned by parse_durability
+        """
+        BlackBoardHost.__durability = durability
+
+    @staticmethod
+    def load_boards() -> None:
+        """
+        Load all Boards by the storage backend of the persistence mode (see set_storage).
+        If no persistence file exist a new one is created.
+        Afterwards the background flusher for the writes is started (not in memory mode).
+        """
+        BlackBoardHost.close_storage()
+        BlackBoardHost.__backend = BlackBoardHost.__create_backend()
+
+        # Loading allocates millions of objects at once, the garbage collector would scan them again and again
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            BlackBoardHost.__boards = BlackBoardHost.__backend.load()
+            BlackBoardHost.__expiry.reset(BlackBoardHost.__boards)
+            BlackBoardHost.__names.reset(BlackBoardHost.__boards)
+        finally:
+            if gc_enabled:
+                gc.enable()
+        BlackBoardHost.__seed_versions(BlackBoardHost.__boards)
+
+        if BlackBoardHost.__backend.persistent:
+            BlackBoardHost.__committer = GroupCommitter(BlackBoardHost.__write_batch, BlackBoardHost.__durability)
+        if isinstance(BlackBoardHost.__backend, JournalStorage) and BlackBoardHost.__snapshot_records > 0:
+            BlackBoardHost.__compactor_stop = Event()
+            BlackBoardHost.__compactor = Thread(target=BlackBoardHost.__compact_periodically,
+                                                args=(BlackBoardHost.__compactor_stop,), name="Compactor",
+                                                daemon=True)
+            BlackBoardHost.__compactor.start()
+
+    @staticmethod
+    def __create_backend() -> StorageBackend:
+        """
+        Create the storage backend of the persistence mode.
+
+        return StorageBackend
+        """
+        storage = BlackBoardHost.__storage
+        path = BlackBoardHost.__storage_path
+        if storage == "memory":
+            return MemoryStorage(path)
+        elif storage == "journal":
+            return JournalStorage(path, BlackBoardHost.__snapshot_records)
+        elif storage == "sqlite":
+            return DiskStore(path, BlackBoardHost.__cache_bytes)
+        else:
+            return JsonStorage(path)
+
+    @staticmethod
+    def close_storage() -> None:
+        """
+        Stop the replication, the sweeper and the compaction, flush all pending writes, stop the background flusher
+        and close the storage backend. Until the next load_boards the Boards are stored in the json file.
+        """
+        BlackBoardHost.stop_sweeper()
+        if BlackBoardHost.__compactor is not None:
+            BlackBoardHost.__compactor_stop.set()
+            BlackBoardHost.__compactor.join()
+            BlackBoardHost.__compactor = None
+        if BlackBoardHost.__replicator is not None:
+            BlackBoardHost.__replicator.stop()
+            BlackBoardHost.__replicator = None
+        if BlackBoardHost.__committer is not None:
+            BlackBoardHost.__committer.close()
+            BlackBoardHost.__committer = None
+        BlackBoardHost.__backend.close()
+        BlackBoardHost.__backend = JsonStorage(BlackBoardHost.__storage_path)
+
+    @staticmethod
+    def compact_journal() -> bool:
+        """
+        Write a snapshot of all Boards and continue with an empty journal (journal mode only).
+        The locks are only held to copy the Board dictionary and to queue the rotation of the journal behind the
+        pending writes. The snapshot is written in the calling thread while the writers continue.
+
+        return compacted?
+        """
+        with BlackBoardHost.__compaction_lock:
+            committer = BlackBoardHost.__committer
+            backend = BlackBoardHost.__backend
+            if committer is None:
+                return False
+            snapshot_id = backend.begin_compaction()
+            if snapshot_id is None:
+                return False
+
+            with locks_timeout([BlackBoardHost.__board_lock.write,
+                                *[lock.write for lock in BlackBoardHost.__stripe_locks]], 10) as acquired:
+                if not acquired:
+                    return False
+                # The records are immutable, a shallow copy is a consistent snapshot (in copy-on-write mode even the
+                # dictionary is never changed)
+                if BlackBoardHost.__copy_on_write:
+                    boards = BlackBoardHost.__boards
+                else:
+                    boards = dict(BlackBoardHost.__boards)
+                committer.append({"op": "checkpoint", "id": snapshot_id})
+
+            return backend.finish_compaction(snapshot_id, boards)
+
+    @staticmethod
+    def __compact_periodically(stop: Event) -> None:
+        """
+        Compactor thread: Compacts the journal as soon as it has the configured number of records.
+
+        param - {Event} - stop - Set to stop the thread
+        """
+        while not stop.wait(1):
+            if BlackBoardHost.__backend.needs_compaction():
+                start = time.time()
+                if BlackBoardHost.compact_journal():
+                    logger.write_in_log([datetime.now(), "Compaction", "", "", "snapshot", time.time() - start])
+
+    @staticmethod
+    def __persist(*records: dict) -> int:
+        """
+        Hand one or several mutations of the Boards over to the background flusher.
+        Has to be called while holding the board lock, so the records are written in the order of the mutations.
+        If no flusher is running (Boards not loaded by load_boards or memory mode), they are stored directly.
+
+        param - {dict} - records - The records describing the mutations
+
+        return ticket for __wait_for_durability
+        """
+        if BlackBoardHost.__replication_log is not None:
+            BlackBoardHost.__replication_log.append(records)
+        if BlackBoardHost.__committer is None:
+            try:
+                BlackBoardHost.__write_batch(list(records))
+            except Exception:
+                print("[ERROR] Error while writing the Boards.")
+            return 0
+        return BlackBoardHost.__committer.extend(records)
+
+    @staticmethod
+    def __wait_for_durability(ticket: int, return_value: tuple = None) -> tuple:
+        """
+        Wait until the mutation with the given ticket meets the durability policy.
+        Must not be called while holding the board lock, otherwise concurrent writes can't be batched.
+
+        param - {int} - ticket - The ticket returned by __persist
+        param - {tuple} - return_value - The return value of the mutating call
+
+        return return_value OR (False, message) if the mutation could not be persisted
+        """
+        if ticket != 0 and BlackBoardHost.__committer is not None:
+            if not BlackBoardHost.__committer.wait(ticket):
+                return False, "[ERROR] The change could not be persisted! It may be lost on a restart."
+        return return_value
+
+    @staticmethod
+    def __write_batch(records: list) -> None:
+        """
+        Called by the background flusher to write a batch of pending mutations by the storage backend (e.g. with
+        one write and fsync). An error is raised to the flusher, which reports it to the waiting writers.
+
+        param - {list} - records - The records describing the mutations
+        """
+        BlackBoardHost.__backend.write(records, BlackBoardHost.__boards)
+
+    @staticmethod
+    def __read_result(name: str, board: Union[BoardRecord, None]) -> tuple:
+        """
+        Build the return value of exposed_read_blackboard for the given Blackboard.
+
+        param - {str} - name - Unique name of the Blackboard
+        param - {BoardRecord or None} - board - The Blackboard or None if it does not exist
+
+        return (True, data, is_valid, message) OR (False, message)
+        """
+        if board is None:
+            # Blackboard does not exist
+            return False, "[ERROR] Board does not exist!"
+
+        # Read Blackboard (compressed data is returned decompressed)
+        is_valid = BlackBoardHost.__board_is_valid(board)
+        data = payload.decompress_data(BlackBoardHost.__board_data(name, board))
+        if data is None:
+            # Return value with empty data (always invalid)
+            return True, data, False, "[WARNING] Successfully read but data is empty!"
+        elif not is_valid:
+            # Return value with invalid data
+            return True, data, is_valid, "[WARNING] Successfully read but data is invalid!"
+        else:
+            # Return value with valid data
+            return True, data, is_valid, "[INFO] Successfully read with valid data!"
+
+    @staticmethod
+    def __board_data(name: str, board: BoardRecord) -> Union[str, bytes, payload.CompressedData, None]:
+        """
+        Return the data of a Blackboard, data kept by the storage backend (ON_DISK) is read from it.
+
+        param - {str} - name - Unique name of the Blackboard
+        param - {BoardRecord} - board - The Blackboard
+
+        return data
+        """
+        if board.data is ON_DISK:
+            return BlackBoardHost.__backend.read(name)
+        return board.data
+
+    @staticmethod
+    def __board_with_data(name: str, board: BoardRecord) -> BoardRecord:
+        """
+        Return the Blackboard with its data instead of ON_DISK (e.g. for a snapshot of all Boards).
+
+        param - {str} - name - Unique name of the Blackboard
+        param - {BoardRecord} - board - The Blackboard
+
+        return BoardRecord
+        """
+        if board.data is ON_DISK:
+            return board.replace(data=BlackBoardHost.__backend.read(name))
+        return board
+
+    @staticmethod
+    def __offload(boards: dict) -> dict:
+        """
+        Hand the data of the given Boards, which replace all Boards, over to the storage backend (see
+        StorageBackend.offload). Has to be called while holding all locks, before the Boards are persisted.
+
+        param - {dict} - boards - The BoardRecords by name
+
+        return BoardRecords by name
+        """
+        backend = BlackBoardHost.__backend
+        backend.discard_all()
+        for name, board in boards.items():
+            if board.data is not None:
+                data = backend.offload(name, board.data)
+                if data is not board.data:
+                    boards[name] = board.replace(data=data)
+        return boards
+
+    @staticmethod
+    def __status_result(board: Union[BoardRecord, None]) -> tuple:
+        """
+        Build the return value of exposed_get_blackboard_status for the given Blackboard.
+
+        param - {BoardRecord or None} - board - The Blackboard or None if it does not exist
+
+        return (True, is_empty, entry_time, is_valid, message) OR (False, message)
+        """
+        if board is None:
+            # Blackboard does not exist
+            return False, "[ERROR] Board does not exist!"
+
+        # Get Blackboard state
+        if board.data is None:
+            is_empty = True
+        else:
+            is_empty = False
+        is_valid = BlackBoardHost.__board_is_valid(board)
+        return True, is_empty, board.entry_time, is_valid and not is_empty, "[INFO] Successfully read Board status!"
+
+    @staticmethod
+    def __batch_result(results: tuple, action: str) -> tuple:
+        """
+        Build the return value of a batch method from the results per Board.
+
+        param - {tuple} - results - The (name, result) pairs
+        param - {str} - action - The action for the message, e.g. "read"
+
+        return (True, results, message)
+        """
+        successful = sum(1 for _, result in results if result[0])
+        if successful == len(results):
+            return True, results, f"[INFO] Successfully {action} {successful} Boards!"
+        return True, results, f"[WARNING] Only {action} {successful} of {len(results)} Boards! See the single results."
+
+    @staticmethod
+    def __payload_size_allowed(data: Union[str, bytes]) -> bool:
+        """
+        Check the data against the maximum payload size.
+
+        param - {str or bytes} - data - The data written to a Blackboard
+
+        return allowed?
+        """
+        max_size = BlackBoardHost.__max_payload_size
+        return max_size is None or payload.payload_size(data) <= max_size
+
+    @staticmethod
+    def __stored_data(data: Union[str, bytes]) -> Union[str, bytes, payload.CompressedData]:
+        """
+        Return the data as it is stored on a Blackboard: compressed if it is larger than the compression threshold.
+        Data exceeding the maximum payload size is rejected later, so it isn't compressed.
+
+        param - {str or bytes} - data - The data written to a Blackboard
+
+        return data OR CompressedData
+        """
+        if not BlackBoardHost.__payload_size_allowed(data):
+            return data
+        return payload.compress_data(data, BlackBoardHost.__compression_threshold)
+
+    @staticmethod
+    def __payload_too_large() -> tuple:
+        """
+        Return the result of a write whose data exceeds the maximum payload size.
+
+        return (False, message)
+        """
+        return False, f"[ERROR] Data too large! The maximum payload size is {BlackBoardHost.__max_payload_size} bytes."
+
+    @staticmethod
+    def __next_version(board: Union[BoardRecord, None] = None) -> int:
+        """
+        Return the version of a new Blackboard or of the Blackboard after the next change of its data.
+        The version is taken from the sequence of all Boards, so it is greater than every version given before, also
+        to a Board with the same name which was deleted meanwhile.
+
+        param - {BoardRecord or None} - board - The changed Blackboard OR None for a new one
+
+        return version
+        """
+        with BlackBoardHost.__version_lock:
+            last_version = BlackBoardHost.__last_version
+            if board is not None and board.version > last_version:
+                last_version = board.version
+            BlackBoardHost.__last_version = last_version + 1
+            return last_version + 1
+
+    @staticmethod
+    def __seed_versions(boards: dict) -> None:
+        """
+        Continue the version sequence after loading the Boards. The versions of deleted Boards are not persisted, so
+        the sequence starts at the current time in microseconds: It is greater than every version of the previous
+        run as long as that run changed less than a million Boards per second on average.
+
+        param - {dict} - boards - The loaded BoardRecords by name
+        """
+        last_version = max((board.version for board in boards.values()), default=0)
+        with BlackBoardHost.__version_lock:
+            BlackBoardHost.__last_version = max(BlackBoardHost.__last_version, last_version, time.time_ns() // 1000)
+
+    @staticmethod
+    def __advance_versions(version: int) -> None:
+        """
+        Continue the version sequence after a version given by the primary (replica), so the replica never gives
+        out a version again which clients have already seen after it was promoted.
+
+        param - {int} - version - The version of a replicated Board
+        """
+        with BlackBoardHost.__version_lock:
+            if version > BlackBoardHost.__last_version:
+                BlackBoardHost.__last_version = version
+
+    @staticmethod
+    def __board_is_valid(board: BoardRecord) -> bool:
+        """
+        Return true, if the data on the board is valid.
+        Else it returns false.
+
+        param - {BoardRecord} - board - The Blackboard
+
+        return valid?
+        """
+        return board.entry_time + board.valid_sec >= time.time()
+
+    @staticmethod
+    def __publish(name: str, board: Union[BoardRecord, None]) -> None:
+        """
+        Set or delete a Blackboard in __boards. Has to be called while holding the exclusive lock of the Board.
+        In copy-on-write mode a new version of __boards is built and published by swapping the reference.
+        Afterwards the indices are updated and the subscribers of the Board are notified.
+
+        param - {str} - name - Unique name of the Blackboard
+        param - {BoardRecord or None} - board - The new Blackboard or None to delete it
+        """
+        # The storage backend may keep the new data itself (sqlite mode), then the index only holds ON_DISK
+        data = None if board is None else board.data
+        if data is None:
+            BlackBoardHost.__backend.discard(name)
+        elif data is not ON_DISK:
+            kept = BlackBoardHost.__backend.offload(name, data)
+            if kept is not data:
+                board = board.replace(data=kept)
+
+        # Creating and deleting a Board changes the names (both hold the board lock)
+        if board is None:
+            BlackBoardHost.__names.remove(name)
+        elif name not in BlackBoardHost.__boards:
+            BlackBoardHost.__names.add(name)
+
+        if not BlackBoardHost.__copy_on_write:
+            if board is None:
+                del BlackBoardHost.__boards[name]
+            else:
+                BlackBoardHost.__boards[name] = board
+        else:
+            # Writers of different stripes have to build their versions one after another
+            with BlackBoardHost.__publish_lock:
+                boards = dict(BlackBoardHost.__boards)
+                if board is None:
+                    del boards[name]
+                else:
+                    boards[name] = board
+                BlackBoardHost.__boards = boards
+
+        # Update the expiry index (only Boards with data can expire)
+        if board is None or board.data is None:
+            BlackBoardHost.__expiry.remove(name)
+        else:
+            BlackBoardHost.__expiry.update(name, board.entry_time + board.valid_sec)
+
+        # Notify the subscribers of the Board (only queued, the delivery happens in the background)
+        if board is None:
+            BlackBoardHost.__notifier.publish(name, "deleted")
+            BlackBoardHost.__notifier.remove_boards((name,))
+        elif board.data is None:
+            BlackBoardHost.__notifier.publish(name, "cleared", None, board.entry_time)
+        else:
+            BlackBoardHost.__notifier.publish(name, "updated", data, board.entry_time)
+
+    @staticmethod
+    def __read_lock(lock: ReadWriteLock):
+        """
+        Return the context manager for reading a Board protected by the given lock.
+        In copy-on-write mode no lock is needed, the context manager always yields acquired.
+
+        param - {ReadWriteLock} - lock - The lock protecting the Board
+
+        return context manager yielding acquired?
+        """
+        if BlackBoardHost.__copy_on_write:
+            return nullcontext(True)
+        return lock_timeout(lock.read, 10)
+
+    @staticmethod
+    def __stripe_lock(name: str) -> ReadWriteLock:
+        """
+        Return the striped lock which protects the given Blackboard.
+        Operations on a single Board only take this lock, so Boards in different stripes don't block each other.
+        Structural operations take the board lock first and then the striped lock(s).
+        Reading operations take the lock shared, writing operations exclusive.
+
+        param - {str} - name - Unique name of the Blackboard
+
+        return lock
+        """
+        return BlackBoardHost.__stripe_locks[BlackBoardHost.__stripe_index(name)]
+
+    @staticmethod
+    def __stripe_index(name: str) -> int:
+        """
+        Return the index of the striped lock which protects the given Blackboard.
+        Several striped locks have to be acquired in ascending order of their indices.
+
+        param - {str} - name - Unique name of the Blackboard
+
+        return index
+        """
+        return hash(name) % len(BlackBoardHost.__stripe_locks)
+
+
+# =====Functions=======================================
+def show_help() -> None:
+    """
+    Print a help text on the console.
+    """
+    print("BlackBoardServer v0.1")
+    print("Arguments:")
+    print("-p / --port: Set the used port (default=8080)")
+    print("-s / --storage: Set the persistence mode 'json', 'journal', 'sqlite' or 'memory' (no persistence) "
+          "(default=json)")
+    print("--storage-path: Set the path of the persistence file without extension (default=boards)")
+    print("--shards: Start this number of shard processes on the following ports and route the calls to them "
+          "(default=0, no sharding)")
+    print("--expiry-policy: Set what happens to expired data 'none', 'clear' or 'evict' (delete the Board) "
+          "(default=none)")
+    print("--sweep-interval: Set the time in seconds between two searches for expired data (default=1)")
+    print("--max-payload-size: Set the maximum size of the data of a Board in bytes (default=0, no limit)")
+    print("--snapshot-records: Journal mode: Write a snapshot and compact the journal after this number of records "
+          "(default=100000, 0=never)")
+    print("--cache-size: Sqlite mode: Set the maximum size of the cached Board data in bytes (default=67108864)")
+    print("--compress-above: Keep data larger than this size in bytes zlib compressed in memory and in the "
+          "persistence file (default=none)")
+    print("--primary: Keep the latest changes for read-only replicas of this server")
+    print("--replica-of: Run as read-only replica of the given primary <host>:<port>")
+    print("-c / --copy-on-write: Serve reads lock-free from immutable snapshots of the Boards")
+    print("-e / --event-loop: Serve all clients by an asyncio event loop and a fixed pool of worker threads instead of "
+          "one thread per client")
+    print("-t / --threads: Set the number of worker threads of the event loop (default=8)")
+    print("--max-active: Limit the number of requests which are served at the same time (default=0, no limit)")
+    print("--max-queued: Set the number of requests which wait for a free slot, further requests are rejected "
+          "immediately (default=0)")
+    print("--max-queue-wait: Set the maximum time in seconds a request waits for a free slot (default=1)")
+    print("-d / --durability: Set the durability policy 'always', '<N>ms' or '<N>writes' (default=always)")
+    print("--log-file: Set the path of the log file (default=log.csv)")
+    print("--log-level: Set the minimum log level DEBUG, INFO, WARNING, ERROR or OFF (default=INFO)")
+    print("--log-sample: Log only a share of a method's calls, e.g. read_blackboard=0.01 (repeatable)")
+    print("--log-max-length: Set the maximum length of logged arguments and return values (default=1000)")
+    print("--log-max-bytes: Rotate the log file when it reaches this size in bytes (default=0, no limit)")
+    print("--log-rotate-interval: Rotate the log file after this time in seconds (default=0, no limit)")
+    print("--log-queue: Set the maximum number of pending log entries (default=10000)")
+    print("--log-drop: Drop log entries if the log queue is full instead of waiting")
+    print("-h / --help: Show this text")
+
+
+def start_shards(port: int, shards: int, argv: list) -> list:
+    """
+    Start the shard processes on the ports following the given port and wait until they accept connections.
+    Every shard owns a hash partition of the Board names and has its own persistence and log file
+    (boards-shard<index>.json, log-shard<index>.csv).
+
+    param - {int} - port - The port of the router
+    param - {int} - shards - The number of shards
+    param - {list} - argv - The options which are passed on to the shards
+
+    return shard processes
+    """
+    processes = []
+    for index in range(shards):
+        processes.append(subprocess.Popen([sys.executable, os.path.abspath(__file__), *argv,
+                                           "--port", str(port + 1 + index),
+                                           "--storage-path", f"boards-shard{index}",
+                                           "--log-file", f"log-shard{index}.csv"]))
+
+    # Wait until every shard accepts connections
+    for index, process in enumerate(processes):
+        deadline = time.time() + 10
+        while True:
+            try:
+                rpyc.connect("localhost", port + 1 + index).close()
+                break
+            except OSError:
+                if process.poll() is not None or time.time() > deadline:
+                    print(f"[ERROR] Shard {index} could not be started on port {port + 1 + index}.")
+                    stop_shards(processes)
+                    exit()
+                time.sleep(0.1)
+    print(f"[INFO] Started {shards} shards on the ports {port + 1} to {port + shards}.")
+    return processes
+
+
+def stop_shards(processes: list) -> None:
+    """
+    Stop the shard processes like Ctrl+C, so they store their pending writes, and wait for them.
+
+    param - {list} - processes - The shard processes
+    """
+    for process in processes:
+        if process.poll() is None:
+            process.send_signal(signal.SIGINT if os.name != "nt" else signal.CTRL_C_EVENT)
+    for process in processes:
+        try:
+            process.wait(30)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+# =====Main============================================
+def main(argv: list) -> None:
+    """
+    The main-function of the server.
+    Parses the given arguments to determine the server port (default: 8080) and the server options (see show_help).
     Afterward the server the existing Blackboards form the board.json file are loaded and the server is started.
+    With the shards option the shard processes are started first and this process only routes the calls to them.
     It also logs the start and stop of the server.
 
     param - {str} - argv - A list of the arguments
     """
     # Parse arguments:
     try:
-        opts, args = getopt.getopt(argv, "p:h", ["port=", "help"])
+        opts, args = getopt.getopt(argv, "p:s:d:cet:h", ["port=", "storage=", "durability=", "copy-on-write",
+                                                         "event-loop", "threads=", "max-active=", "max-queued=",
+                                                         "max-queue-wait=", "storage-path=", "shards=", "log-file=",
+                                                         "primary", "replica-of=", "expiry-policy=", "sweep-interval=",
+                                                         "max-payload-size=", "compress-above=",
+                                                         "snapshot-records=", "cache-size=",
+                                                         "log-level=", "log-sample=", "log-max-length=",
+                                                         "log-max-bytes=", "log-rotate-interval=",
+                                                         "log-queue=", "log-drop", "help"])
     except getopt.GetoptError as err:
         print("[ERROR] Invalid arguments.")
         sys.exit()
     port = 8080
+    storage = "json"
+    durability = ("always", 0)
+    copy_on_write = False
+    event_loop = False
+    threads = 8
+    max_active = 0
+    max_queued = 0
+    max_queue_wait = 1.0
+    storage_path = "boards"
+    shards = 0
+    primary = False
+    replica_of = None
+    expiry_policy = "none"
+    sweep_interval = 1.0
+    max_payload_size = None
+    compression_threshold = None
+    snapshot_records = 100000
+    cache_size = 64 * 1024 * 1024
+    # The options which are passed on to the shard processes
+    shard_argv = []
+    log_queue_size = 10000
+    log_drop = False
+    log_max_bytes = 0
+    log_rotate_interval = 0
 
     if len(args) != 0:
         print("[ERROR] Invalid arguments.")
 
     for o, a in opts:
+        if o not in ("-p", "--port", "--storage-path", "--shards", "--log-file"):
+            shard_argv += [o, a] if a != "" else [o]
         if o in ("-h", "--help"):
             show_help()
             exit()
@@ -433,24 +1942,229 @@ def main(argv: list) -> None:
             if port < 0 or port > 49151:
                 print("[ERROR] Port number out of range.")
                 exit()
+        elif o in ("-s", "--storage"):
+            if a not in ("json", "journal", "sqlite", "memory"):
+                print("[ERROR] Invalid storage. Use 'json', 'journal', 'sqlite' or 'memory'.")
+                exit()
+            storage = a
+        elif o == "--storage-path":
+            storage_path = a
+        elif o == "--shards":
+            try:
+                shards = int(a)
+            except ValueError:
+                print("[ERROR] Invalid number of shards.")
+                exit()
+            if shards < 0:
+                print("[ERROR] The number of shards must be greater or equal to 0.")
+                exit()
+        elif o == "--expiry-policy":
+            if a not in ("none", "clear", "evict"):
+                print("[ERROR] Invalid expiry policy. Use 'none', 'clear' or 'evict'.")
+                exit()
+            expiry_policy = a
+        elif o == "--sweep-interval":
+            try:
+                sweep_interval = float(a)
+            except ValueError:
+                print("[ERROR] Invalid sweep interval.")
+                exit()
+            if sweep_interval <= 0:
+                print("[ERROR] The sweep interval must be greater than 0.")
+                exit()
+        elif o == "--max-payload-size":
+            try:
+                max_payload_size = int(a)
+            except ValueError:
+                print("[ERROR] Invalid maximum payload size.")
+                exit()
+            if max_payload_size < 0:
+                print("[ERROR] The maximum payload size must be greater or equal to 0.")
+                exit()
+            max_payload_size = max_payload_size or None
+        elif o == "--snapshot-records":
+            try:
+                snapshot_records = int(a)
+            except ValueError:
+                print("[ERROR] Invalid number of snapshot records.")
+                exit()
+            if snapshot_records < 0:
+                print("[ERROR] The number of snapshot records must be greater or equal to 0.")
+                exit()
+        elif o == "--cache-size":
+            try:
+                cache_size = int(a)
+            except ValueError:
+                print("[ERROR] Invalid cache size.")
+                exit()
+            if cache_size < 0:
+                print("[ERROR] The cache size must be greater or equal to 0.")
+                exit()
+        elif o == "--compress-above":
+            try:
+                compression_threshold = int(a)
+            except ValueError:
+                print("[ERROR] Invalid compression threshold.")
+                exit()
+            if compression_threshold < 0:
+                print("[ERROR] The compression threshold must be greater or equal to 0.")
+                exit()
+        elif o == "--primary":
+            primary = True
+        elif o == "--replica-of":
+            try:
+                host, primary_port = a.rsplit(":", 1)
+                replica_of = (host, int(primary_port))
+            except ValueError:
+                print("[ERROR] Invalid primary address. Use <host>:<port>.")
+                exit()
+        elif o in ("-c", "--copy-on-write"):
+            copy_on_write = True
+        elif o in ("-e", "--event-loop"):
+            event_loop = True
+        elif o in ("-t", "--threads"):
+            try:
+                threads = int(a)
+            except ValueError:
+                print("[ERROR] Invalid number of threads.")
+                exit()
+            if threads <= 0:
+                print("[ERROR] The number of threads must be greater than 0.")
+                exit()
+        elif o == "--max-active":
+            try:
+                max_active = int(a)
+            except ValueError:
+                print("[ERROR] Invalid number of active requests.")
+                exit()
+            if max_active < 0:
+                print("[ERROR] The number of active requests must be greater or equal to 0.")
+                exit()
+        elif o == "--max-queued":
+            try:
+                max_queued = int(a)
+            except ValueError:
+                print("[ERROR] Invalid number of queued requests.")
+                exit()
+            if max_queued < 0:
+                print("[ERROR] The number of queued requests must be greater or equal to 0.")
+                exit()
+        elif o == "--max-queue-wait":
+            try:
+                max_queue_wait = float(a)
+            except ValueError:
+                print("[ERROR] Invalid queue waiting time.")
+                exit()
+        elif o in ("-d", "--durability"):
+            try:
+                durability = parse_durability(a)
+            except ValueError:
+                print("[ERROR] Invalid durability policy. Use 'always', '<N>ms' or '<N>writes'.")
+                exit()
+        elif o == "--log-file":
+            logger.set_log_file(a)
+        elif o == "--log-level":
+            try:
+                logger.set_log_level(a)
+            except ValueError:
+                print("[ERROR] Invalid log level. Use DEBUG, INFO, WARNING, ERROR or OFF.")
+                exit()
+        elif o == "--log-sample":
+            try:
+                method, rate = a.split("=")
+                if not method.startswith("exposed_"):
+                    method = "exposed_" + method
+                logger.set_sampling_rate(method, float(rate))
+            except ValueError:
+                print("[ERROR] Invalid log sampling rate. Use <method>=<rate between 0 and 1>.")
+                exit()
+        elif o == "--log-max-length":
+            try:
+                logger.set_max_length(int(a))
+            except ValueError:
+                print("[ERROR] Invalid maximum log length.")
+                exit()
+        elif o == "--log-max-bytes":
+            try:
+                log_max_bytes = int(a)
+            except ValueError:
+                print("[ERROR] Invalid maximum log size.")
+                exit()
+        elif o == "--log-rotate-interval":
+            try:
+                log_rotate_interval = float(a)
+            except ValueError:
+                print("[ERROR] Invalid log rotation interval.")
+                exit()
+        elif o == "--log-queue":
+            try:
+                log_queue_size = int(a)
+            except ValueError:
+                print("[ERROR] Invalid log queue size.")
+                exit()
+            if log_queue_size <= 0:
+                print("[ERROR] The log queue size must be greater than 0.")
+                exit()
+        elif o == "--log-drop":
+            log_drop = True
+
+    if (primary or replica_of is not None) and shards > 0:
+        print("[ERROR] Replication can't be combined with shards.")
+        exit()
+    if port + shards > 49151:
+        print("[ERROR] Port number of the shards out of range.")
+        exit()
+
+    logger.configure_log(log_queue_size, log_drop)
+    try:
+        logger.configure_rotation(log_max_bytes, log_rotate_interval)
+    except ValueError:
+        print("[ERROR] The log rotation size and interval must be greater or equal to 0.")
+        exit()
+
+    # Start the shards, this process only routes the calls to them
+    service = BlackBoardHost
+    shard_processes = []
+    if shards > 0:
+        shard_processes = start_shards(port, shards, shard_argv)
+        ShardRouter.set_shards(tuple(("localhost", port + 1 + index) for index in range(shards)))
+        service = ShardRouter
 
     # Initialize the server
     print("[INFO] Starting server on port " + str(port) + "...")
     server = None
     try:
-        server = ThreadedServer(BlackBoardHost, port=port)
+        if event_loop:
+            server = EventLoopServer(service, port=port, threads=threads)
+        else:
+            server = ThreadedServer(service, port=port)
     except Exception as e:
         if isinstance(e, OSError):
             print("[ERROR] Server could not be started on port " + str(port) + ". Maybe this port is already used.")
-            exit()
         else:
             print("[ERROR] An unknown error occurred. Closing the application.")
-            exit()
+        stop_shards(shard_processes)
+        exit()
 
     # Start the Server
     try:
         logger.write_in_log([datetime.now(), "Server-Start"])
-        BlackBoardHost.load_boards()
+        if shards == 0:
+            BlackBoardHost.set_storage(storage)
+            BlackBoardHost.set_storage_path(storage_path)
+            BlackBoardHost.set_durability(durability)
+            BlackBoardHost.set_copy_on_write(copy_on_write)
+            BlackBoardHost.set_admission(max_active, max_queued, max_queue_wait)
+            BlackBoardHost.set_max_payload_size(max_payload_size)
+            BlackBoardHost.set_compression_threshold(compression_threshold)
+            BlackBoardHost.set_snapshot_records(snapshot_records)
+            BlackBoardHost.set_cache_size(cache_size)
+            if primary:
+                BlackBoardHost.set_primary()
+            BlackBoardHost.load_boards()
+            if replica_of is not None:
+                BlackBoardHost.start_replication(*replica_of)
+            BlackBoardHost.start_sweeper(expiry_policy, sweep_interval)
         print("[INFO] Server started. To stop please use Ctrl+C.")
         server.start()
     except KeyboardInterrupt:
@@ -458,7 +2172,10 @@ def main(argv: list) -> None:
     except:
         print("[ERROR] An unknown error occurred. Closing the application.")
 
+    BlackBoardHost.close_storage()
+    stop_shards(shard_processes)
     logger.write_in_log([datetime.now(), "Server-Stop"])
+    logger.close_log()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,82 @@
+"""
+    Admission control:
+    Limits the number of requests which are served at the same time (worker slots) and the number of requests which
+    wait for a free slot (request queue). A request which finds the queue full is rejected immediately, so an overload
+    does not turn into a pile-up of blocked threads.
+"""
+
+# =====Imports=========================================
+from contextlib import contextmanager
+from threading import Lock, Condition
+
+
+# =====AdmissionController Class=======================
+class AdmissionController:
+    def __init__(self, max_active: int, max_queued: int = 0, max_wait: float = 1):
+        """
+        Initializes the AdmissionController.
+
+        param - {int} - max_active - Maximum number of requests which are served at the same time
+        param - {int} - max_queued - Maximum number of requests which wait for a free slot
+        param - {float} - max_wait - Maximum time a request waits for a free slot before it is rejected
+        """
+        if max_active <= 0:
+            raise ValueError(f"The number of active requests must be greater than 0! Given value: {max_active}.")
+        if max_queued < 0:
+            raise ValueError(f"The queue size must be greater or equal to 0! Given value: {max_queued}.")
+        self.__max_active = max_active
+        self.__max_queued = max_queued
+        self.__max_wait = max_wait
+        self.__condition = Condition(Lock())
+        self.__active = 0
+        self.__queued = 0
+        self.__rejected = 0
+
+    @contextmanager
+    def admit(self):
+        """
+        Context manager which takes a slot for the request, if possible.
+        Yields true, if the request was admitted and has to be served. Yields false, if it has to be rejected.
+        """
+        admitted = self.__acquire()
+        try:
+            yield admitted
+        finally:
+            if admitted:
+                with self.__condition:
+                    self.__active -= 1
+                    self.__condition.notify()
+
+    def get_stats(self) -> tuple:
+        """
+        Return the current load.
+
+        return (active requests, queued requests, rejected requests so far)
+        """
+        with self.__condition:
+            return self.__active, self.__queued, self.__rejected
+
+    def __acquire(self) -> bool:
+        """
+        Take a free slot. If there is none, wait in the queue or reject the request if the queue is full.
+
+        return admitted?
+        """
+        with self.__condition:
+            if self.__active < self.__max_active:
+                self.__active += 1
+                return True
+            if self.__queued >= self.__max_queued:
+                self.__rejected += 1
+                return False
+
+            self.__queued += 1
+            try:
+                admitted = self.__condition.wait_for(lambda: self.__active < self.__max_active, self.__max_wait)
+            finally:
+                self.__queued -= 1
+            if admitted:
+                self.__active += 1
+            else:
+                self.__rejected += 1
+            return admitted
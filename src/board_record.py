@@ -0,0 +1,84 @@
+"""
+    Board record:
+    Contains the in-memory representation of a single Blackboard. A slotted class needs no dictionary per Board, so
+    a record costs about a third of the former dict with the keys "valid_sec", "entry_time", "data" and "version".
+    The records are never changed after they are published, a change builds a new record by replace.
+    The persistence files still contain the Boards as dictionaries (to_dict / from_dict).
+"""
+
+# =====Imports=========================================
+from typing import Union
+
+
+# =====BoardRecord Class===============================
+class BoardRecord:
+    __slots__ = ("valid_sec", "entry_time", "data", "version")
+
+    def __init__(self, valid_sec: float, entry_time: float, data=None, version: int = 0):
+        """
+        Initializes the BoardRecord.
+
+        param - {float} - valid_sec - Time the data in the Blackboard is valid
+        param - {float} - entry_time - Time of the last update
+        param - {str or bytes or CompressedData or None} - data - The stored data (None: empty)
+        param - {int} - version - Number of changes of the data
+        """
+        self.valid_sec = valid_sec
+        self.entry_time = entry_time
+        self.data = data
+        self.version = version
+
+    def __eq__(self, other) -> bool:
+        return (isinstance(other, BoardRecord) and self.valid_sec == other.valid_sec
+                and self.entry_time == other.entry_time and self.data == other.data and self.version == other.version)
+
+    def __repr__(self) -> str:
+        return (f"BoardRecord(valid_sec={self.valid_sec!r}, entry_time={self.entry_time!r}, data={self.data!r}, "
+                f"version={self.version!r})")
+
+    def replace(self, **changes) -> "BoardRecord":
+        """
+        Return a new record with the given fields changed.
+
+        param - {any} - changes - New values by field name
+
+        return record
+        """
+        record = BoardRecord(self.valid_sec, self.entry_time, self.data, self.version)
+        for field, value in changes.items():
+            setattr(record, field, value)
+        return record
+
+    def to_dict(self) -> dict:
+        """
+        Return the record as dictionary like it is stored in the persistence files.
+
+        return board dictionary
+        """
+        return {"valid_sec": self.valid_sec, "entry_time": self.entry_time, "data": self.data, "version": self.version}
+
+    @staticmethod
+    def from_dict(board: Union[dict, "BoardRecord"]) -> "BoardRecord":
+        """
+        Build a record from a board dictionary of a persistence file.
+        Boards stored before the versioning was introduced have the version 0.
+
+        param - {dict or BoardRecord} - board - The board dictionary (a record is returned unchanged)
+
+        return record
+        """
+        if isinstance(board, BoardRecord):
+            return board
+        return BoardRecord(board["valid_sec"], board["entry_time"], board["data"], board.get("version", 0))
+
+
+# =====Functions=======================================
+def records_from_dicts(boards: dict) -> dict:
+    """
+    Convert the board dictionaries of a persistence file to records.
+
+    param - {dict} - boards - The board dictionaries by name
+
+    return records by name
+    """
+    return {name: BoardRecord.from_dict(board) for name, board in boards.items()}
@@ -0,0 +1,304 @@
+"""
+    Disk store:
+    Contains the disk-backed storage of the Blackboards in an sqlite database.
+    Only the index of the Boards (name, valid_sec, entry_time, version) is kept in memory, a Board with data holds the
+    marker ON_DISK instead of its data. The data is read from the database on demand and the recently used data is
+    kept in an LRU cache with a byte budget.
+    Writes are applied by the background flusher (the same records as in the journal) as indexed upserts by name.
+    Until a write is committed, its data is staged in memory, so readers always get the latest data.
+"""
+
+# =====Imports=========================================
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Union
+
+import src.payload as payload
+from src.board_record import BoardRecord
+from src.payload import CompressedData, stored_size
+from src.storage import StorageBackend, ON_DISK
+
+# =====Constants=======================================
+# Number of the generation counters of the names (see DiskStore.read)
+GENERATIONS = 1024
+# Values of the compressed column
+UNCOMPRESSED = 0
+COMPRESSED_TEXT = 1
+COMPRESSED_BYTES = 2
+
+
+# =====DiskStore Class=================================
+class DiskStore(StorageBackend):
+    def __init__(self, path: str, cache_bytes: int = 64 * 1024 * 1024):
+        """
+        Initializes the DiskStore and opens (or creates) the database <path>.sqlite.
+
+        param - {str} - path - Path of the database file without extension
+        param - {int} - cache_bytes - Maximum size of the cached data in bytes
+        """
+        super().__init__(path)
+        self.is_new = not os.path.exists(path + '.sqlite')
+        self.__cache_bytes = cache_bytes
+        self.__lock = threading.Lock()
+        # Data of the writes which are not committed yet: name -> data
+        self.__pending = {}
+        # LRU cache of the committed data: name -> (data, size)
+        self.__cache = OrderedDict()
+        self.__cached_bytes = 0
+        self.__hits = 0
+        self.__misses = 0
+        # Changed by every write and discard of a name with this hash (all by discard_all), so a read from the
+        # database which raced with a change doesn't put the old data into the cache
+        self.__generations = [0] * GENERATIONS
+        self.__epoch = 0
+        # Every reading thread has its own connection, the writes use this one
+        self.__local = threading.local()
+        self.__connection = self.__connect()
+        self.__connection.execute("CREATE TABLE IF NOT EXISTS boards (name TEXT PRIMARY KEY, valid_sec REAL, "
+                                  "entry_time REAL, version INTEGER, compressed INTEGER, size INTEGER, data)")
+        self.__connection.commit()
+
+    def __connect(self) -> sqlite3.Connection:
+        """
+        Open a connection to the database in write-ahead-log mode (readers don't wait for the writer).
+
+        return connection
+        """
+        connection = sqlite3.connect(self.path + '.sqlite', check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=FULL")
+        return connection
+
+    def __reader(self) -> sqlite3.Connection:
+        """
+        Return the reading connection of the current thread.
+
+        return connection
+        """
+        connection = getattr(self.__local, "connection", None)
+        if connection is None:
+            connection = self.__local.connection = self.__connect()
+        return connection
+
+    def load(self) -> dict:
+        """
+        Load the index of all Boards. A new database imports the Boards of an existing board.json file once.
+
+        return BoardRecords by name
+        """
+        if self.is_new and os.path.exists(self.path + '.json'):
+            try:
+                with open(self.path + '.json', 'r') as file:
+                    self.write([{"op": "restore", "boards": payload.load(file)}])
+                print("[INFO] Imported the Boards of the board.json file.")
+            except Exception:
+                print("[ERROR] Error while importing the board.json file.")
+        boards = self.load_index()
+        print("[INFO] Successfully read Boards.")
+        return boards
+
+    def load_index(self) -> dict:
+        """
+        Return the BoardRecords of all Boards without their data (ON_DISK for Boards with data).
+
+        return BoardRecords by name
+        """
+        with self.__lock:
+            rows = self.__connection.execute("SELECT name, valid_sec, entry_time, version, data IS NOT NULL "
+                                             "FROM boards").fetchall()
+        return {name: BoardRecord(valid_sec, entry_time, ON_DISK if has_data else None, version)
+                for name, valid_sec, entry_time, version, has_data in rows}
+
+    def stage(self, name: str, data) -> None:
+        """
+        Keep the data of a write until it is committed. Has to be called while holding the lock of the Board.
+
+        param - {str} - name - Unique name of the Blackboard
+        param - {str or bytes or CompressedData} - data - The new data
+        """
+        with self.__lock:
+            self.__pending[name] = data
+            self.__generations[hash(name) % GENERATIONS] += 1
+
+    def offload(self, name: str, data):
+        """
+        Stage the new data of a Board, in memory only ON_DISK is kept. Has to be called while holding the lock of
+        the Board.
+
+        param - {str} - name - Unique name of the Blackboard
+        param - {str or bytes or CompressedData} - data - The new data
+
+        return ON_DISK
+        """
+        self.stage(name, data)
+        return ON_DISK
+
+    def discard(self, name: str) -> None:
+        """
+        Forget the staged and cached data of a Board which was cleared or deleted.
+
+        param - {str} - name - Unique name of the Blackboard
+        """
+        with self.__lock:
+            self.__pending.pop(name, None)
+            self.__uncache(name)
+            self.__generations[hash(name) % GENERATIONS] += 1
+
+    def discard_all(self) -> None:
+        """
+        Forget the staged and cached data of all Boards.
+        """
+        with self.__lock:
+            self.__pending.clear()
+            self.__cache.clear()
+            self.__cached_bytes = 0
+            self.__epoch += 1
+
+    def read(self, name: str) -> Union[str, bytes, CompressedData, None]:
+        """
+        Return the data of a Board: staged, cached or from the database.
+        The data read from the database is only cached if the Board was not changed meanwhile (e.g. by a writer in
+        copy-on-write mode, where the readers don't hold the lock of the Board).
+
+        param - {str} - name - Unique name of the Blackboard
+
+        return data
+        """
+        with self.__lock:
+            if name in self.__pending:
+                return self.__pending[name]
+            if name in self.__cache:
+                self.__cache.move_to_end(name)
+                self.__hits += 1
+                return self.__cache[name][0]
+            self.__misses += 1
+            generation = (self.__epoch, self.__generations[hash(name) % GENERATIONS])
+
+        row = self.__reader().execute("SELECT compressed, size, data FROM boards WHERE name = ?", (name,)).fetchone()
+        if row is None or row[2] is None:
+            return None
+        compressed, size, data = row
+        if compressed != UNCOMPRESSED:
+            data = CompressedData(data, compressed == COMPRESSED_TEXT, size)
+
+        with self.__lock:
+            if name not in self.__pending and generation == (self.__epoch,
+                                                             self.__generations[hash(name) % GENERATIONS]):
+                self.__cache_data(name, data)
+        return data
+
+    def write(self, records: list, boards: dict = None) -> None:
+        """
+        Apply a batch of mutation records in one transaction. Afterwards the committed data moves from the staged
+        writes to the cache.
+
+        param - {list} - records - The records describing the mutations
+        param - {dict} - boards - The current BoardRecords by name (not needed)
+        """
+        committed = []
+        with self.__connection:
+            for record in records:
+                op = record["op"]
+                if op == "create":
+                    self.__connection.execute("INSERT OR REPLACE INTO boards VALUES (?, ?, ?, ?, 0, 0, NULL)",
+                                              (record["name"], record["valid_sec"], record["entry_time"],
+                                               record.get("version", 0)))
+                elif op == "display":
+                    compressed, size, data = self.__encode(record["data"])
+                    self.__connection.execute("UPDATE boards SET entry_time = ?, version = ?, compressed = ?, "
+                                              "size = ?, data = ? WHERE name = ?",
+                                              (record["entry_time"], record["version"], compressed, size, data,
+                                               record["name"]))
+                    committed.append((record["name"], record["data"]))
+                elif op == "clear":
+                    self.__connection.execute("UPDATE boards SET version = ?, compressed = 0, size = 0, data = NULL "
+                                              "WHERE name = ?", (record["version"], record["name"]))
+                elif op == "delete":
+                    self.__connection.execute("DELETE FROM boards WHERE name = ?", (record["name"],))
+                elif op == "delete_all":
+                    self.__connection.execute("DELETE FROM boards")
+                elif op == "restore":
+                    self.__connection.execute("DELETE FROM boards")
+                    for name, board in record["boards"].items():
+                        board = BoardRecord.from_dict(board)
+                        self.__connection.execute("INSERT INTO boards VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                                  (name, board.valid_sec, board.entry_time, board.version,
+                                                   *self.__encode(board.data)))
+                        committed.append((name, board.data))
+
+        with self.__lock:
+            for name, data in committed:
+                # Only if no newer write was staged meanwhile
+                if self.__pending.get(name) is data:
+                    del self.__pending[name]
+                    self.__cache_data(name, data)
+
+    def get_sizes(self) -> tuple:
+        """
+        Return the sizes of the stored data (see exposed_get_compression_stats).
+
+        return (compressed Boards, original bytes, stored bytes)
+        """
+        row = self.__reader().execute("SELECT COUNT(CASE WHEN compressed != 0 THEN 1 END), TOTAL(size), "
+                                      "TOTAL(LENGTH(CAST(data AS BLOB))) FROM boards").fetchone()
+        return row[0], int(row[1]), int(row[2])
+
+    def get_cache_stats(self) -> tuple:
+        """
+        Return the state of the cache.
+
+        return (cached Boards, cached bytes, budget in bytes, hits, misses, staged writes)
+        """
+        with self.__lock:
+            return (len(self.__cache), self.__cached_bytes, self.__cache_bytes, self.__hits, self.__misses,
+                    len(self.__pending))
+
+    def close(self) -> None:
+        """
+        Close the database connection of the writer.
+        """
+        with self.__lock:
+            self.__connection.close()
+
+    @staticmethod
+    def __encode(data) -> tuple:
+        """
+        Return the column values of the data.
+
+        param - {str or bytes or CompressedData or None} - data - The data of a Board
+
+        return (compressed, size, data)
+        """
+        if isinstance(data, CompressedData):
+            return COMPRESSED_TEXT if data.is_text else COMPRESSED_BYTES, data.size, data.compressed
+        return UNCOMPRESSED, stored_size(data)[0], data
+
+    def __cache_data(self, name: str, data) -> None:
+        """
+        Put data into the cache and evict the least recently used data beyond the budget. Has to be called while
+        holding the lock.
+
+        param - {str} - name - Unique name of the Blackboard
+        param - {str or bytes or CompressedData} - data - The committed data
+        """
+        self.__uncache(name)
+        size = stored_size(data)[1]
+        if size > self.__cache_bytes:
+            return
+        self.__cache[name] = (data, size)
+        self.__cached_bytes += size
+        while self.__cached_bytes > self.__cache_bytes:
+            _, (_, evicted_size) = self.__cache.popitem(last=False)
+            self.__cached_bytes -= evicted_size
+
+    def __uncache(self, name: str) -> None:
+        """
+        Remove data from the cache. Has to be called while holding the lock.
+
+        param - {str} - name - Unique name of the Blackboard
+        """
+        entry = self.__cache.pop(name, None)
+        if entry is not None:
+            self.__cached_bytes -= entry[1]
@@ -0,0 +1,311 @@
+"""
+    Event loop server:
+    Contains an RPyC server which serves all connections with one asyncio event loop and a fixed pool of worker
+    threads instead of one thread per connection (ThreadedServer).
+    The event loop accepts the connections and waits until a connection has a pending request. The connection is then
+    handed to a worker thread, which serves a batch of requests and gives the connection back to the event loop.
+    A request which waits for a long time (e.g. a long-poll) has to wait inside blocking(): A spare worker thread
+    serves the other connections meanwhile, so the long waits don't occupy the fixed pool.
+"""
+
+# =====Imports=========================================
+import socket
+import asyncio
+import threading
+from queue import Queue
+from threading import Thread, Lock
+from contextlib import contextmanager
+from rpyc.core.channel import Channel
+from rpyc.core.stream import SocketStream
+from rpyc.utils.authenticators import AuthenticationError
+from rpyc.utils.server import Server
+
+
+# =====Constants=======================================
+# Delay before a connection is watched again whose request was received by another thread meanwhile
+RETRY_DELAY = 0.01
+# Job which stops one worker thread (a spare worker after a blocking request)
+_RETIRE = object()
+# The server of the current worker thread (not set for other threads)
+_current = threading.local()
+
+
+# =====Functions=======================================
+@contextmanager
+def blocking():
+    """
+    Context manager for a request which waits for a long time (e.g. a long-poll). If the request is served by a
+    worker of an EventLoopServer, a spare worker is started for the duration of the wait, so the pool keeps serving
+    the other connections. Outside of an EventLoopServer nothing has to be done.
+    Yields true, if the request may wait. Yields false, if the server has already the maximum number of blocking
+    requests and the request has to be rejected.
+    """
+    server = getattr(_current, "server", None)
+    if server is None:
+        yield True
+        return
+    admitted = server._enter_blocking()
+    try:
+        yield admitted
+    finally:
+        if admitted:
+            server._leave_blocking()
+
+
+# =====EventLoopServer Class===========================
+class EventLoopServer(Server):
+    def __init__(self, service, threads: int = 8, batch_size: int = 10, max_blocking: int = 100, **kwargs):
+        """
+        Initializes the server. Takes the same keyword arguments as the other RPyC servers (e.g. port).
+
+        param - {rpyc.Service} - service - The service class of the connections
+        param - {int} - threads - Number of worker threads which serve the requests
+        param - {int} - batch_size - Maximum number of requests served from one connection before the next one
+        param - {int} - max_blocking - Maximum number of requests which wait inside blocking() at the same time
+        """
+        Server.__init__(self, service, **kwargs)
+        if threads <= 0:
+            raise ValueError(f"The number of threads must be greater than 0! Given value: {threads}.")
+        if max_blocking < 0:
+            raise ValueError(f"The number of blocking requests must be greater or equal to 0! "
+                             f"Given value: {max_blocking}.")
+        self.__threads = threads
+        self.__batch_size = batch_size
+        self.__max_blocking = max_blocking
+        self.__blocking = 0
+        self.__workers_lock = Lock()
+        self.__loop = None
+        self.__jobs = Queue()
+        self.__workers = []
+        # fd -> (socket, connection)
+        self.__connections = {}
+        # The fds of the connections which are served by a worker (not watched by the event loop meanwhile)
+        self.__busy = set()
+
+    def start(self) -> None:
+        """
+        Start the server (blocking). Use close to stop it.
+        """
+        self._listen()
+        self._register()
+        self.listener.setblocking(False)
+        self.__loop = asyncio.new_event_loop()
+        self.__workers = [Thread(target=self.__work, name=f"EventLoopWorker{i}", daemon=True)
+                          for i in range(self.__threads)]
+        for worker in self.__workers:
+            worker.start()
+
+        self.__loop.add_reader(self.listener.fileno(), self.__accept)
+        try:
+            self.__loop.run_forever()
+        except KeyboardInterrupt:
+            print("")
+            self.logger.warning("keyboard interrupt!")
+        finally:
+            self.logger.info("server has terminated")
+            self.close()
+
+    def close(self) -> None:
+        """
+        Close the server and all connections.
+        If the event loop is running in another thread, it is only stopped here and start closes the server.
+        """
+        loop = self.__loop
+        if loop is not None and loop.is_running():
+            loop.call_soon_threadsafe(loop.stop)
+            return
+        if self._closed:
+            return
+
+        with self.__workers_lock:
+            workers = list(self.__workers)
+        for worker in workers:
+            self.__jobs.put(None)
+        for fd in list(self.__connections):
+            self.__drop(fd)
+        if loop is not None:
+            loop.close()
+        Server.close(self)
+
+    def __accept(self) -> None:
+        """
+        Event loop: Accept a new connection. The connection is built by a worker thread, since the authentication
+        and the on_connect method of the service may block.
+        """
+        try:
+            sock, addrinfo = self.listener.accept()
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            self.__loop.stop()
+            return
+        sock.setblocking(True)
+        self.logger.info(f"accepted {addrinfo} with fd {sock.fileno()}")
+        self.clients.add(sock)
+        self.__jobs.put((self.__connect, sock))
+
+    def __watch(self, fd: int) -> None:
+        """
+        Event loop: Wait for the next request of a connection.
+
+        param - {int} - fd - The file descriptor of the connection
+        """
+        if fd in self.__connections and fd not in self.__busy:
+            self.__loop.add_reader(fd, self.__readable, fd)
+
+    def __readable(self, fd: int) -> None:
+        """
+        Event loop: A connection has a pending request, hand it to a worker thread.
+        The connection is not watched until the worker gives it back.
+
+        param - {int} - fd - The file descriptor of the connection
+        """
+        self.__loop.remove_reader(fd)
+        self.__busy.add(fd)
+        self.__jobs.put((self.__serve, fd))
+
+    def __release(self, fd: int, delay: float = 0) -> None:
+        """
+        Event loop: A worker gave the connection back, watch it again (after the delay).
+
+        param - {int} - fd - The file descriptor of the connection
+        param - {float} - delay - Time in seconds before the connection is watched again
+        """
+        self.__busy.discard(fd)
+        if delay > 0:
+            self.__loop.call_later(delay, self.__watch, fd)
+        else:
+            self.__watch(fd)
+
+    def __work(self) -> None:
+        """
+        Worker thread: Runs the jobs handed over by the event loop.
+        """
+        _current.server = self
+        while True:
+            job = self.__jobs.get()
+            if job is None:
+                return
+            if job is _RETIRE:
+                with self.__workers_lock:
+                    self.__workers.remove(threading.current_thread())
+                return
+            function, argument = job
+            try:
+                function(argument)
+            except Exception:
+                self.logger.exception("failed to serve client, caught exception")
+
+    def __connect(self, sock: socket.socket) -> None:
+        """
+        Worker thread: Authenticate the client and build the connection.
+
+        param - {socket.socket} - sock - The socket of the client
+        """
+        try:
+            addrinfo = sock.getpeername()
+            credentials = None
+            if self.authenticator:
+                sock, credentials = self.authenticator(sock)
+            config = dict(self.protocol_config, credentials=credentials, connid=f"{addrinfo}",
+                          endpoints=(sock.getsockname(), addrinfo), logger=self.logger)
+            conn = self.service._connect(Channel(SocketStream(sock)), config)
+        except (AuthenticationError, OSError, EOFError):
+            self.logger.info("client connection could not be established")
+            self.__close_socket(sock)
+            return
+        fd = conn.fileno()
+        self.__connections[fd] = (sock, conn)
+        self.__loop.call_soon_threadsafe(self.__watch, fd)
+
+    def __serve(self, fd: int) -> None:
+        """
+        Worker thread: Serve the pending requests of a connection and give it back to the event loop.
+        If nothing was served, another thread holds the receive lock of the connection (e.g. waiting for the reply
+        of a nested request) and reads the pending data itself. The connection is only watched again after a delay
+        then, otherwise the still readable socket would be handed to the workers again and again.
+
+        param - {int} - fd - The file descriptor of the connection
+        """
+        entry = self.__connections.get(fd)
+        if entry is None:
+            return
+        served = 0
+        try:
+            for _ in range(self.__batch_size):
+                if not entry[1].poll():
+                    break
+                served += 1
+        except EOFError:
+            self.__drop(fd)
+            return
+        except Exception:
+            self.logger.exception("client connection terminated abruptly")
+            self.__drop(fd)
+            return
+        self.__loop.call_soon_threadsafe(self.__release, fd, RETRY_DELAY if served == 0 else 0)
+
+    def _enter_blocking(self) -> bool:
+        """
+        Worker thread: The current request starts a long wait (see blocking), start a spare worker for it.
+
+        return admitted?
+        """
+        with self.__workers_lock:
+            if self.__blocking >= self.__max_blocking or self._closed:
+                return False
+            self.__blocking += 1
+            worker = Thread(target=self.__work, name=f"EventLoopSpareWorker{self.__blocking}", daemon=True)
+            self.__workers.append(worker)
+        worker.start()
+        return True
+
+    def _leave_blocking(self) -> None:
+        """
+        Worker thread: The long wait of the current request is over, one worker stops after its current job, so the
+        pool has its fixed size again.
+        """
+        with self.__workers_lock:
+            self.__blocking -= 1
+        self.__jobs.put(_RETIRE)
+
+    def get_blocking(self) -> int:
+        """
+        Return the number of requests which wait inside blocking() at the moment.
+
+        return number of blocking requests
+        """
+        return self.__blocking
+
+    def __drop(self, fd: int) -> None:
+        """
+        Close a connection which is not watched by the event loop.
+        The fd is no longer busy: It is reused by the OS for the next connection, which has to be watched.
+        The event loop clears it before it can accept that connection, since the socket is closed afterwards.
+
+        param - {int} - fd - The file descriptor of the connection
+        """
+        entry = self.__connections.pop(fd, None)
+        if entry is None:
+            return
+        loop = self.__loop
+        if loop is not None and loop.is_running():
+            loop.call_soon_threadsafe(self.__busy.discard, fd)
+        else:
+            self.__busy.discard(fd)
+        sock, conn = entry
+        conn.close()
+        self.__close_socket(sock)
+
+    def __close_socket(self, sock: socket.socket) -> None:
+        """
+        Shut down and close the socket of a client.
+
+        param - {socket.socket} - sock - The socket of the client
+        """
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        sock.close()
+        self.clients.discard(sock)
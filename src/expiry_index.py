@@ -0,0 +1,115 @@
+"""
+    Expiry index:
+    Contains an index of the Blackboards ordered by the time their data expires (entry_time + valid_sec).
+    The index is a binary heap with lazy invalidation: an update only pushes a new entry, outdated entries are skipped
+    and removed when they reach the top or the heap is rebuilt. The expired Boards are found by a depth-first search
+    which only visits entries that are expired, so it runs in time proportional to the number of results.
+"""
+
+# =====Imports=========================================
+import heapq
+import itertools
+from threading import Lock
+
+
+# =====ExpiryIndex Class===============================
+class ExpiryIndex:
+    def __init__(self):
+        """
+        Initializes the empty ExpiryIndex.
+        """
+        self.__lock = Lock()
+        self.__tokens = itertools.count()
+        # Heap of (expiry, token, name), an entry is valid if the token is the current one of the name
+        self.__heap = []
+        # name -> (expiry, token)
+        self.__entries = {}
+
+    def __len__(self) -> int:
+        """
+        Return the number of indexed Blackboards.
+
+        return length
+        """
+        return len(self.__entries)
+
+    def update(self, name: str, expiry: float) -> None:
+        """
+        Set the expiry time of a Blackboard. Boards which never expire are removed from the index.
+
+        param - {str} - name - Unique name of the Blackboard
+        param - {float} - expiry - The time the data of the Board expires (entry_time + valid_sec)
+        """
+        if expiry == float("inf"):
+            self.remove(name)
+            return
+        with self.__lock:
+            token = next(self.__tokens)
+            self.__entries[name] = (expiry, token)
+            heapq.heappush(self.__heap, (expiry, token, name))
+            # Rebuild the heap if the outdated entries predominate
+            if len(self.__heap) > 2 * len(self.__entries) + 64:
+                self.__rebuild()
+
+    def remove(self, name: str) -> None:
+        """
+        Remove a Blackboard from the index (e.g. deleted or cleared).
+
+        param - {str} - name - Unique name of the Blackboard
+        """
+        with self.__lock:
+            self.__entries.pop(name, None)
+
+    def reset(self, boards: dict = None) -> None:
+        """
+        Replace the index by the Boards with data of the given dictionary (default: empty index).
+
+        param - {dict} - boards - The BoardRecords by name
+        """
+        tokens = self.__tokens
+        infinite = float("inf")
+        with self.__lock:
+            self.__entries = {name: (board.entry_time + board.valid_sec, next(tokens))
+                              for name, board in (boards or {}).items()
+                              if board.data is not None and board.valid_sec != infinite}
+            self.__rebuild()
+
+    def expired(self, now: float) -> list:
+        """
+        Return the names of the Blackboards which expired up to the given time, ordered by the heap (not sorted).
+        Only the expired part of the heap is searched, since the children of an entry never expire earlier.
+
+        param - {float} - now - The current time
+
+        return names
+        """
+        with self.__lock:
+            names = []
+            outdated = 0
+            stack = [0]
+            while len(stack) > 0:
+                index = stack.pop()
+                if index >= len(self.__heap) or self.__heap[index][0] > now:
+                    continue
+                expiry, token, name = self.__heap[index]
+                if self.__entries.get(name) == (expiry, token):
+                    names.append(name)
+                else:
+                    outdated += 1
+                stack.append(2 * index + 1)
+                stack.append(2 * index + 2)
+
+            # Remove the outdated entries, so the next search doesn't visit them again
+            if outdated > len(names) + 64:
+                self.__rebuild()
+            else:
+                while len(self.__heap) > 0 and self.__entries.get(self.__heap[0][2]) != self.__heap[0][:2]:
+                    heapq.heappop(self.__heap)
+            return names
+
+    def __rebuild(self) -> None:
+        """
+        Build the heap from the current entries only. Has to be called while holding the lock.
+        """
+        self.__heap = [(expiry, token, name) for name, (expiry, token) in self.__entries.items()]
+        heapq.heapify(self.__heap)
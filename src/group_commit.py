@@ -0,0 +1,181 @@
+"""
+    Group commit:
+    Contains the durability policy and a background flusher which batches the pending writes of all connections into
+    one write and fsync.
+"""
+
+# =====Imports=========================================
+import time
+from threading import Lock, Condition, Thread
+
+
+# =====Functions=======================================
+def parse_durability(text: str) -> tuple:
+    """
+    Parse a durability policy given as text.
+    "always": Every write returns after it was written and synced to disk (concurrent writes are batched).
+    "<N>ms": The pending writes are flushed every N milliseconds.
+    "<N>writes": The pending writes are flushed as soon as N writes are pending (fewer writes after the maximum delay
+    of the GroupCommitter).
+
+    param - {str} - text - The durability policy as text
+
+    return (kind, value)
+    """
+    text = text.strip().lower()
+    if text == "always":
+        return "always", 0
+    for kind in ("ms", "writes"):
+        if text.endswith(kind):
+            value = int(text[:-len(kind)])
+            if value <= 0:
+                raise ValueError(f"The durability value must be greater than 0! Given value: {value}.")
+            return kind, value
+    raise ValueError(f"Unknown durability policy '{text}'")
+
+
+# =====GroupCommitter Class============================
+class GroupCommitter:
+    def __init__(self, write_batch, policy: tuple = ("always", 0), max_delay: float = 1):
+        """
+        Initializes the GroupCommitter and starts the background flusher thread.
+
+        param - {function} - write_batch - Function which writes and syncs a list of pending items, raises an
+                                           exception if they could not be written
+        param - {tuple} - policy - The durability policy as returned by parse_durability
+        param - {float} - max_delay - "<N>writes" policy: Maximum time in seconds a write is pending
+        """
+        self.__write_batch = write_batch
+        self.__kind, self.__value = policy
+        self.__max_delay = max_delay
+        self.__lock = Lock()
+        self.__work = Condition(self.__lock)
+        self.__done = Condition(self.__lock)
+        self.__pending = []
+        # Time of the oldest pending write
+        self.__pending_since = 0.0
+        self.__appended = 0
+        self.__synced = 0
+        # The [first, last] tickets of the batches which could not be written (adjacent batches are merged)
+        self.__failed = []
+        self.__closed = False
+        self.__thread = Thread(target=self.__run, name="GroupCommitter", daemon=True)
+        self.__thread.start()
+
+    def append(self, item) -> int:
+        """
+        Add an item to the pending writes.
+
+        param - {any} - item - The item which is passed to write_batch
+
+        return ticket for wait
+        """
+        return self.extend([item])
+
+    def extend(self, items: list) -> int:
+        """
+        Add several items to the pending writes. They are always flushed in the same batch.
+
+        param - {list} - items - The items which are passed to write_batch
+
+        return ticket for wait
+        """
+        with self.__lock:
+            if len(self.__pending) == 0:
+                self.__pending_since = time.monotonic()
+                # The flusher starts waiting for the maximum delay
+                self.__work.notify()
+            self.__pending.extend(items)
+            self.__appended += len(items)
+            if self.__batch_ready():
+                self.__work.notify()
+            return self.__appended
+
+    def wait(self, ticket: int) -> bool:
+        """
+        Wait until the write with the given ticket meets the durability policy.
+        Only the "always" policy waits for the write to be synced, the other policies return immediately.
+
+        param - {int} - ticket - The ticket returned by append
+
+        return persisted? (false, if the batch of the write could not be written)
+        """
+        if self.__kind != "always":
+            return True
+        with self.__lock:
+            self.__done.wait_for(lambda: self.__synced >= ticket or self.__closed)
+            return self.__synced >= ticket and not any(first <= ticket <= last for first, last in self.__failed)
+
+    def close(self) -> None:
+        """
+        Flush all pending writes and stop the flusher thread.
+        """
+        with self.__lock:
+            self.__closed = True
+            self.__work.notify()
+        self.__thread.join()
+
+    def __batch_ready(self) -> bool:
+        """
+        Return true, if the pending writes have to be flushed now. Has to be called while holding the lock.
+
+        return ready?
+        """
+        if self.__closed:
+            return True
+        if self.__kind == "always":
+            return len(self.__pending) > 0
+        if self.__kind == "writes":
+            return len(self.__pending) >= self.__value
+        return False
+
+    def __wait_for_batch(self) -> None:
+        """
+        Wait until the pending writes have to be flushed. Has to be called while holding the lock.
+        """
+        if self.__kind == "ms":
+            self.__work.wait_for(lambda: self.__closed, self.__value / 1000)
+        elif self.__kind == "writes":
+            # Fewer than N pending writes are flushed after the maximum delay
+            while not self.__batch_ready():
+                if len(self.__pending) == 0:
+                    self.__work.wait()
+                    continue
+                remaining = self.__pending_since + self.__max_delay - time.monotonic()
+                if remaining <= 0:
+                    return
+                self.__work.wait(remaining)
+        else:
+            self.__work.wait_for(self.__batch_ready)
+
+    def __run(self) -> None:
+        """
+        Flusher thread: Writes all pending items as one batch whenever the durability policy requires it.
+        A failed batch is remembered, so the waiting writers don't acknowledge data which is not persisted.
+        """
+        while True:
+            with self.__lock:
+                self.__wait_for_batch()
+                batch, self.__pending = self.__pending, []
+                first_ticket = self.__synced + 1
+                last_ticket = self.__appended
+                closed = self.__closed
+
+            failed = False
+            if len(batch) > 0:
+                try:
+                    self.__write_batch(batch)
+                except Exception:
+                    print("[ERROR] Error while flushing the pending writes.")
+                    failed = True
+
+            with self.__lock:
+                if failed:
+                    if len(self.__failed) > 0 and self.__failed[-1][1] == first_ticket - 1:
+                        self.__failed[-1] = (self.__failed[-1][0], last_ticket)
+                    else:
+                        self.__failed.append((first_ticket, last_ticket))
+                self.__synced = last_ticket
+                self.__done.notify_all()
+            if closed:
+                return
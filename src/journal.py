@@ -0,0 +1,183 @@
+"""
+    Journal:
+    Contains an append-only write-ahead log for the Blackboards.
+    Every mutation is stored as one compact json record per line, so the cost of a write depends on the size of the
+    record and not on the number of stored Blackboards. On startup the records are replayed to rebuild the Boards.
+    A journal which continues a snapshot (see snapshot) starts with a checkpoint record carrying the snapshot id.
+    Binary data is stored as tagged base64 string (see payload).
+"""
+
+# =====Imports=========================================
+import os
+from threading import Lock
+from typing import Union
+import src.payload as payload
+from src.board_record import BoardRecord, records_from_dicts
+
+
+# =====Functions=======================================
+def apply_record(boards: dict, record: dict) -> None:
+    """
+    Apply a single journal record to the given Blackboard dictionary.
+
+    param - {dict} - boards - The BoardRecords by name which are modified
+    param - {dict} - record - The journal record which should be applied
+    """
+    op = record["op"]
+    if op == "create":
+        boards[record["name"]] = BoardRecord(record["valid_sec"], record["entry_time"],
+                                             version=record.get("version", 0))
+    elif op == "display":
+        board = boards[record["name"]]
+        boards[record["name"]] = board.replace(entry_time=record["entry_time"], data=record["data"],
+                                               version=record.get("version", board.version + 1))
+    elif op == "clear":
+        board = boards[record["name"]]
+        boards[record["name"]] = board.replace(data=None, version=record.get("version", board.version + 1))
+    elif op == "delete":
+        del boards[record["name"]]
+    elif op == "delete_all":
+        boards.clear()
+    elif op == "restore":
+        boards.clear()
+        boards.update(records_from_dicts(record["boards"]))
+    elif op == "checkpoint":
+        # Marks the start of the journal after a snapshot, no change
+        pass
+    else:
+        raise ValueError(f"Unknown journal operation '{op}'")
+
+
+def replay_journal(path: str, boards: dict = None) -> dict:
+    """
+    Rebuild the Blackboards by replaying all records of the given journal file.
+    A damaged last line (e.g. the server stopped while writing) is skipped.
+
+    param - {str} - path - Path of the journal file
+    param - {dict} - boards - The Boards the journal continues, they are modified (default: no Boards)
+
+    return boards
+    """
+    if boards is None:
+        boards = {}
+    with open(path, 'r', encoding='UTF8') as file:
+        for line_number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+            try:
+                apply_record(boards, payload.loads(line))
+            except (ValueError, KeyError):
+                print(f"[WARNING] Skipped damaged journal record in line {line_number}.")
+    return boards
+
+
+def read_checkpoint(path: str) -> Union[str, None]:
+    """
+    Return the id of the snapshot the journal file continues.
+
+    param - {str} - path - Path of the journal file
+
+    return snapshot id OR None if the journal doesn't start with a checkpoint record
+    """
+    with open(path, 'r', encoding='UTF8') as file:
+        line = file.readline()
+    try:
+        record = payload.loads(line)
+    except ValueError:
+        return None
+    if isinstance(record, dict) and record.get("op") == "checkpoint":
+        return record["id"]
+    return None
+
+
+def truncate_torn_tail(path: str) -> None:
+    """
+    Cut off an incomplete last line of the journal file, so it ends with the newline of its last complete record.
+
+    param - {str} - path - Path of the journal file
+    """
+    try:
+        file = open(path, 'r+b')
+    except FileNotFoundError:
+        return
+    with file:
+        end = file.seek(0, os.SEEK_END)
+        position = end
+        while position > 0:
+            # Search the last newline backwards in blocks
+            start = max(position - 4096, 0)
+            file.seek(start)
+            index = file.read(position - start).rfind(b"\n")
+            if index >= 0:
+                position = start + index + 1
+                break
+            position = start
+        if position < end:
+            print(f"[WARNING] Removed a damaged last journal record ({end - position} bytes).")
+            file.truncate(position)
+            file.flush()
+            os.fsync(file.fileno())
+
+
+# =====Journal Class===================================
+class Journal:
+    def __init__(self, path: str):
+        """
+        Initializes the Journal and opens the journal file in append mode.
+        A torn last record (the server stopped while writing it) is cut off first, otherwise the next record would be
+        appended to the same line and be lost on the replay as well.
+
+        param - {str} - path - Path of the journal file
+        """
+        self.path = path
+        # Number of records written since the journal was opened or rotated
+        self.records = 0
+        self.__lock = Lock()
+        truncate_torn_tail(path)
+        self.__file = open(path, 'a', encoding='UTF8')
+
+    def append(self, record: dict) -> None:
+        """
+        Append a record to the journal file.
+
+        param - {dict} - record - The record describing the mutation
+        """
+        self.write([record])
+
+    def write(self, records: list) -> None:
+        """
+        Append several records to the journal file with one write and sync them to disk.
+
+        param - {list} - records - The records describing the mutations
+        """
+        lines = "".join(payload.dumps(record, separators=(",", ":")) + "\n" for record in records)
+        with self.__lock:
+            self.__file.write(lines)
+            self.__file.flush()
+            os.fsync(self.__file.fileno())
+            self.records += len(records)
+
+    def rotate(self, old_path: str, snapshot_id: str) -> None:
+        """
+        Move the written records to old_path and continue with an empty journal which starts with a checkpoint
+        record of the given snapshot. The old journal is kept until the snapshot is written.
+
+        param - {str} - old_path - The new path of the written records
+        param - {str} - snapshot_id - The id of the snapshot the new journal continues
+        """
+        checkpoint = payload.dumps({"op": "checkpoint", "id": snapshot_id}, separators=(",", ":")) + "\n"
+        with self.__lock:
+            self.__file.close()
+            os.replace(self.path, old_path)
+            self.__file = open(self.path, 'a', encoding='UTF8')
+            self.__file.write(checkpoint)
+            self.__file.flush()
+            os.fsync(self.__file.fileno())
+            self.records = 0
+
+    def close(self) -> None:
+        """
+        Close the journal file.
+        """
+        with self.__lock:
+            self.__file.close()
@@ -1,9 +1,10 @@
 """
     lock_timeout:
-    Contains a simple function which can be used to wait a maximum amount of time for acquiring a lock.
+    Contains simple functions which can be used to wait a maximum amount of time for acquiring one or several locks.
 """
 
 # =====Imports=========================================
+import time
 from threading import Lock
 from contextlib import contextmanager
 
@@ -24,3 +25,26 @@ def lock_timeout(lock: Lock, timeout: float):
     finally:
         if result:
             lock.release()
+
+
+@contextmanager
+def locks_timeout(locks: list, timeout: float):
+    """
+    Contextmanager-function like lock_timeout for several locks.
+    The locks are acquired in the given order, so all callers have to use the same order to avoid deadlocks.
+    The timeout applies to acquiring all locks together. If not all locks can be acquired, none is kept.
+
+    param - {list} - locks - The locks which should be acquired
+    param - {float} - timeout - The maximum time for acquiring all locks
+    """
+    deadline = time.monotonic() + timeout
+    acquired = []
+    try:
+        for lock in locks:
+            if not lock.acquire(timeout=max(0.0, deadline - time.monotonic())):
+                break
+            acquired.append(lock)
+        yield len(acquired) == len(locks)
+    finally:
+        for lock in reversed(acquired):
+            lock.release()
@@ -1,48 +1,435 @@
 """
     RPC-Server logger:
-    Contains a simple logger function to log events in a csv file.
+    Contains a simple asynchronous logger to log events in a csv file.
+    The callers only put the log entries into a bounded queue. A single background writer keeps the file open and
+    writes the entries in batches.
+    Entries can be filtered by log level and sampled per method. Values are converted to (shortened) strings by the
+    writer, so nothing is formatted for entries which are never written.
+    The log file can be rotated by size and/or time, the older segments are compressed in the background.
 """
 
 
 # =====Imports========================================
 import os
 import csv
-from threading import Lock
-
-from src.lock_timeout import lock_timeout
+import gzip
+import time
+import queue
+import random
+import shutil
+from datetime import datetime
+from threading import Lock, Thread, Event
 
 
 # =====Logger=========================================
+LOG_FILE = 'log.csv'
+HEADER = ["Timestamp", "Event", "IP", "Port", "Method", "Arguments", "Return"]
+MAX_BATCH_SIZE = 1000
+
+LOG_LEVELS = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40, "OFF": 100}
+
+# Marker which stops the writer thread
+_STOP = object()
+
 logging_lock = Lock()
+_log_queue = queue.Queue(maxsize=10000)
+_drop_when_full = False
+_dropped_entries = 0
+_writer_thread = None
+_log_level = LOG_LEVELS["INFO"]
+_sampling_rates = {}
+_max_length = 1000
+_rotate_max_bytes = 0
+_rotate_interval = 0
+_compression_threads = []
+
+
+# =====LazyText Class=================================
+class LazyText:
+    __slots__ = ("function", "value")
+
+    def __init__(self, function, value):
+        """
+        A value of a log entry which is only converted to a string by the background writer.
+
+        param - {function} - function - Function(value, max_length) which converts the value to a string
+        param - {any} - value - The value which is converted
+        """
+        self.function = function
+        self.value = value
+
+    def render(self, max_length: int) -> str:
+        """
+        Convert the value to a string.
+
+        param - {int} - max_length - The maximum length of the string
+
+        return text
+        """
+        return self.function(self.value, max_length)
+
+
+# =====LogSegment Class===============================
+class _LogSegment:
+    def __init__(self, path: str):
+        """
+        The open log file of the background writer.
+        The header is written when a new (or empty) file is opened. The size of the segment is tracked while
+        writing, so no stat call is needed per log entry.
+
+        param - {str} - path - Path of the log file
+        """
+        self.__file = open(path, 'a', encoding='UTF8', newline='')
+        self.__writer = csv.writer(self.__file)
+        self.__opened = time.time()
+        if self.__file.tell() == 0:
+            self.__writer.writerow(HEADER)
+        self.__size = self.__file.tell()
+
+    def write(self, rows: list) -> None:
+        """
+        Write the rows and flush the file.
+
+        param - {list} - rows - The rows of strings
+        """
+        self.__writer.writerows(rows)
+        self.__file.flush()
+        self.__size = self.__file.tell()
+
+    def is_due(self) -> bool:
+        """
+        Return true, if the segment reached the maximum size or age and has to be rotated.
+
+        return due?
+        """
+        if 0 < _rotate_max_bytes <= self.__size:
+            return True
+        return 0 < _rotate_interval <= time.time() - self.__opened
+
+    def close(self) -> None:
+        """
+        Close the log file.
+        """
+        self.__file.close()
+
+
+# =====Functions======================================
+def short_repr(value, max_length: int) -> str:
+    """
+    Return repr(value) shortened to max_length characters.
+    Strings and bytes (also inside of tuples, lists and dictionaries) are cut before the conversion, so big payloads
+    are never copied completely.
+
+    param - {any} - value - The value which is converted
+    param - {int} - max_length - The maximum length of the string
+
+    return text
+    """
+    if isinstance(value, (str, bytes)):
+        text = repr(value[:max_length])
+    elif isinstance(value, (tuple, list)):
+        items = ", ".join(short_repr(item, max_length) for item in value[:max_length])
+        text = f"({items})" if isinstance(value, tuple) else f"[{items}]"
+    elif isinstance(value, dict):
+        items = [f"{short_repr(key, max_length)}: {short_repr(item, max_length)}"
+                 for key, item in list(value.items())[:max_length]]
+        text = "{" + ", ".join(items) + "}"
+    else:
+        text = repr(value)
+    return _cut(text, max_length)
+
+
+def short_str(value, max_length: int) -> str:
+    """
+    Return str(value) shortened to max_length characters (see short_repr).
+
+    param - {any} - value - The value which is converted
+    param - {int} - max_length - The maximum length of the string
+
+    return text
+    """
+    if isinstance(value, str):
+        return _cut(value[:max_length + 1], max_length)
+    return short_repr(value, max_length)
+
+
+def set_log_level(level: str) -> None:
+    """
+    Set the minimum level of the written log entries.
+
+    param - {str} - level - "DEBUG", "INFO", "WARNING", "ERROR" or "OFF"
+    """
+    global _log_level
+    if level.upper() not in LOG_LEVELS:
+        raise ValueError(f"Unknown log level '{level}'")
+    _log_level = LOG_LEVELS[level.upper()]
+
+
+def set_sampling_rate(method: str, rate: float) -> None:
+    """
+    Set the share of the calls of a method which are logged. Warnings and errors are always logged.
+
+    param - {str} - method - The name of the method
+    param - {float} - rate - The share between 0 (no call) and 1 (every call)
+    """
+    if rate < 0 or rate > 1:
+        raise ValueError(f"The sampling rate must be between 0 and 1! Given value: {rate}.")
+    _sampling_rates[method] = rate
+
+
+def set_max_length(max_length: int) -> None:
+    """
+    Set the maximum length of a single logged value (e.g. arguments or return value).
+
+    param - {int} - max_length - The maximum number of characters
+    """
+    global _max_length
+    if max_length <= 0:
+        raise ValueError(f"The maximum length must be greater than 0! Given value: {max_length}.")
+    _max_length = max_length
+
+
+def set_log_file(path: str) -> None:
+    """
+    Set the path of the log file (default: log.csv). The rotated segments are named after it.
+    Pending log entries are written to the old file first.
+
+    param - {str} - path - Path of the log file
+    """
+    global LOG_FILE
+    close_log()
+    LOG_FILE = path
+
+
+def is_enabled(level: str = "INFO", method: str = None) -> bool:
+    """
+    Return true, if an entry with the given level (and method) has to be written.
+    Entries below the warning level are sampled with the sampling rate of the method.
+    Should be checked before an entry is built.
+
+    param - {str} - level - The level of the entry
+    param - {str} - method - The name of the called method (optional)
+
+    return enabled?
+    """
+    if LOG_LEVELS[level] < _log_level:
+        return False
+    if method is None or LOG_LEVELS[level] >= LOG_LEVELS["WARNING"]:
+        return True
+    rate = _sampling_rates.get(method, 1.0)
+    return rate >= 1.0 or random.random() < rate
+
+
+def configure_log(max_queue_size: int = 10000, drop_when_full: bool = False) -> None:
+    """
+    Configure the log queue. Pending log entries are written before the queue is replaced.
+
+    param - {int} - max_queue_size - Maximum number of pending log entries
+    param - {bool} - drop_when_full - Drop new entries if the queue is full instead of waiting (backpressure)
+    """
+    global _log_queue, _drop_when_full
+    close_log()
+    with logging_lock:
+        _log_queue = queue.Queue(maxsize=max_queue_size)
+        _drop_when_full = drop_when_full
+
+
+def write_in_log(items: list, level: str = "INFO") -> None:
+    """
+    Put the given items as a new row for the logging csv file (log.csv) into the log queue.
+    Entries below the log level are ignored.
+    If the queue is full, the caller waits up to 10 seconds or the entry is dropped (see configure_log).
+    The background writer converts the items to strings (LazyText items are rendered), creates the file with a
+    header line if needed and also prints the Logs on the console.
+    """
+    global _dropped_entries
+    if LOG_LEVELS[level] < _log_level:
+        return
+    _start_writer()
+    try:
+        if _drop_when_full:
+            _log_queue.put_nowait(items)
+        else:
+            _log_queue.put(items, timeout=10)
+    except queue.Full:
+        with logging_lock:
+            _dropped_entries += 1
+        if not _drop_when_full:
+            print('[WARNING] Timeout occurred while waiting for the log access. Log was not created.')
+
+
+def flush_log(timeout: float = 10) -> bool:
+    """
+    Wait until all log entries written so far are stored in the log file.
+
+    param - {float} - timeout - The maximum time to wait
+
+    return flushed?
+    """
+    flushed = Event()
+    _start_writer()
+    try:
+        _log_queue.put(flushed, timeout=timeout)
+    except queue.Full:
+        return False
+    return flushed.wait(timeout)
+
+
+def configure_rotation(max_bytes: int = 0, interval: float = 0) -> None:
+    """
+    Configure the rotation of the log file. When the current segment reaches the maximum size or is older than the
+    interval, it is renamed to log-<timestamp>.csv and compressed in the background to log-<timestamp>.csv.gz.
+
+    param - {int} - max_bytes - Maximum size of a segment in bytes (0: no size limit)
+    param - {float} - interval - Maximum age of a segment in seconds (0: no time limit)
+    """
+    global _rotate_max_bytes, _rotate_interval
+    if max_bytes < 0 or interval < 0:
+        raise ValueError("The rotation size and interval must be greater or equal to 0!")
+    _rotate_max_bytes = max_bytes
+    _rotate_interval = interval
+
+
+def close_log() -> None:
+    """
+    Write all pending log entries, stop the background writer and close the log file.
+    Also waits until the rotated segments are compressed.
+    The writer is started again with the next log entry. Has to be called when the server stops.
+    """
+    global _writer_thread
+    # The lock is held until the writer stopped, so no second writer is started meanwhile (it could take the stop
+    # marker and the join would never return)
+    with logging_lock:
+        if _writer_thread is not None:
+            _log_queue.put(_STOP)
+            _writer_thread.join()
+            _writer_thread = None
+    while len(_compression_threads) > 0:
+        _compression_threads.pop().join()
+
+
+def get_dropped_entries() -> int:
+    """
+    Return the number of log entries which were dropped because the log queue was full.
+
+    return dropped_entries
+    """
+    return _dropped_entries
+
+
+def _start_writer() -> None:
+    """
+    Start the background writer thread if it is not running.
+    """
+    global _writer_thread
+    if _writer_thread is not None:
+        return
+    with logging_lock:
+        if _writer_thread is None:
+            _writer_thread = Thread(target=_write_batches, args=(_log_queue,), name="LogWriter", daemon=True)
+            _writer_thread.start()
 
 
-def write_in_log(items: list) -> None:
+def _write_batches(log_queue: queue.Queue) -> None:
     """
-    Write the given items into a new row of the logging csv file (log.csv).
-    If no such file exist a new one is created and a header line is added.
-    The Logs are also printed on the console.
+    Background writer: Takes the log entries from the queue and writes them in batches into the log file.
+    The file stays open until the writer is stopped.
+
+    param - {queue.Queue} - log_queue - The queue with the pending log entries
     """
-    with lock_timeout(logging_lock, 10) as acquired:
-        if acquired:
+    segment = None
+    running = True
+    while running:
+        # Wait for the next entry and take everything else which is pending
+        batch = [log_queue.get()]
+        while len(batch) < MAX_BATCH_SIZE:
             try:
+                batch.append(log_queue.get_nowait())
+            except queue.Empty:
+                break
+
+        rows = []
+        flushed = []
+        for item in batch:
+            if item is _STOP:
+                running = False
+            elif isinstance(item, Event):
+                flushed.append(item)
+            else:
                 # Convert everything to a string (to improve the print on the console)
-                for i in range(0, len(items)):
-                    items[i] = str(items[i])
-
-                # Write to file
-                if not os.path.isfile('log.csv') or os.stat('log.csv').st_size == 0:
-                    with open('log.csv', 'w', encoding='UTF8', newline='') as file:
-                        writer = csv.writer(file)
-                        # write the header
-                        writer.writerow(["Timestamp", "Event", "IP", "Port", "Method", "Arguments", "Return"])
-                with open('log.csv', 'a', encoding='UTF8', newline='') as file:
-                    writer = csv.writer(file)
-                    # write the data
-                    writer.writerow(items)
+                rows.append([_to_text(value) for value in item])
+
+        try:
+            if len(rows) > 0:
+                if segment is not None and segment.is_due():
+                    segment.close()
+                    segment = None
+                    _rotate()
+                if segment is None:
+                    segment = _LogSegment(LOG_FILE)
+                # write the data
+                segment.write(rows)
 
                 # Write to console
-                print("[LOG] " + str(items)[1:-1])
-            except:
-                print('[WARNING] Could not write the log.')
-        else:
-            print('[WARNING] Timeout occurred while waiting for the log access. Log was not created.')
+                print("\n".join("[LOG] " + str(row)[1:-1] for row in rows))
+        except Exception:
+            print('[WARNING] Could not write the log.')
+
+        for event in flushed:
+            event.set()
+
+    if segment is not None:
+        segment.close()
+
+
+def _rotate() -> None:
+    """
+    Rename the current log file to log-<timestamp>.csv and compress it in the background.
+    """
+    base, extension = os.path.splitext(LOG_FILE)
+    archive = f"{base}-{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}{extension}"
+    os.rename(LOG_FILE, archive)
+    thread = Thread(target=_compress, args=(archive,), name="LogCompressor", daemon=True)
+    thread.start()
+    _compression_threads[:] = [t for t in _compression_threads if t.is_alive()] + [thread]
+
+
+def _compress(path: str) -> None:
+    """
+    Compress the given log segment to <path>.gz and remove the uncompressed file.
+
+    param - {str} - path - Path of the log segment
+    """
+    try:
+        with open(path, 'rb') as source, gzip.open(path + ".gz", 'wb') as target:
+            shutil.copyfileobj(source, target)
+        os.remove(path)
+    except Exception:
+        print(f'[WARNING] Could not compress the log segment {path}.')
+
+
+def _to_text(value) -> str:
+    """
+    Convert a value of a log entry to a string with the maximum length.
+
+    param - {any} - value - The value of the log entry
+
+    return text
+    """
+    if isinstance(value, LazyText):
+        return value.render(_max_length)
+    return _cut(str(value), _max_length)
+
+
+def _cut(text: str, max_length: int) -> str:
+    """
+    Cut the text to max_length characters and mark the cut with "...".
+
+    param - {str} - text - The text
+    param - {int} - max_length - The maximum length
+
+    return text
+    """
+    if len(text) <= max_length:
+        return text
+    return text[:max_length] + "..."
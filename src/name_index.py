@@ -0,0 +1,134 @@
+"""
+    Name index:
+    Contains a sorted index of the Blackboard names. It is maintained on every create and delete, so a page of names
+    with a given prefix is found by a binary search instead of a scan of all Boards.
+"""
+
+# =====Imports=========================================
+import bisect
+from threading import Lock
+from typing import Union
+
+
+# =====Constants=======================================
+# Maximum number of names per chunk of the index, a full chunk is split into two halves
+CHUNK_SIZE = 1024
+
+
+# =====NameIndex Class=================================
+class NameIndex:
+    def __init__(self):
+        """
+        Initializes the empty NameIndex.
+        The names are kept in sorted chunks of at most CHUNK_SIZE names, so an insert or delete only moves the names
+        of one chunk instead of all names (it runs while holding the board lock). The last name of every chunk is
+        kept in a separate list to find the chunk of a name by a binary search.
+        """
+        self.__lock = Lock()
+        self.__chunks = []
+        self.__maxes = []
+        self.__length = 0
+
+    def __len__(self) -> int:
+        """
+        Return the number of indexed names.
+
+        return length
+        """
+        return self.__length
+
+    def add(self, name: str) -> None:
+        """
+        Add a name to the index (if it is not indexed yet).
+
+        param - {str} - name - Unique name of the Blackboard
+        """
+        with self.__lock:
+            if len(self.__chunks) == 0:
+                self.__chunks.append([name])
+                self.__maxes.append(name)
+                self.__length = 1
+                return
+            # A name after the last one belongs to the last chunk
+            position = min(bisect.bisect_left(self.__maxes, name), len(self.__chunks) - 1)
+            chunk = self.__chunks[position]
+            index = bisect.bisect_left(chunk, name)
+            if index < len(chunk) and chunk[index] == name:
+                return
+            chunk.insert(index, name)
+            self.__maxes[position] = chunk[-1]
+            self.__length += 1
+            if len(chunk) > CHUNK_SIZE:
+                half = len(chunk) // 2
+                self.__chunks[position:position + 1] = [chunk[:half], chunk[half:]]
+                self.__maxes[position:position + 1] = [chunk[half - 1], chunk[-1]]
+
+    def remove(self, name: str) -> None:
+        """
+        Remove a name from the index.
+
+        param - {str} - name - Unique name of the Blackboard
+        """
+        with self.__lock:
+            position = bisect.bisect_left(self.__maxes, name)
+            if position == len(self.__chunks):
+                return
+            chunk = self.__chunks[position]
+            index = bisect.bisect_left(chunk, name)
+            if index == len(chunk) or chunk[index] != name:
+                return
+            del chunk[index]
+            self.__length -= 1
+            if len(chunk) == 0:
+                del self.__chunks[position]
+                del self.__maxes[position]
+            else:
+                self.__maxes[position] = chunk[-1]
+
+    def reset(self, names=()) -> None:
+        """
+        Replace the index by the given names (default: empty index).
+
+        param - {iterable} - names - The names of the Blackboards
+        """
+        names = sorted(set(names))
+        half = CHUNK_SIZE // 2
+        chunks = [names[start:start + half] for start in range(0, len(names), half)]
+        with self.__lock:
+            self.__chunks = chunks
+            self.__maxes = [chunk[-1] for chunk in chunks]
+            self.__length = len(names)
+
+    def page(self, prefix: str, cursor: Union[str, None], limit: int) -> tuple:
+        """
+        Return the next names with the given prefix in sorted order, starting after the cursor.
+
+        param - {str} - prefix - The prefix of the names ("" for all names)
+        param - {str or None} - cursor - The last name of the previous page (None for the first page)
+        param - {int} - limit - The maximum number of names
+
+        return (names, cursor of the next page or None if there are no more names)
+        """
+        names = []
+        more = False
+        with self.__lock:
+            # Position (chunk, index) of the first name after the cursor with the prefix
+            if cursor is not None and cursor >= prefix:
+                position = bisect.bisect_right(self.__maxes, cursor)
+                index = bisect.bisect_right(self.__chunks[position], cursor) if position < len(self.__chunks) else 0
+            else:
+                position = bisect.bisect_left(self.__maxes, prefix)
+                index = bisect.bisect_left(self.__chunks[position], prefix) if position < len(self.__chunks) else 0
+            while position < len(self.__chunks):
+                chunk = self.__chunks[position]
+                while index < len(chunk) and chunk[index].startswith(prefix):
+                    if len(names) == limit:
+                        more = True
+                        break
+                    names.append(chunk[index])
+                    index += 1
+                if more or index < len(chunk):
+                    break
+                position += 1
+                index = 0
+        return tuple(names), (names[-1] if more and len(names) > 0 else None)
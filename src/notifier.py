@@ -0,0 +1,228 @@
+"""
+    Notifier:
+    Contains the subscriptions to Blackboard changes and their delivery.
+    Publishing a change only puts it into the bounded queue of each subscriber. Every subscriber has its own delivery
+    thread which invokes the callbacks, so a slow subscriber neither blocks the writer nor the other subscribers.
+    Threads waiting for a change of a Board (long-poll) are woken up by the same publish call.
+"""
+
+# =====Imports=========================================
+import itertools
+from collections import deque
+from threading import Lock, Condition, Thread, Event
+from typing import Union
+import src.payload as payload
+
+
+# =====Subscriber Class================================
+class _Subscriber:
+    def __init__(self, owner, max_pending: int):
+        """
+        Initializes the Subscriber (one per owner, e.g. a client connection) and starts its delivery thread.
+
+        param - {any} - owner - The owner of the subscriptions
+        param - {int} - max_pending - Maximum number of pending notifications, the oldest ones are dropped
+        """
+        self.owner = owner
+        self.subscriptions = 0
+        self.dropped = 0
+        self.__pending = deque(maxlen=max_pending)
+        self.__condition = Condition(Lock())
+        self.__closed = False
+        self.__thread = Thread(target=self.__deliver, name="Notifier", daemon=True)
+        self.__thread.start()
+
+    def put(self, notification: tuple) -> None:
+        """
+        Add a notification without blocking. If the queue is full, the oldest notification is dropped.
+
+        param - {tuple} - notification - (callback, name, event, data, entry_time)
+        """
+        with self.__condition:
+            if len(self.__pending) == self.__pending.maxlen:
+                self.dropped += 1
+            self.__pending.append(notification)
+            self.__condition.notify()
+
+    def close(self, discard: bool) -> None:
+        """
+        Stop the delivery thread after the pending notifications are delivered.
+
+        param - {bool} - discard - Discard the pending notifications instead (e.g. the client is gone)
+        """
+        with self.__condition:
+            self.__closed = True
+            if discard:
+                self.__pending.clear()
+            self.__condition.notify()
+
+    def __deliver(self) -> None:
+        """
+        Delivery thread: Invokes the callbacks of the pending notifications one after another.
+        """
+        while True:
+            with self.__condition:
+                self.__condition.wait_for(lambda: self.__closed or len(self.__pending) > 0)
+                if len(self.__pending) == 0:
+                    return
+                callback, name, event, data, entry_time = self.__pending.popleft()
+            try:
+                # Compressed data is decompressed here, so the writer doesn't pay for it
+                callback(name, event, payload.decompress_data(data), entry_time)
+            except Exception:
+                print(f"[WARNING] Could not deliver the notification for Board '{name}'.")
+
+
+# =====Notifier Class==================================
+class Notifier:
+    def __init__(self, max_pending: int = 1000):
+        """
+        Initializes the Notifier.
+        The subscriptions per Board are stored as tuples which are replaced on every change, so publishing needs
+        no lock.
+
+        param - {int} - max_pending - Maximum number of pending notifications per subscriber
+        """
+        self.__max_pending = max_pending
+        self.__lock = Lock()
+        self.__ids = itertools.count(1)
+        # name -> ((subscription_id, subscriber, callback), ...)
+        self.__subscriptions = {}
+        # owner -> Subscriber
+        self.__subscribers = {}
+        # name -> (Event, ...) of the waiting threads
+        self.__waiters = {}
+
+    def subscribe(self, name: str, callback, owner) -> int:
+        """
+        Subscribe to the changes of a Blackboard.
+
+        param - {str} - name - Unique name of the Blackboard
+        param - {function} - callback - Called with (name, event, data, entry_time) on every change
+        param - {any} - owner - The owner of the subscription (e.g. the client connection)
+
+        return subscription_id
+        """
+        with self.__lock:
+            subscriber = self.__subscribers.get(owner)
+            if subscriber is None:
+                subscriber = _Subscriber(owner, self.__max_pending)
+                self.__subscribers[owner] = subscriber
+            subscriber.subscriptions += 1
+            subscription_id = next(self.__ids)
+            self.__subscriptions[name] = self.__subscriptions.get(name, ()) + ((subscription_id, subscriber, callback),)
+            return subscription_id
+
+    def unsubscribe(self, subscription_id: int, owner) -> bool:
+        """
+        Remove a subscription of the given owner.
+
+        param - {int} - subscription_id - The id returned by subscribe
+        param - {any} - owner - The owner of the subscription
+
+        return removed?
+        """
+        with self.__lock:
+            return self.__remove(lambda entry: entry[0] == subscription_id and entry[1].owner is owner, None, False) > 0
+
+    def unsubscribe_owner(self, owner) -> None:
+        """
+        Remove all subscriptions of the given owner and stop its delivery thread.
+
+        param - {any} - owner - The owner of the subscriptions
+        """
+        with self.__lock:
+            self.__remove(lambda entry: entry[1].owner is owner, None, True)
+
+    def remove_boards(self, names: tuple = None) -> None:
+        """
+        Remove all subscriptions of (deleted) Blackboards.
+
+        param - {tuple} - names - Unique names of the Blackboards (default: all)
+        """
+        if names is not None and not any(name in self.__subscriptions for name in names):
+            return
+        with self.__lock:
+            self.__remove(lambda entry: True, names, False)
+
+    def add_waiter(self, name: str) -> Event:
+        """
+        Register a thread which waits for the next change of a Blackboard.
+        The returned event is set by the next publish call for the Board. Has to be removed with remove_waiter.
+
+        param - {str} - name - Unique name of the Blackboard
+
+        return event
+        """
+        event = Event()
+        with self.__lock:
+            self.__waiters[name] = self.__waiters.get(name, ()) + (event,)
+        return event
+
+    def remove_waiter(self, name: str, event: Event) -> None:
+        """
+        Remove a waiting thread registered by add_waiter.
+
+        param - {str} - name - Unique name of the Blackboard
+        param - {Event} - event - The event returned by add_waiter
+        """
+        with self.__lock:
+            remaining = tuple(waiter for waiter in self.__waiters.get(name, ()) if waiter is not event)
+            if len(remaining) > 0:
+                self.__waiters[name] = remaining
+            else:
+                self.__waiters.pop(name, None)
+
+    def publish(self, name: str, event: str, data=None, entry_time: float = None) -> None:
+        """
+        Notify all subscribers and wake up all waiting threads of a Blackboard without blocking.
+        Has to be called while holding the lock of the Board, so the notifications keep the order of the changes.
+
+        param - {str} - name - Unique name of the Blackboard
+        param - {str} - event - "updated", "cleared" or "deleted"
+        param - {any} - data - The new data of the Board
+        param - {float} - entry_time - The new entry time of the Board
+        """
+        for _, subscriber, callback in self.__subscriptions.get(name, ()):
+            subscriber.put((callback, name, event, data, entry_time))
+        for waiter in self.__waiters.get(name, ()):
+            waiter.set()
+
+    def publish_all(self, event: str) -> None:
+        """
+        Notify the subscribers of all Blackboards without blocking (e.g. all Boards were deleted).
+
+        param - {str} - event - "updated", "cleared" or "deleted"
+        """
+        for name in set(self.__subscriptions) | set(self.__waiters):
+            self.publish(name, event)
+
+    def __remove(self, matches, names: Union[tuple, None], discard: bool) -> int:
+        """
+        Remove all matching subscriptions. Subscribers without subscriptions are stopped.
+        Has to be called while holding the lock.
+
+        param - {function} - matches - Returns true for a (subscription_id, subscriber, callback) entry to remove
+        param - {tuple or None} - names - The Board names to search (None: all)
+        param - {bool} - discard - Discard the pending notifications of stopped subscribers
+
+        return number of removed subscriptions
+        """
+        removed = 0
+        for name in list(self.__subscriptions) if names is None else names:
+            entries = self.__subscriptions.get(name, ())
+            remaining = tuple(entry for entry in entries if not matches(entry))
+            if len(remaining) == len(entries):
+                continue
+            if len(remaining) > 0:
+                self.__subscriptions[name] = remaining
+            else:
+                self.__subscriptions.pop(name, None)
+
+            for _, subscriber, _ in [entry for entry in entries if matches(entry)]:
+                removed += 1
+                subscriber.subscriptions -= 1
+                # Stop the subscriber if it has no subscription anymore
+                if subscriber.subscriptions == 0:
+                    self.__subscribers.pop(subscriber.owner).close(discard)
+        return removed
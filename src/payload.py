@@ -0,0 +1,214 @@
+"""
+    Payload:
+    Contains the handling of the Blackboard data. The data is either a string or a binary payload (bytes).
+    Bytes are kept as they are received and returned without conversion. Only the json based persistence formats
+    (board.json, journal and replication) store them as a tagged base64 string {"__bytes__": "..."}.
+    Large data can be kept zlib compressed (CompressedData) in memory and in the persistence files. It is decompressed
+    when it is returned to a client.
+"""
+
+# =====Imports=========================================
+import base64
+import binascii
+import json
+import zlib
+from typing import Union
+from src.board_record import BoardRecord
+
+# =====Constants=======================================
+BYTES_TAG = "__bytes__"
+COMPRESSED_TAG = "__zlib__"
+
+
+# =====CompressedData Class============================
+class CompressedData:
+    __slots__ = ("compressed", "is_text", "size")
+
+    def __init__(self, compressed: bytes, is_text: bool, size: int):
+        """
+        Initializes the CompressedData. Use compress_data to create it.
+
+        param - {bytes} - compressed - The zlib compressed data
+        param - {bool} - is_text - The original data is a string (stored UTF-8 encoded)
+        param - {int} - size - The size of the original data in bytes
+        """
+        self.compressed = compressed
+        self.is_text = is_text
+        self.size = size
+
+    def __eq__(self, other) -> bool:
+        return (isinstance(other, CompressedData) and self.compressed == other.compressed
+                and self.is_text == other.is_text)
+
+    def __repr__(self) -> str:
+        return f"CompressedData(size={self.size}, compressed_size={len(self.compressed)}, is_text={self.is_text})"
+
+    def decompress(self) -> Union[str, bytes]:
+        """
+        Return the original data.
+
+        return data as str or bytes
+        """
+        data = zlib.decompress(self.compressed)
+        return data.decode("utf-8") if self.is_text else data
+
+
+# =====Functions=======================================
+def normalize_data(data) -> Union[str, bytes]:
+    """
+    Return the data as it is stored on a Blackboard.
+    Bytes are taken over without a copy, other binary buffers are copied once into bytes and everything else is
+    converted to a string.
+
+    param - {any} - data - The data given by the client
+
+    return data as str or bytes
+    """
+    if isinstance(data, bytes):
+        return data
+    if isinstance(data, (bytearray, memoryview)):
+        return bytes(data)
+    return str(data)
+
+
+def payload_size(data: Union[str, bytes, None]) -> int:
+    """
+    Return the size of the data in bytes (strings are counted UTF-8 encoded).
+
+    param - {str or bytes or None} - data - The data of a Blackboard
+
+    return size
+    """
+    if data is None:
+        return 0
+    if isinstance(data, bytes) or data.isascii():
+        return len(data)
+    return len(data.encode("utf-8"))
+
+
+def compress_data(data: Union[str, bytes, None], threshold: Union[int, None],
+                  level: int = 6) -> Union[str, bytes, CompressedData, None]:
+    """
+    Compress the data if it is larger than the threshold and the compression saves space.
+
+    param - {str or bytes or None} - data - The data of a Blackboard
+    param - {int or None} - threshold - Data larger than this size in bytes is compressed (None: no compression)
+    param - {int} - level - The zlib compression level
+
+    return CompressedData OR the unchanged data
+    """
+    if threshold is None or data is None or payload_size(data) <= threshold:
+        return data
+    is_text = isinstance(data, str)
+    raw = data.encode("utf-8") if is_text else data
+    compressed = zlib.compress(raw, level)
+    if len(compressed) >= len(raw):
+        return data
+    return CompressedData(compressed, is_text, len(raw))
+
+
+def decompress_data(data: Union[str, bytes, CompressedData, None]) -> Union[str, bytes, None]:
+    """
+    Return the original data of possibly compressed data.
+
+    param - {str or bytes or CompressedData or None} - data - The stored data of a Blackboard
+
+    return data as str or bytes or None
+    """
+    if isinstance(data, CompressedData):
+        return data.decompress()
+    return data
+
+
+def stored_size(data: Union[str, bytes, CompressedData, None]) -> tuple:
+    """
+    Return the original and the stored size of the data in bytes.
+
+    param - {str or bytes or CompressedData or None} - data - The stored data of a Blackboard
+
+    return (original size, stored size)
+    """
+    if isinstance(data, CompressedData):
+        return data.size, len(data.compressed)
+    size = payload_size(data)
+    return size, size
+
+
+def encode_default(value) -> dict:
+    """
+    json default hook: Encode bytes and CompressedData as tagged base64 string and a BoardRecord as dictionary.
+
+    param - {any} - value - The value json can't serialize
+
+    return {"__bytes__": base64 string} OR {"__zlib__": base64 string, "text": is_text, "size": size} OR board dict
+    """
+    if isinstance(value, BoardRecord):
+        return value.to_dict()
+    if isinstance(value, bytes):
+        return {BYTES_TAG: base64.b64encode(value).decode("ascii")}
+    if isinstance(value, CompressedData):
+        return {COMPRESSED_TAG: base64.b64encode(value.compressed).decode("ascii"), "text": value.is_text,
+                "size": value.size}
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def decode_hook(obj: dict) -> Union[dict, bytes, CompressedData]:
+    """
+    json object hook: Decode a tagged base64 string back to bytes or CompressedData.
+
+    param - {dict} - obj - A decoded json object
+
+    return bytes OR CompressedData OR the unchanged object
+    """
+    try:
+        if len(obj) == 1 and isinstance(obj.get(BYTES_TAG), str):
+            return base64.b64decode(obj[BYTES_TAG], validate=True)
+        if len(obj) == 3 and isinstance(obj.get(COMPRESSED_TAG), str):
+            return CompressedData(base64.b64decode(obj[COMPRESSED_TAG], validate=True), bool(obj["text"]),
+                                  int(obj["size"]))
+    except (binascii.Error, KeyError):
+        raise ValueError("Invalid base64 payload")
+    return obj
+
+
+def dumps(obj, **kwargs) -> str:
+    """
+    json.dumps with support for bytes and CompressedData.
+
+    param - {any} - obj - The object to serialize
+
+    return json text
+    """
+    return json.dumps(obj, default=encode_default, **kwargs)
+
+
+def loads(text: str):
+    """
+    json.loads with support for bytes and CompressedData.
+
+    param - {str} - text - The json text
+
+    return object
+    """
+    return json.loads(text, object_hook=decode_hook)
+
+
+def dump(obj, file, **kwargs) -> None:
+    """
+    json.dump with support for bytes and CompressedData.
+
+    param - {any} - obj - The object to serialize
+    param - {file} - file - The opened file
+    """
+    json.dump(obj, file, default=encode_default, **kwargs)
+
+
+def load(file):
+    """
+    json.load with support for bytes and CompressedData.
+
+    param - {file} - file - The opened file
+
+    return object
+    """
+    return json.load(file, object_hook=decode_hook)
@@ -0,0 +1,224 @@
+"""
+    Replication:
+    Contains the change log of a primary server and the replicator of a read-only replica server.
+    The primary numbers every mutation record (the same records as in the journal) and keeps the latest ones in
+    memory together with the time they were added. A replica long-polls the primary for the records after the last
+    applied one, at most max_batch per request. If the replica is too far behind (or the primary was restarted), it
+    gets a snapshot of all Boards instead.
+    The primary reports its newest sequence number with every response, so the replica knows its lag in records and
+    in seconds (the age of the last applied record).
+"""
+
+# =====Imports=========================================
+import time
+import uuid
+import itertools
+from collections import deque
+from threading import Lock, Condition, Thread, Event
+import rpyc
+import src.payload as payload
+
+
+# =====ReplicationLog Class============================
+class ReplicationLog:
+    def __init__(self, max_records: int = 10000, max_batch: int = 1000):
+        """
+        Initializes the ReplicationLog of a primary server.
+        Every log gets a new random id, so a replica notices when the sequence numbers start again.
+
+        param - {int} - max_records - Maximum number of records kept for the replicas
+        param - {int} - max_batch - Maximum number of records returned by one call of since
+        """
+        if max_records <= 0 or max_batch <= 0:
+            raise ValueError(f"The number of records must be greater than 0! Given values: {max_records}, "
+                             f"{max_batch}.")
+        self.id = uuid.uuid4().hex
+        self.__max_batch = max_batch
+        # Entries (sequence, time, record)
+        self.__records = deque(maxlen=max_records)
+        self.__sequence = 0
+        self.__time = time.time()
+        self.__condition = Condition(Lock())
+
+    def append(self, records: tuple) -> int:
+        """
+        Add mutation records and wake up the waiting replicas.
+        Has to be called while holding the lock of the mutated Boards, so the records keep the order of the changes.
+
+        param - {tuple} - records - The records describing the mutations
+
+        return sequence number of the last record
+        """
+        with self.__condition:
+            self.__time = time.time()
+            for record in records:
+                self.__sequence += 1
+                self.__records.append((self.__sequence, self.__time, record))
+            self.__condition.notify_all()
+            return self.__sequence
+
+    def get_sequence(self) -> int:
+        """
+        Return the sequence number of the last record.
+
+        return sequence
+        """
+        return self.__sequence
+
+    def get_head(self) -> tuple:
+        """
+        Return the sequence number and the time of the last record (the start of the log if there is none).
+
+        return (sequence, time)
+        """
+        with self.__condition:
+            return self.__sequence, self.__time
+
+    def since(self, sequence: int, timeout: float) -> tuple:
+        """
+        Wait until there are records after the given sequence number (at most timeout seconds) and return them, at
+        most max_batch records.
+
+        param - {int} - sequence - The sequence number of the last record the replica has
+        param - {float} - timeout - Maximum time to wait
+
+        return (sequence of the last returned record, time of that record, records, sequence of the last record,
+                time of the last record) OR None if the records are not available anymore
+        """
+        with self.__condition:
+            if sequence > self.__sequence:
+                return None
+            self.__condition.wait_for(lambda: self.__sequence > sequence, timeout)
+            if self.__sequence == sequence:
+                return sequence, self.__time, (), self.__sequence, self.__time
+            if len(self.__records) == 0 or self.__records[0][0] > sequence + 1:
+                # The replica is too far behind
+                return None
+            first = len(self.__records) - (self.__sequence - sequence)
+            entries = list(itertools.islice(self.__records, first, first + self.__max_batch))
+            return (entries[-1][0], entries[-1][1], tuple(record for _, _, record in entries), self.__sequence,
+                    self.__time)
+
+
+# =====Replicator Class================================
+class Replicator:
+    def __init__(self, host: str, port: int, apply_records, restore, poll_timeout: float = 5):
+        """
+        Initializes the Replicator of a replica server. Call start to begin the replication.
+
+        param - {str} - host - Host of the primary server
+        param - {int} - port - Port of the primary server
+        param - {function} - apply_records - Called with a tuple of records to apply them to the Boards
+        param - {function} - restore - Called with a dictionary of all Boards to replace the Boards
+        param - {float} - poll_timeout - Maximum time the primary holds a request without changes
+        """
+        self.__host = host
+        self.__port = port
+        self.__apply_records = apply_records
+        self.__restore = restore
+        self.__poll_timeout = poll_timeout
+        self.__lock = Lock()
+        self.__stopped = Event()
+        self.__log_id = None
+        self.__applied = 0
+        # Time the last applied record was added on the primary
+        self.__applied_time = None
+        self.__primary_sequence = 0
+        self.__last_contact = None
+        self.__connected = False
+        self.__thread = Thread(target=self.__run, name="Replicator", daemon=True)
+
+    def start(self) -> None:
+        """
+        Start the background replication thread.
+        """
+        self.__thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop the replication. When stop returns, no further change is applied.
+        """
+        with self.__lock:
+            self.__stopped.set()
+
+    def get_status(self) -> tuple:
+        """
+        Return the replication state.
+        The lag in records is the difference between the last sequence number of the primary (at the last contact)
+        and the applied one. While the replica has applied all records the lag in seconds is 0, otherwise it is the
+        age of the last applied record. While the replica is disconnected the lag in seconds is at least the time
+        since the last contact with the primary.
+
+        return (connected?, applied sequence number, sequence number of the primary, lag in records, lag in seconds)
+        """
+        with self.__lock:
+            now = time.time()
+            if self.__last_contact is None:
+                lag = float("inf")
+            elif self.__applied < self.__primary_sequence:
+                lag = now - self.__applied_time
+            else:
+                lag = 0.0
+            if not self.__connected and self.__last_contact is not None:
+                lag = max(lag, now - self.__last_contact)
+            return (self.__connected, self.__applied, self.__primary_sequence,
+                    self.__primary_sequence - self.__applied, lag)
+
+    def __run(self) -> None:
+        """
+        Replication thread: Long-polls the primary for changes and applies them. Reconnects after errors.
+        """
+        connection = None
+        while not self.__stopped.is_set():
+            try:
+                if connection is None:
+                    connection = rpyc.connect(self.__host, self.__port,
+                                              config={"sync_request_timeout": self.__poll_timeout + 30})
+                result = connection.root.fetch_changes(self.__log_id, self.__applied, self.__poll_timeout)
+                if not result[0]:
+                    print(f"[WARNING] Replication failed: {result[-1]}")
+                    self.__disconnected()
+                    self.__stopped.wait(1)
+                    continue
+                self.__apply(result)
+            except (OSError, EOFError, ValueError):
+                if connection is not None:
+                    try:
+                        connection.close()
+                    except Exception:
+                        pass
+                    connection = None
+                self.__disconnected()
+                self.__stopped.wait(1)
+        if connection is not None:
+            connection.close()
+
+    def __apply(self, result: tuple) -> None:
+        """
+        Apply a response of the primary, unless the replication was stopped meanwhile.
+
+        param - {tuple} - result - (True, log id, sequence, snapshot?, json payload, time of the record with the
+                                    sequence, last sequence of the primary, message)
+        """
+        _, log_id, sequence, is_snapshot, text, sequence_time, primary_sequence, _ = result
+        changes = payload.loads(text)
+        with self.__lock:
+            if self.__stopped.is_set():
+                return
+            if is_snapshot:
+                self.__restore(changes)
+            elif len(changes) > 0:
+                self.__apply_records(tuple(changes))
+            self.__log_id = log_id
+            self.__applied = sequence
+            self.__applied_time = sequence_time
+            self.__primary_sequence = primary_sequence
+            self.__last_contact = time.time()
+            self.__connected = True
+
+    def __disconnected(self) -> None:
+        """
+        Mark the replica as disconnected, the lag grows from now on.
+        """
+        with self.__lock:
+            self.__connected = False
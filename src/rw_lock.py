@@ -0,0 +1,117 @@
+"""
+    rw_lock:
+    Contains a simple shared/exclusive (reader-writer) lock.
+    The shared and the exclusive side have the same acquire/release interface as threading.Lock, so they can be used
+    with lock_timeout and locks_timeout.
+"""
+
+# =====Imports=========================================
+from threading import Lock, Condition
+
+
+# =====ReadWriteLock Class=============================
+class ReadWriteLock:
+    def __init__(self):
+        """
+        Initializes the ReadWriteLock.
+        Many readers can hold the lock at the same time, a writer holds it exclusively.
+        Waiting writers are preferred over new readers, so a steady stream of readers can't starve the writers.
+        """
+        self.__condition = Condition(Lock())
+        self.__readers = 0
+        self.__writer = False
+        self.__waiting_writers = 0
+        self.read = _SharedSide(self)
+        self.write = _ExclusiveSide(self)
+
+    def acquire_read(self, blocking: bool = True, timeout: float = -1) -> bool:
+        """
+        Acquire the lock shared (for reading).
+
+        param - {bool} - blocking - Wait for the lock if it can't be acquired immediately
+        param - {float} - timeout - The maximum time for acquiring the lock (-1: no limit)
+
+        return acquired?
+        """
+        with self.__condition:
+            if not self.__wait(lambda: not self.__writer and self.__waiting_writers == 0, blocking, timeout):
+                return False
+            self.__readers += 1
+            return True
+
+    def release_read(self) -> None:
+        """
+        Release the shared lock.
+        """
+        with self.__condition:
+            self.__readers -= 1
+            if self.__readers == 0:
+                self.__condition.notify_all()
+
+    def acquire_write(self, blocking: bool = True, timeout: float = -1) -> bool:
+        """
+        Acquire the lock exclusive (for writing).
+
+        param - {bool} - blocking - Wait for the lock if it can't be acquired immediately
+        param - {float} - timeout - The maximum time for acquiring the lock (-1: no limit)
+
+        return acquired?
+        """
+        with self.__condition:
+            self.__waiting_writers += 1
+            try:
+                if not self.__wait(lambda: not self.__writer and self.__readers == 0, blocking, timeout):
+                    return False
+                self.__writer = True
+                return True
+            finally:
+                self.__waiting_writers -= 1
+                if not self.__writer or self.__waiting_writers == 0:
+                    # A writer gave up or no writer waits anymore -> blocked readers may continue
+                    self.__condition.notify_all()
+
+    def release_write(self) -> None:
+        """
+        Release the exclusive lock.
+        """
+        with self.__condition:
+            self.__writer = False
+            self.__condition.notify_all()
+
+    def __wait(self, predicate, blocking: bool, timeout: float) -> bool:
+        """
+        Wait until the predicate is true. Has to be called while holding the condition.
+
+        return predicate fulfilled?
+        """
+        if not blocking:
+            return predicate()
+        return self.__condition.wait_for(predicate, None if timeout < 0 else timeout)
+
+
+class _SharedSide:
+    def __init__(self, rw_lock: ReadWriteLock):
+        """
+        The shared side of a ReadWriteLock with the interface of threading.Lock.
+        """
+        self.__rw_lock = rw_lock
+
+    def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+        return self.__rw_lock.acquire_read(blocking, timeout)
+
+    def release(self) -> None:
+        self.__rw_lock.release_read()
+
+
+class _ExclusiveSide:
+    def __init__(self, rw_lock: ReadWriteLock):
+        """
+        The exclusive side of a ReadWriteLock with the interface of threading.Lock.
+        """
+        self.__rw_lock = rw_lock
+
+    def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+        return self.__rw_lock.acquire_write(blocking, timeout)
+
+    def release(self) -> None:
+        self.__rw_lock.release_write()
@@ -0,0 +1,466 @@
+"""
+    Shard router:
+    Contains the service of the router in the sharded deployment. Every shard is a separate server process which owns
+    a hash partition of the Board names and its own persistence file. The router forwards each call to the shard which
+    owns the Board. Listing and deleting all Boards is sent to every shard and the results are merged.
+    Clients which need more throughput than one router can forward may ask for the shard addresses and connect to
+    the owning shard (see shard_index) directly.
+"""
+
+# =====Imports=========================================
+import zlib
+import heapq
+from datetime import datetime
+from typing import Union
+import rpyc
+
+import src.logger as logger
+import src.payload as payload
+from src.event_loop_server import blocking
+
+
+# =====Functions=======================================
+def shard_index(name: str, shards: int) -> int:
+    """
+    Return the index of the shard which owns the given Blackboard.
+    Uses crc32 instead of hash, since hash of a string differs between processes.
+
+    param - {str} - name - Unique name of the Blackboard
+    param - {int} - shards - Number of shards
+
+    return index
+    """
+    return zlib.crc32(str(name).encode("UTF8")) % shards
+
+
+# =====Service Class===================================
+class ShardRouter(rpyc.Service):
+    # static variables
+    __shards = ()
+    UNAVAILABLE = (False, "[ERROR] The shard of the Board is not available. Try again later.")
+
+    def __init__(self):
+        """
+        Initializes the ShardRouter (service) class.
+        A ShardRouter instance is created for each connected client. It opens its own connection to each shard on
+        the first call, so the calls of different clients don't wait on each other.
+        """
+        self.__client_address = None
+        self.__connections = [None] * len(self.__shards)
+
+    @staticmethod
+    def set_shards(addresses: tuple) -> None:
+        """
+        Set the addresses of the shards. Has to be called before the router is started.
+
+        param - {tuple} - addresses - The (host, port) of every shard, ordered by shard index
+        """
+        ShardRouter.__shards = tuple(addresses)
+
+    def on_connect(self, conn: rpyc.core.protocol.Connection) -> None:
+        """
+        Called when the client connects.
+        Saves the address of the connected client and writes a log entry.
+
+        param - {rpyc.core.protocol.Connection} - conn - The connection with the client
+        """
+        self.__client_address = conn._channel.stream.sock.getpeername()
+        logger.write_in_log([datetime.now(), "Client-Connect", *self.__client_address])
+
+    def on_disconnect(self, conn: rpyc.core.protocol.Connection) -> None:
+        """
+        Called when the client is disconnected.
+        Closes the connections to the shards and writes a log entry.
+
+        param - {rpyc.core.protocol.Connection} - conn - The (former) connection with the client
+        """
+        for index, connection in enumerate(self.__connections):
+            if connection is not None:
+                self.__close(index)
+        logger.write_in_log([datetime.now(), "Client-Disconnect", *self.__client_address])
+
+    def exposed_create_blackboard(self, name: str, valid_sec: Union[float, int, str]) -> tuple:
+        """
+        Create a new empty Blackboard on its shard (see BlackBoardHost).
+
+        param - {str} - name - Name of the new Blackboard
+        param - {float or int or str} - valid_sec - Time the data in the Blackboard shall be valid
+
+        return (successful?, message)
+        """
+        return self.__forward(name, "create_blackboard", name, valid_sec)
+
+    def exposed_display_blackboard(self, name: str, data: Union[str, bytes]) -> tuple:
+        """
+        Update the data of the Blackboard on its shard (see BlackBoardHost).
+
+        param - {str} - name - Name of the existing Blackboard
+        param - {str or bytes} - data - Given data written to the Blackboard
+
+        return (successful?, message)
+        """
+        return self.__forward(name, "display_blackboard", name, data)
+
+    def exposed_compare_and_set_blackboard(self, name: str, expected_version: Union[int, str],
+                                           data: Union[str, bytes]) -> tuple:
+        """
+        Update the data of the Blackboard on its shard if it still has the expected version (see BlackBoardHost).
+
+        param - {str} - name - Name of the existing Blackboard
+        param - {int or str} - expected_version - The version the client has read
+        param - {str or bytes} - data - Given data written to the Blackboard
+
+        return (True, new_version, message) OR (False, current_version, message) on a conflict OR (False, message)
+        """
+        return self.__forward(name, "compare_and_set_blackboard", name, expected_version, data)
+
+    def exposed_clear_blackboard(self, name: str) -> tuple:
+        """
+        Clear the Blackboard on its shard (see BlackBoardHost).
+
+        param - {str} - name - Unique name of the Blackboard
+
+        return (successful?, message)
+        """
+        return self.__forward(name, "clear_blackboard", name)
+
+    def exposed_read_blackboard(self, name: str) -> tuple:
+        """
+        Read the Blackboard from its shard (see BlackBoardHost).
+
+        param - {str} - name - Unique name of the Blackboard
+
+        return (True, data, is_valid, message) OR (False, message)
+        """
+        return self.__forward(name, "read_blackboard", name)
+
+    def exposed_read_blackboard_versioned(self, name: str) -> tuple:
+        """
+        Read the Blackboard and its version from its shard (see BlackBoardHost).
+
+        param - {str} - name - Unique name of the Blackboard
+
+        return (True, data, is_valid, version, message) OR (False, message)
+        """
+        return self.__forward(name, "read_blackboard_versioned", name)
+
+    def exposed_read_blackboard_if_newer(self, name: str, since_entry_time: Union[float, int, str],
+                                         timeout: Union[float, int, str]) -> tuple:
+        """
+        Long-poll the Blackboard on its shard (see BlackBoardHost). The call occupies a connection of this client
+        to the shard while it waits. In event-loop mode the wait runs outside the worker pool.
+
+        param - {str} - name - Unique name of the Blackboard
+        param - {float or int or str} - since_entry_time - The entry time the client already knows
+        param - {float or int or str} - timeout - Maximum time to wait in seconds
+
+        return (True, modified?, data, is_valid, entry_time, message) OR (False, message)
+        """
+        with blocking() as admitted:
+            if admitted:
+                return self.__forward(name, "read_blackboard_if_newer", name, since_entry_time, timeout)
+        return False, "[OVERLOAD] Too many long-polls are waiting. Request rejected. Try again later."
+
+    def exposed_get_blackboard_status(self, name: str) -> tuple:
+        """
+        Return the current state of the Blackboard from its shard (see BlackBoardHost).
+
+        param - {str} - name - Unique name of the Blackboard
+
+        return (True, is_empty, entry_time, is_valid, message) OR (False, message)
+        """
+        return self.__forward(name, "get_blackboard_status", name)
+
+    def exposed_delete_blackboard(self, name: str) -> tuple:
+        """
+        Delete the Blackboard on its shard (see BlackBoardHost).
+
+        param - {str} - name - Unique name of the Blackboard
+
+        return (successful?, message)
+        """
+        return self.__forward(name, "delete_blackboard", name)
+
+    def exposed_read_blackboards(self, names: tuple) -> tuple:
+        """
+        Return the data and valid state of several Blackboards (see BlackBoardHost).
+        The names are grouped by shard, so every shard is called once.
+
+        param - {tuple} - names - Unique names of the Blackboards
+
+        return (True, ((name, result of exposed_read_blackboard), ...), message) OR (False, message)
+        """
+        names = tuple(str(name) for name in names)
+        return self.__forward_batch("read_blackboards", tuple((name, name) for name in names), "read")
+
+    def exposed_get_blackboard_statuses(self, names: tuple) -> tuple:
+        """
+        Return the current state of several Blackboards (see BlackBoardHost).
+        The names are grouped by shard, so every shard is called once.
+
+        param - {tuple} - names - Unique names of the Blackboards
+
+        return (True, ((name, result of exposed_get_blackboard_status), ...), message) OR (False, message)
+        """
+        names = tuple(str(name) for name in names)
+        return self.__forward_batch("get_blackboard_statuses", tuple((name, name) for name in names), "read")
+
+    def exposed_display_blackboards(self, boards: Union[dict, tuple]) -> tuple:
+        """
+        Update the data of several Blackboards (see BlackBoardHost).
+        The Boards are grouped by shard, so every shard is called once. Only the updates of one shard are atomic.
+
+        param - {dict or tuple} - boards - The data per Board name as dictionary or tuple of (name, data) pairs
+
+        return (True, ((name, result of exposed_display_blackboard), ...), message) OR (False, message)
+        """
+        if isinstance(boards, dict):
+            # Only iteration and item access are allowed on a dictionary of the client
+            boards = tuple((name, boards[name]) for name in boards)
+        updates = tuple((str(name), (str(name), payload.normalize_data(data))) for name, data in boards)
+        return self.__forward_batch("display_blackboards", updates, "updated")
+
+    def exposed_list_blackboards(self) -> tuple:
+        """
+        Return a complete list of the Blackboards of all shards.
+
+        return (True, list_of_boards, message) or (False, message)
+        """
+        list_of_boards = []
+        for index in range(len(self.__shards)):
+            result = self.__call(index, "list_blackboards")
+            if not result[0]:
+                return result
+            list_of_boards.extend(result[1])
+
+        # Tuple: RPyC transfers lists by reference (one round trip per access)
+        list_of_boards = tuple(list_of_boards)
+        if len(list_of_boards) == 0:
+            return True, list_of_boards, "[WARNING] No Boards found! Please create one first!"
+        return True, list_of_boards, "[INFO] Successful read of Board list!"
+
+    def exposed_list_expired_blackboards(self) -> tuple:
+        """
+        Return the names of the Blackboards with expired data of all shards (see BlackBoardHost).
+
+        return (True, names, message) OR (False, message)
+        """
+        names = []
+        for index in range(len(self.__shards)):
+            result = self.__call(index, "list_expired_blackboards")
+            if not result[0]:
+                return result
+            names.extend(result[1])
+
+        # Tuple: RPyC transfers lists by reference (one round trip per access)
+        names = tuple(names)
+        if len(names) == 0:
+            return True, names, "[INFO] No expired Boards found!"
+        return True, names, f"[INFO] Found {len(names)} expired Boards!"
+
+    def exposed_get_compression_stats(self) -> tuple:
+        """
+        Return the summed up compression statistics of all shards (see BlackBoardHost).
+
+        return (True, compressed_boards, original_bytes, stored_bytes, saved_bytes, ratio, message) OR (False, message)
+        """
+        compressed_boards = 0
+        original_bytes = 0
+        stored_bytes = 0
+        for index in range(len(self.__shards)):
+            result = self.__call(index, "get_compression_stats")
+            if not result[0]:
+                return result
+            compressed_boards += result[1]
+            original_bytes += result[2]
+            stored_bytes += result[3]
+
+        saved_bytes = original_bytes - stored_bytes
+        ratio = original_bytes / stored_bytes if stored_bytes > 0 else 1.0
+        return (True, compressed_boards, original_bytes, stored_bytes, saved_bytes, ratio,
+                f"[INFO] {compressed_boards} compressed Boards save {saved_bytes} bytes (ratio {ratio:.2f})!")
+
+    def exposed_get_cache_stats(self) -> tuple:
+        """
+        Return the summed up cache statistics of the disk stores of all shards (see BlackBoardHost).
+
+        return (True, cached_boards, cached_bytes, budget_bytes, hits, misses, message) OR (False, message)
+        """
+        totals = [0, 0, 0, 0, 0]
+        for index in range(len(self.__shards)):
+            result = self.__call(index, "get_cache_stats")
+            if not result[0]:
+                return result
+            totals = [total + value for total, value in zip(totals, result[1:6])]
+
+        cached_boards, cached_bytes, budget_bytes, hits, misses = totals
+        return (True, cached_boards, cached_bytes, budget_bytes, hits, misses,
+                f"[INFO] {cached_boards} Boards with {cached_bytes} of {budget_bytes} bytes cached "
+                f"({hits} hits, {misses} misses)!")
+
+    def exposed_list_blackboards_page(self, prefix: str = "", cursor: Union[str, None] = None,
+                                      limit: Union[int, str] = 100) -> tuple:
+        """
+        Return one page of the Blackboard names of all shards with the given prefix in sorted order.
+        Every shard returns its next page after the cursor, the merged pages contain the next names of all shards.
+
+        param - {str} - prefix - The prefix of the names (default: all names)
+        param - {str or None} - cursor - The cursor returned with the previous page (default: first page)
+        param - {int or str} - limit - The maximum number of names (default: 100)
+
+        return (True, names, cursor of the next page or None, message) OR (False, message)
+        """
+        pages = []
+        bound = None
+        for index in range(len(self.__shards)):
+            result = self.__call(index, "list_blackboards_page", prefix, cursor, limit)
+            if not result[0]:
+                return result
+            pages.append(result[1])
+            if result[2] is not None:
+                # The shard has more names, the merged page must not go beyond its last name
+                bound = result[2] if bound is None else min(bound, result[2])
+
+        names = [name for name in heapq.merge(*pages) if bound is None or name <= bound]
+        more = bound is not None or len(names) > int(limit)
+        names = tuple(names[:int(limit)])
+        next_cursor = names[-1] if more and len(names) > 0 else None
+        return True, names, next_cursor, f"[INFO] Successfully read {len(names)} Board names!"
+
+    def exposed_delete_all_blackboards(self) -> tuple:
+        """
+        Delete all existing Blackboards of all shards.
+        If a shard fails, the Boards of the other shards are deleted anyway.
+
+        return (successful?, message)
+        """
+        results = [self.__call(index, "delete_all_blackboards") for index in range(len(self.__shards))]
+        for result in results:
+            if not result[0]:
+                return result
+        return True, "[INFO] Successfully deleted all Boards!"
+
+    def exposed_subscribe(self, name: str, callback) -> tuple:
+        """
+        Subscribe to the changes of the given Blackboard (see BlackBoardHost).
+        The shard invokes the callback through the router, so the router serves its connection to the shard in the
+        background from now on.
+
+        param - {str} - name - Unique name of the Blackboard
+        param - {function} - callback - The callback of the client
+
+        return (True, subscription_id, message) OR (False, message)
+        """
+        index = shard_index(name, len(self.__shards))
+        result = self.__call(index, "subscribe", str(name), callback, serve=True)
+        if not result[0]:
+            return result
+        # The ids of the shards overlap, so the shard index is encoded in the id
+        return True, result[1] * len(self.__shards) + index, result[2]
+
+    def exposed_unsubscribe(self, subscription_id: int) -> tuple:
+        """
+        End a subscription of this client.
+
+        param - {int} - subscription_id - The id returned by exposed_subscribe
+
+        return (successful?, message)
+        """
+        try:
+            subscription_id = int(subscription_id)
+        except (TypeError, ValueError):
+            return False, "[ERROR] Invalid parameters! Please give the subscription id as Int!"
+        shard_subscription_id, index = divmod(subscription_id, len(self.__shards))
+        return self.__call(index, "unsubscribe", shard_subscription_id)
+
+    def exposed_get_shards(self) -> tuple:
+        """
+        Return the addresses of the shards, ordered by shard index.
+        A client can connect to the shard of a Board directly, the index is shard_index(name, number of shards).
+
+        return (True, ((host, port), ...), message)
+        """
+        return True, self.__shards, f"[INFO] The Boards are partitioned into {len(self.__shards)} shards."
+
+    def __forward(self, name: str, method: str, *args) -> tuple:
+        """
+        Forward a call to the shard which owns the given Blackboard.
+
+        param - {str} - name - Unique name of the Blackboard
+        param - {str} - method - The exposed method of the shard (without prefix)
+        param - {any} - args - The call arguments
+
+        return result of the shard
+        """
+        return self.__call(shard_index(name, len(self.__shards)), method, *args)
+
+    def __forward_batch(self, method: str, items: tuple, action: str) -> tuple:
+        """
+        Forward a batch call: Every shard is called once with its part of the items and the results are merged in
+        the original order.
+
+        param - {str} - method - The exposed batch method of the shard (without prefix)
+        param - {tuple} - items - The (name, argument) pairs; the arguments of a shard are passed as tuple
+        param - {str} - action - The action for the message, e.g. "read"
+
+        return (True, ((name, result), ...), message) OR (False, message)
+        """
+        parts = {}
+        for name, argument in items:
+            parts.setdefault(shard_index(name, len(self.__shards)), []).append(argument)
+
+        results = {}
+        for index, arguments in parts.items():
+            result = self.__call(index, method, tuple(arguments))
+            if not result[0]:
+                return result
+            for name, single_result in result[1]:
+                results[name] = single_result
+
+        merged = tuple((name, results[name]) for name, _ in items)
+        successful = sum(1 for _, result in merged if result[0])
+        if successful == len(merged):
+            return True, merged, f"[INFO] Successfully {action} {successful} Boards!"
+        return True, merged, f"[WARNING] Only {action} {successful} of {len(merged)} Boards! See the single results."
+
+    def __call(self, index: int, method: str, *args, serve: bool = False) -> tuple:
+        """
+        Call an exposed method of a shard. The connection is opened on the first call.
+        If the shard can't be reached, the connection is dropped and an error result is returned.
+
+        param - {int} - index - The index of the shard
+        param - {str} - method - The exposed method of the shard (without prefix)
+        param - {any} - args - The call arguments
+        param - {bool} - serve - Serve the connection in the background (needed for callbacks)
+
+        return result of the shard
+        """
+        try:
+            connection = self.__connections[index]
+            if connection is None:
+                host, port = self.__shards[index]
+                connection = (rpyc.connect(host, port), None)
+                self.__connections[index] = connection
+            if serve and connection[1] is None:
+                connection = (connection[0], rpyc.BgServingThread(connection[0]))
+                self.__connections[index] = connection
+            return getattr(connection[0].root, method)(*args)
+        except (OSError, EOFError):
+            self.__close(index)
+            return self.UNAVAILABLE
+
+    def __close(self, index: int) -> None:
+        """
+        Close the connection to a shard.
+
+        param - {int} - index - The index of the shard
+        """
+        connection, self.__connections[index] = self.__connections[index], None
+        if connection is None:
+            return
+        try:
+            if connection[1] is not None:
+                connection[1].stop()
+            connection[0].close()
+        except Exception:
+            pass
@@ -0,0 +1,66 @@
+"""
+    Snapshot:
+    Contains the binary snapshot of all Blackboards used together with the journal.
+    The snapshot stores the Boards column by column with marshal, which loads much faster than parsing json or
+    replaying the journal. Every snapshot has an id; the journal written after the snapshot starts with a checkpoint
+    record carrying the same id, so on startup only the journal tail after the snapshot is replayed.
+"""
+
+# =====Imports=========================================
+import os
+import marshal
+
+from src.board_record import BoardRecord
+from src.payload import CompressedData
+
+# =====Constants=======================================
+HEADER = b"BBSNAPSHOT1\n"
+
+
+# =====Functions=======================================
+def write_snapshot(path: str, snapshot_id: str, boards: dict) -> None:
+    """
+    Write the snapshot atomically: The file is written and synced under a temporary name and then renamed, so a
+    crash leaves the previous snapshot intact.
+
+    param - {str} - path - Path of the snapshot file
+    param - {str} - snapshot_id - The id of the snapshot
+    param - {dict} - boards - The BoardRecords by name (not modified meanwhile)
+    """
+    names = tuple(boards)
+    records = [boards[name] for name in names]
+    # Compressed data is stored separately as {index: (compressed, is_text, size)}
+    compressed = {index: (record.data.compressed, record.data.is_text, record.data.size)
+                  for index, record in enumerate(records) if isinstance(record.data, CompressedData)}
+    data = tuple(None if isinstance(record.data, CompressedData) else record.data for record in records)
+    content = marshal.dumps((snapshot_id, names, tuple(record.valid_sec for record in records),
+                             tuple(record.entry_time for record in records), data,
+                             tuple(record.version for record in records), compressed))
+
+    temporary_path = path + ".tmp"
+    with open(temporary_path, 'wb') as file:
+        file.write(HEADER)
+        file.write(content)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary_path, path)
+
+
+def read_snapshot(path: str) -> tuple:
+    """
+    Read a snapshot file.
+
+    param - {str} - path - Path of the snapshot file
+
+    return (snapshot_id, BoardRecords by name)
+    """
+    with open(path, 'rb') as file:
+        if file.read(len(HEADER)) != HEADER:
+            raise ValueError(f"'{path}' is no Board snapshot")
+        snapshot_id, names, valid_secs, entry_times, data, versions, compressed = marshal.loads(file.read())
+
+    # The records are built column-wise, which is much faster than one at a time
+    records = list(map(BoardRecord, valid_secs, entry_times, data, versions))
+    for index, item in compressed.items():
+        records[index].data = CompressedData(*item)
+    return snapshot_id, dict(zip(names, records))
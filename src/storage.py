@@ -0,0 +1,395 @@
+"""
+    Storage:
+    Contains the storage backends which persist the Blackboards of BlackBoardHost.
+    Every backend gets the mutation records (see journal) in batches from the background flusher and loads the Boards
+    on startup. The backend is selected by the persistence mode:
+    "memory": Nothing is persisted (maximum throughput, the Boards are lost on a restart).
+    "json": The complete <path>.json file is rewritten on every batch.
+    "journal": The records are appended to <path>.journal, which is compacted into <path>.snapshot.
+    "sqlite": The records are applied to <path>.sqlite, only the index of the Boards is kept in memory (see disk_store).
+"""
+
+# =====Imports=========================================
+import os
+import uuid
+from threading import Lock, Event
+from typing import Union
+
+import src.payload as payload
+from src.board_record import records_from_dicts
+from src.journal import Journal, replay_journal, read_checkpoint
+from src.snapshot import write_snapshot, read_snapshot
+
+
+# =====OnDisk Class====================================
+class _OnDisk:
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "ON_DISK"
+
+
+# Marker for the data of a Board which is kept by the backend instead of in memory (see StorageBackend.offload)
+ON_DISK = _OnDisk()
+
+
+# =====StorageBackend Class============================
+class StorageBackend:
+    # Backends which don't persist anything need no background flusher
+    persistent = True
+
+    def __init__(self, path: str):
+        """
+        Initializes the StorageBackend.
+
+        param - {str} - path - Path of the persistence files without extension
+        """
+        self.path = path
+
+    def load(self) -> dict:
+        """
+        Load all Boards. Called once before the first write.
+
+        return BoardRecords by name
+        """
+        return {}
+
+    def write(self, records: list, boards: dict) -> None:
+        """
+        Persist a batch of mutation records. Called by the background flusher.
+        Raises an exception if the records could not be persisted, so the writers waiting for them are not
+        acknowledged.
+
+        param - {list} - records - The records describing the mutations
+        param - {dict} - boards - The current BoardRecords by name (may be changed concurrently)
+        """
+        pass
+
+    def offload(self, name: str, data):
+        """
+        Called with the new data of a Board before it is published, while holding the lock of the Board.
+        Return the data which is kept in memory (ON_DISK if the backend keeps the data itself).
+
+        param - {str} - name - Unique name of the Blackboard
+        param - {str or bytes or CompressedData} - data - The new data
+
+        return data
+        """
+        return data
+
+    def read(self, name: str) -> Union[str, bytes, payload.CompressedData, None]:
+        """
+        Return the data of a Board whose data was offloaded (ON_DISK).
+
+        param - {str} - name - Unique name of the Blackboard
+
+        return data
+        """
+        return None
+
+    def discard(self, name: str) -> None:
+        """
+        Called when the data of a Board is cleared or the Board is deleted.
+
+        param - {str} - name - Unique name of the Blackboard
+        """
+        pass
+
+    def discard_all(self) -> None:
+        """
+        Called when all Boards are deleted or replaced.
+        """
+        pass
+
+    def get_sizes(self) -> Union[tuple, None]:
+        """
+        Return the sizes of the stored data if the backend keeps the data (see exposed_get_compression_stats).
+
+        return (compressed Boards, original bytes, stored bytes) OR None
+        """
+        return None
+
+    def get_cache_stats(self) -> Union[tuple, None]:
+        """
+        Return the state of the cache if the backend has one.
+
+        return (cached Boards, cached bytes, budget in bytes, hits, misses, staged writes) OR None
+        """
+        return None
+
+    def needs_compaction(self) -> bool:
+        """
+        Return whether the persisted records should be compacted now (see begin_compaction).
+
+        return compaction needed?
+        """
+        return False
+
+    def begin_compaction(self) -> Union[str, None]:
+        """
+        Start a compaction. The caller has to queue a checkpoint record with the returned id behind the pending
+        writes and call finish_compaction with the Boards at that point.
+
+        return snapshot id OR None if no compaction is possible
+        """
+        return None
+
+    def finish_compaction(self, snapshot_id: str, boards: dict) -> bool:
+        """
+        Finish a compaction started by begin_compaction.
+
+        param - {str} - snapshot_id - The id returned by begin_compaction
+        param - {dict} - boards - The BoardRecords at the checkpoint (not modified meanwhile)
+
+        return compacted?
+        """
+        return False
+
+    def close(self) -> None:
+        """
+        Close the persistence files. Called after the last write.
+        """
+        pass
+
+
+# =====MemoryStorage Class=============================
+class MemoryStorage(StorageBackend):
+    persistent = False
+
+    def load(self) -> dict:
+        """
+        Start without Boards, nothing is persisted.
+
+        return empty dictionary
+        """
+        print("[WARNING] The Boards are kept in memory only and are lost when the server stops.")
+        return {}
+
+
+# =====JsonStorage Class===============================
+class JsonStorage(StorageBackend):
+    def __init__(self, path: str):
+        """
+        Initializes the JsonStorage.
+
+        param - {str} - path - Path of the json file without extension
+        """
+        super().__init__(path)
+        self.__lock = Lock()
+
+    def load(self) -> dict:
+        """
+        Load all Boards from the json file. If no such file exist a new one is created.
+        If an error occurs while reading an existing file the server is resumed without Boards and the old file is
+        overwritten with the first write.
+
+        return BoardRecords by name
+        """
+        try:
+            with open(self.path + '.json', 'r') as file:
+                boards = records_from_dicts(payload.load(file))
+                print("[INFO] Successfully read Boards.")
+                return boards
+        except Exception as e:
+            if isinstance(e, FileNotFoundError):
+                try:
+                    self.write([], {})
+                    print("[WARNING] Found no existing board.json file. Created a new one.")
+                except Exception:
+                    pass
+            else:
+                print("[ERROR] Error while loading board.json file.")
+            return {}
+
+    def write(self, records: list, boards: dict) -> None:
+        """
+        Rewrite the json file with all Boards once per batch.
+
+        param - {list} - records - The records describing the mutations (not needed)
+        param - {dict} - boards - The current BoardRecords by name
+        """
+        try:
+            # Shallow copy, so Boards created or deleted concurrently don't break the iteration
+            boards = dict(boards)
+            with self.__lock, open(self.path + '.json', 'w') as file:
+                payload.dump(boards, file, sort_keys=True, indent=4)
+                file.flush()
+                os.fsync(file.fileno())
+                print("[INFO] Successfully stored Boards.")
+        except Exception:
+            print("[ERROR] Error while saving the Boards.")
+            raise
+
+
+# =====JournalStorage Class============================
+class JournalStorage(StorageBackend):
+    def __init__(self, path: str, snapshot_records: int = 100000):
+        """
+        Initializes the JournalStorage.
+
+        param - {str} - path - Path of the journal and snapshot files without extension
+        param - {int} - snapshot_records - Compact as soon as the journal has this number of records (0: never)
+        """
+        super().__init__(path)
+        self.snapshot_records = snapshot_records
+        self.__journal = None
+        # Set by the background flusher when it rotated the journal for a compaction
+        self.__rotated = Event()
+        self.__rotation_failed = False
+
+    def load(self) -> dict:
+        """
+        Load all Boards from the latest snapshot and replay the journal records written after it. Open the journal
+        for appending.
+        A compaction interrupted by a crash is finished before the server starts (the Boards are complete anyway).
+        If neither a snapshot nor a journal exists yet, an existing board.json file is taken over as the first
+        journal record.
+
+        return BoardRecords by name
+        """
+        path = self.path
+        try:
+            if os.path.isfile(path + '.snapshot'):
+                snapshot_id, boards = read_snapshot(path + '.snapshot')
+            elif os.path.isfile(path + '.journal'):
+                snapshot_id, boards = None, {}
+            else:
+                raise FileNotFoundError(path + '.journal')
+
+            # The compacted journal is only left if a compaction was interrupted, it precedes the current journal
+            journals = [name for name in (path + '.journal.compacting', path + '.journal') if os.path.isfile(name)]
+            checkpoints = [read_checkpoint(name) for name in journals]
+            if snapshot_id in checkpoints:
+                # Replay the journal which continues the snapshot and the following ones
+                journals = journals[checkpoints.index(snapshot_id):]
+            elif snapshot_id is not None:
+                # The snapshot is newer than every journal (interrupted while finishing a compaction)
+                journals = []
+            for name in journals:
+                replay_journal(name, boards)
+
+            if os.path.isfile(path + '.journal.compacting') or not os.path.isfile(path + '.journal'):
+                self.__compact_offline(boards)
+            self.__journal = Journal(path + '.journal')
+            print(f"[INFO] Successfully loaded the Boards (snapshot: {snapshot_id is not None}, "
+                  f"replayed journals: {len(journals)}).")
+        except FileNotFoundError:
+            try:
+                with open(path + '.json', 'r') as file:
+                    boards = records_from_dicts(payload.load(file))
+            except Exception:
+                boards = {}
+            self.__journal = Journal(path + '.journal')
+            self.__journal.append({"op": "restore", "boards": boards})
+            print("[WARNING] Found no existing boards.journal file. Created a new one.")
+        except Exception:
+            print("[ERROR] Error while loading boards.journal file.")
+            boards = {}
+        return boards
+
+    def __compact_offline(self, boards: dict) -> None:
+        """
+        Write a snapshot of the loaded Boards and start an empty journal while no writer is running (startup).
+        The empty journal is prepared first and the snapshot is replaced before the journal, so after a crash at any
+        point the Boards are still loaded correctly.
+
+        param - {dict} - boards - The loaded BoardRecords by name
+        """
+        path = self.path
+        snapshot_id = uuid.uuid4().hex
+        journal = Journal(path + '.journal.new')
+        journal.append({"op": "checkpoint", "id": snapshot_id})
+        journal.close()
+        write_snapshot(path + '.snapshot', snapshot_id, boards)
+        os.replace(path + '.journal.new', path + '.journal')
+        if os.path.isfile(path + '.journal.compacting'):
+            os.remove(path + '.journal.compacting')
+
+    def write(self, records: list, boards: dict) -> None:
+        """
+        Append the records to the journal with one write and fsync.
+        A checkpoint of a compaction rotates the journal after the records queued before it.
+
+        param - {list} - records - The records describing the mutations
+        param - {dict} - boards - The current BoardRecords by name (not needed)
+        """
+        try:
+            start = 0
+            for index, record in enumerate(records):
+                if record["op"] == "checkpoint":
+                    if index > start:
+                        self.__journal.write(records[start:index])
+                    self.__rotate(record["id"])
+                    start = index + 1
+            if start < len(records):
+                self.__journal.write(records[start:] if start > 0 else records)
+        except Exception:
+            print("[ERROR] Error while writing the Board journal.")
+            raise
+
+    def __rotate(self, snapshot_id: str) -> None:
+        """
+        Called by the background flusher at the checkpoint of a compaction: Moves the written records to the
+        compacted journal and starts the new journal. Wakes up the waiting compaction.
+
+        param - {str} - snapshot_id - The id of the snapshot the new journal continues
+        """
+        self.__rotation_failed = False
+        try:
+            self.__journal.rotate(self.path + '.journal.compacting', snapshot_id)
+        except OSError:
+            self.__rotation_failed = True
+        finally:
+            self.__rotated.set()
+
+    def needs_compaction(self) -> bool:
+        """
+        Return whether the journal has reached the configured number of records.
+
+        return compaction needed?
+        """
+        journal = self.__journal
+        return self.snapshot_records > 0 and journal is not None and journal.records >= self.snapshot_records
+
+    def begin_compaction(self) -> Union[str, None]:
+        """
+        Start a compaction (see StorageBackend.begin_compaction).
+
+        return snapshot id OR None if no compaction is possible
+        """
+        if self.__journal is None:
+            return None
+        if os.path.isfile(self.path + '.journal.compacting'):
+            # The previous compaction failed, its journal must not be overwritten (finished on the next start)
+            return None
+        self.__rotated.clear()
+        return uuid.uuid4().hex
+
+    def finish_compaction(self, snapshot_id: str, boards: dict) -> bool:
+        """
+        Wait until the records before the checkpoint are written and the journal is rotated, then write the
+        snapshot and remove the compacted journal.
+
+        param - {str} - snapshot_id - The id returned by begin_compaction
+        param - {dict} - boards - The BoardRecords at the checkpoint (not modified meanwhile)
+
+        return compacted?
+        """
+        if not self.__rotated.wait(60) or self.__rotation_failed:
+            print("[ERROR] Error while rotating the Board journal.")
+            return False
+        try:
+            write_snapshot(self.path + '.snapshot', snapshot_id, boards)
+            os.remove(self.path + '.journal.compacting')
+        except OSError:
+            print("[ERROR] Error while writing the Board snapshot.")
+            return False
+        return True
+
+    def close(self) -> None:
+        """
+        Close the journal.
+        """
+        if self.__journal is not None:
+            self.__journal.close()
+            self.__journal = None
@@ -0,0 +1,55 @@
+import unittest
+import time
+from threading import Thread
+from src.admission import AdmissionController
+
+
+class AdmissionTest(unittest.TestCase):
+    def test_reject_when_queue_full(self):
+        admission = AdmissionController(max_active=1, max_queued=0)
+        with admission.admit() as first:
+            self.assertTrue(first)
+            start = time.time()
+            with admission.admit() as second:
+                self.assertFalse(second)
+            # Rejected without waiting
+            self.assertLess(time.time() - start, 0.1)
+        with admission.admit() as third:
+            self.assertTrue(third)
+        self.assertEqual((0, 0, 1), admission.get_stats())
+
+    def test_wait_in_queue(self):
+        admission = AdmissionController(max_active=1, max_queued=1, max_wait=5)
+        results = []
+
+        def queued():
+            with admission.admit() as admitted:
+                results.append(admitted)
+
+        with admission.admit():
+            thread = Thread(target=queued)
+            thread.start()
+            while admission.get_stats()[1] == 0:
+                time.sleep(0.01)
+            # The queue is full
+            with admission.admit() as admitted:
+                self.assertFalse(admitted)
+        thread.join()
+        self.assertEqual([True], results)
+
+    def test_queue_timeout(self):
+        admission = AdmissionController(max_active=1, max_queued=1, max_wait=0.1)
+        with admission.admit():
+            with admission.admit() as admitted:
+                self.assertFalse(admitted)
+        self.assertEqual((0, 0, 1), admission.get_stats())
+
+    def test_invalid_limits(self):
+        with self.assertRaises(ValueError):
+            AdmissionController(max_active=0)
+        with self.assertRaises(ValueError):
+            AdmissionController(max_active=1, max_queued=-1)
+
+
+if __name__ == "__main__":
+    unittest.main()
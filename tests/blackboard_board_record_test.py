@@ -0,0 +1,38 @@
+import unittest
+import sys
+import src.payload as payload
+from src.board_record import BoardRecord, records_from_dicts
+
+
+class BoardRecordTest(unittest.TestCase):
+    def test_replace(self):
+        record = BoardRecord(10, 1.0)
+        self.assertEqual(BoardRecord(10, 1.0, None, 0), record)
+
+        updated = record.replace(entry_time=2.0, data="Data", version=1)
+        self.assertEqual(BoardRecord(10, 2.0, "Data", 1), updated)
+        # The published record stays unchanged
+        self.assertEqual(BoardRecord(10, 1.0, None, 0), record)
+
+        with self.assertRaises(AttributeError):
+            record.replace(unknown=1)
+
+    def test_dict_compatibility(self):
+        # boards.json written before the versioning was introduced
+        boards = records_from_dicts(payload.loads('{"Old": {"valid_sec": 5, "entry_time": 1.0, "data": "x"}}'))
+        self.assertEqual({"Old": BoardRecord(5, 1.0, "x", 0)}, boards)
+
+        text = payload.dumps({"Board": BoardRecord(5, 1.0, b"\x00", 3)}, sort_keys=True)
+        self.assertEqual({"Board": {"valid_sec": 5, "entry_time": 1.0, "data": b"\x00", "version": 3}},
+                         payload.loads(text))
+        self.assertEqual({"Board": BoardRecord(5, 1.0, b"\x00", 3)}, records_from_dicts(payload.loads(text)))
+
+    def test_size(self):
+        record = BoardRecord(5, 1.0, "x", 3)
+        board = record.to_dict()
+        self.assertFalse(hasattr(record, "__dict__"))
+        self.assertLess(sys.getsizeof(record), sys.getsizeof(board))
+
+
+if __name__ == "__main__":
+    unittest.main()
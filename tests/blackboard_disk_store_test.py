@@ -0,0 +1,176 @@
+import unittest
+import os
+import json
+import tempfile
+import src.logger as logger
+from blackboard_server import BlackBoardHost
+from src.board_record import BoardRecord
+from src.payload import CompressedData, compress_data
+from src.disk_store import DiskStore, ON_DISK
+
+
+class DiskStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'boards')
+        self.store = DiskStore(self.path, 100)
+
+    def tearDown(self):
+        self.store.close()
+        self.directory.cleanup()
+
+    def test_write_read(self):
+        compressed = compress_data("Compressible " * 100, 10)
+        self.assertIsInstance(compressed, CompressedData)
+        self.store.write([{"op": "create", "name": "Text", "valid_sec": 10, "entry_time": 1.0},
+                          {"op": "create", "name": "Binary", "valid_sec": 10, "entry_time": 1.0},
+                          {"op": "create", "name": "Compressed", "valid_sec": 10, "entry_time": 1.0},
+                          {"op": "create", "name": "Empty", "valid_sec": 5, "entry_time": 1.0},
+                          {"op": "display", "name": "Text", "entry_time": 2.0, "data": "Data", "version": 1},
+                          {"op": "display", "name": "Binary", "entry_time": 2.0, "data": b"\x00\xff", "version": 1},
+                          {"op": "display", "name": "Compressed", "entry_time": 2.0, "data": compressed,
+                           "version": 1}])
+        self.assertEqual({"Text": BoardRecord(10, 2.0, ON_DISK, 1), "Binary": BoardRecord(10, 2.0, ON_DISK, 1),
+                          "Compressed": BoardRecord(10, 2.0, ON_DISK, 1), "Empty": BoardRecord(5, 1.0)},
+                         self.store.load_index())
+        self.assertEqual("Data", self.store.read("Text"))
+        self.assertEqual(b"\x00\xff", self.store.read("Binary"))
+        self.assertEqual(compressed, self.store.read("Compressed"))
+        self.assertIsNone(self.store.read("Empty"))
+        self.assertEqual((1, 1300 + 2 + 4, len(compressed.compressed) + 2 + 4), self.store.get_sizes())
+
+        self.store.write([{"op": "clear", "name": "Text", "version": 2}, {"op": "delete", "name": "Binary"}])
+        self.assertEqual({"Text": BoardRecord(10, 2.0, None, 2), "Compressed": BoardRecord(10, 2.0, ON_DISK, 1),
+                          "Empty": BoardRecord(5, 1.0)}, self.store.load_index())
+        self.store.write([{"op": "delete_all"}])
+        self.assertEqual({}, self.store.load_index())
+
+    def test_staged_data(self):
+        self.store.write([{"op": "create", "name": "Board", "valid_sec": 10, "entry_time": 1.0}])
+        first = "First"
+        second = "Second"
+        self.store.stage("Board", first)
+        self.store.stage("Board", second)
+        self.assertEqual("Second", self.store.read("Board"))
+
+        # The committed older write doesn't replace the newer staged data
+        self.store.write([{"op": "display", "name": "Board", "entry_time": 2.0, "data": first, "version": 1}])
+        self.assertEqual("Second", self.store.read("Board"))
+        self.assertEqual(1, self.store.get_cache_stats()[5])
+        self.store.write([{"op": "display", "name": "Board", "entry_time": 3.0, "data": second, "version": 2}])
+        self.assertEqual((1, 6, 100, 0, 0, 0), self.store.get_cache_stats())
+        self.assertEqual("Second", self.store.read("Board"))
+
+        self.store.stage("Board", "Third")
+        self.store.discard("Board")
+        self.assertEqual("Second", self.store.read("Board"))
+
+    def test_read_races_with_write(self):
+        self.store.write([{"op": "create", "name": "Board", "valid_sec": 10, "entry_time": 1.0},
+                          {"op": "display", "name": "Board", "entry_time": 1.0, "data": "D1", "version": 1}])
+        self.store.discard("Board")
+        store = self.store
+        reader = store._DiskStore__reader()
+
+        class RacingReader:
+            # A writer stages and commits D2 between the select of a lock-free reader and its cache insert
+            @staticmethod
+            def execute(*args):
+                cursor = reader.execute(*args)
+                data = "D2"
+                store.stage("Board", data)
+                store.write([{"op": "display", "name": "Board", "entry_time": 2.0, "data": data, "version": 2}])
+                return cursor
+
+        store._DiskStore__reader = lambda: RacingReader
+        self.assertEqual("D1", store.read("Board"))
+        del store._DiskStore__reader
+        self.assertEqual("D2", store.read("Board"))
+        self.assertEqual("D2", store.read("Board"))
+
+    def test_cache_budget(self):
+        records = []
+        for i in range(5):
+            records.append({"op": "create", "name": f"Board{i}", "valid_sec": 10, "entry_time": 1.0})
+            records.append({"op": "display", "name": f"Board{i}", "entry_time": 1.0, "data": str(i) * 40,
+                            "version": 1})
+        self.store.write(records)
+
+        # At most 100 bytes are cached, the least recently used data is evicted
+        for i in range(5):
+            self.assertEqual(str(i) * 40, self.store.read(f"Board{i}"))
+        self.assertEqual((2, 80, 100, 0, 5, 0), self.store.get_cache_stats())
+        self.assertEqual("4" * 40, self.store.read("Board4"))
+        self.assertEqual("0" * 40, self.store.read("Board0"))
+        self.assertEqual((2, 80, 100, 1, 6, 0), self.store.get_cache_stats())
+
+        # Data larger than the budget is never cached
+        self.store.write([{"op": "display", "name": "Board1", "entry_time": 2.0, "data": "x" * 200, "version": 2}])
+        self.assertEqual("x" * 200, self.store.read("Board1"))
+        self.assertEqual(2, self.store.get_cache_stats()[0])
+
+
+class SqliteStorageTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'boards')
+        logger.set_log_level("OFF")
+        BlackBoardHost.set_storage("sqlite")
+        BlackBoardHost.set_storage_path(self.path)
+        BlackBoardHost.set_cache_size(1024)
+        BlackBoardHost.load_boards()
+        self.host = BlackBoardHost()
+        self.host._BlackBoardHost__client_address = ('123.123.123.123', 52321)
+
+    def tearDown(self):
+        self.host.exposed_delete_all_blackboards()
+        BlackBoardHost.close_storage()
+        BlackBoardHost.set_storage("json")
+        BlackBoardHost.set_storage_path("boards")
+        BlackBoardHost.set_cache_size(64 * 1024 * 1024)
+        logger.set_log_level("INFO")
+        self.directory.cleanup()
+
+    def reload(self) -> None:
+        BlackBoardHost.close_storage()
+        BlackBoardHost._BlackBoardHost__boards = {}
+        BlackBoardHost.load_boards()
+
+    def test_lazy_loading(self):
+        for i in range(20):
+            self.host.exposed_create_blackboard(f"Board{i}", 1000)
+            self.host.exposed_display_blackboard(f"Board{i}", f"Data{i}" * 20)
+        self.host.exposed_display_blackboard("Binary", b"\x00")
+        self.host.exposed_create_blackboard("Binary", 1000)
+        self.host.exposed_display_blackboard("Binary", b"\x00")
+        self.host.exposed_clear_blackboard("Board0")
+        self.host.exposed_delete_blackboard("Board1")
+        self.assertEqual("Data2" * 20, self.host.exposed_read_blackboard("Board2")[1])
+
+        # Only the index is in memory, the data is read from the database
+        self.reload()
+        boards = BlackBoardHost._BlackBoardHost__boards
+        self.assertEqual(20, len(boards))
+        self.assertIs(ON_DISK, boards["Board2"].data)
+        self.assertIsNone(boards["Board0"].data)
+        self.assertEqual(b"\x00", self.host.exposed_read_blackboard("Binary")[1])
+        self.assertEqual((True, "Data2" * 20, True, boards["Board2"].version),
+                         self.host.exposed_read_blackboard_versioned("Board2")[:4])
+        self.assertEqual(("Board1", (False, "[ERROR] Board does not exist!")),
+                         self.host.exposed_read_blackboards(("Board1", "Board3"))[1][0])
+        self.assertEqual((True, None, False, "[WARNING] Successfully read but data is empty!"),
+                         self.host.exposed_read_blackboard("Board0"))
+        self.assertEqual((True, 3, 201, 1024, 0, 3), self.host.exposed_get_cache_stats()[:6])
+
+    def test_import_json(self):
+        BlackBoardHost.close_storage()
+        os.remove(self.path + '.sqlite')
+        with open(self.path + '.json', 'w') as file:
+            json.dump({"Board": {"valid_sec": 10, "entry_time": 1.0, "data": "Data"}}, file)
+        BlackBoardHost.load_boards()
+        self.assertEqual({"Board": BoardRecord(10, 1.0, ON_DISK)}, BlackBoardHost._BlackBoardHost__boards)
+        self.assertEqual("Data", self.host.exposed_read_blackboard("Board")[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+import unittest
+import time
+import threading
+from threading import Thread, Event
+import rpyc
+from src.event_loop_server import EventLoopServer, blocking
+
+
+class EchoService(rpyc.Service):
+    disconnected = Event()
+
+    def on_disconnect(self, conn):
+        EchoService.disconnected.set()
+
+    def exposed_echo(self, value):
+        return value
+
+    def exposed_sleep(self, seconds):
+        time.sleep(seconds)
+        return seconds
+
+    def exposed_wait(self, seconds):
+        with blocking() as admitted:
+            if admitted:
+                time.sleep(seconds)
+            return admitted
+
+
+class EventLoopServerTest(unittest.TestCase):
+    def setUp(self):
+        self.server = EventLoopServer(EchoService, hostname="localhost", port=0, threads=2, max_blocking=3)
+        self.thread = Thread(target=self.server.start, daemon=True)
+        self.thread.start()
+        while not self.server.active:
+            time.sleep(0.01)
+
+    def tearDown(self):
+        self.server.close()
+        self.thread.join(5)
+        self.assertFalse(self.thread.is_alive())
+
+    def test_serve_many_connections(self):
+        connections = [rpyc.connect("localhost", self.server.port)]
+        try:
+            # The workers are running as soon as the first connection is served
+            self.assertEqual(0, connections[0].root.echo(0))
+            threads_before = threading.active_count()
+            connections += [rpyc.connect("localhost", self.server.port) for _ in range(49)]
+            for i, connection in enumerate(connections):
+                self.assertEqual(i, connection.root.echo(i))
+            # No thread per connection
+            self.assertEqual(threads_before, threading.active_count())
+        finally:
+            for connection in connections:
+                connection.close()
+
+    def test_disconnect(self):
+        EchoService.disconnected.clear()
+        connection = rpyc.connect("localhost", self.server.port)
+        self.assertEqual("x", connection.root.echo("x"))
+        connection.close()
+        self.assertTrue(EchoService.disconnected.wait(5))
+
+    def test_reconnect(self):
+        # The fd of a closed connection is reused for the next one, which must be served as well
+        for i in range(10):
+            connection = rpyc.connect("localhost", self.server.port)
+            connection._config["sync_request_timeout"] = 5
+            try:
+                self.assertEqual(i, connection.root.echo(i))
+            finally:
+                connection.close()
+            # Wait until the server dropped the connection
+            start = time.time()
+            while len(self.server._EventLoopServer__connections) > 0 and time.time() - start < 5:
+                time.sleep(0.01)
+
+    def test_slow_request(self):
+        # A slow request only occupies one worker, the other one serves the other clients
+        slow = rpyc.connect("localhost", self.server.port)
+        fast = rpyc.connect("localhost", self.server.port)
+        try:
+            result = rpyc.async_(slow.root.sleep)(1)
+            start = time.time()
+            self.assertEqual("x", fast.root.echo("x"))
+            self.assertLess(time.time() - start, 0.5)
+            self.assertEqual(1, result.value)
+        finally:
+            slow.close()
+            fast.close()
+
+    def test_blocking_requests(self):
+        # Blocking requests don't occupy the pool, more of them than the maximum are rejected
+        waiting = [rpyc.connect("localhost", self.server.port) for _ in range(4)]
+        fast = rpyc.connect("localhost", self.server.port)
+        try:
+            results = [rpyc.async_(connection.root.wait)(1) for connection in waiting]
+            start = time.time()
+            while self.server.get_blocking() < 3 and time.time() - start < 5:
+                time.sleep(0.01)
+            self.assertEqual("x", fast.root.echo("x"))
+            self.assertLess(time.time() - start, 0.5)
+            self.assertEqual([True, True, True, False], sorted((result.value for result in results), reverse=True))
+            # The spare workers stop after the blocking requests
+            while self.server.get_blocking() > 0:
+                time.sleep(0.01)
+            self.assertTrue(fast.root.wait(0))
+        finally:
+            for connection in waiting:
+                connection.close()
+            fast.close()
+
+    def test_receive_lock_held(self):
+        # A pending request whose receive lock is held by another thread is not handed to the workers in a loop
+        connection = rpyc.connect("localhost", self.server.port)
+        try:
+            self.assertEqual("x", connection.root.echo("x"))
+            server_connection = next(iter(self.server._EventLoopServer__connections.values()))[1]
+            serve = self.server._EventLoopServer__serve
+            calls = []
+
+            def counting_serve(fd):
+                calls.append(fd)
+                serve(fd)
+
+            self.server._EventLoopServer__serve = counting_serve
+            echo = rpyc.async_(connection.root.echo)
+            with server_connection._recvlock:
+                result = echo("y")
+                time.sleep(0.2)
+            self.assertLess(len(calls), 40)
+            self.assertEqual("y", result.value)
+        finally:
+            connection.close()
+
+    def test_blocking_outside_server(self):
+        with blocking() as admitted:
+            self.assertTrue(admitted)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+from src.expiry_index import ExpiryIndex
+from src.board_record import BoardRecord
+
+
+class ExpiryIndexTest(unittest.TestCase):
+    def test_expired(self):
+        index = ExpiryIndex()
+        for i in range(100):
+            index.update(f"Board{i}", i)
+        self.assertEqual(100, len(index))
+        self.assertEqual({"Board0", "Board1", "Board2"}, set(index.expired(2)))
+        self.assertEqual([], index.expired(-1))
+
+    def test_update_and_remove(self):
+        index = ExpiryIndex()
+        index.update("Board", 1)
+        index.update("Board", 10)
+        self.assertEqual([], index.expired(5))
+        self.assertEqual(["Board"], index.expired(10))
+
+        # The same expiry time again is not listed twice
+        index.update("Board", 1)
+        self.assertEqual(["Board"], index.expired(10))
+
+        index.remove("Board")
+        self.assertEqual([], index.expired(10))
+        index.update("Board", float("inf"))
+        self.assertEqual(0, len(index))
+
+    def test_outdated_entries(self):
+        index = ExpiryIndex()
+        for i in range(1000):
+            index.update("Board", i)
+        self.assertEqual(["Board"], index.expired(1000))
+        # The outdated entries are removed
+        self.assertLess(len(index._ExpiryIndex__heap), 100)
+
+    def test_reset(self):
+        index = ExpiryIndex()
+        index.update("Old", 1)
+        index.reset({
+            "Valid": BoardRecord(10, 0, "x"),
+            "Empty": BoardRecord(1, 0),
+            "Forever": BoardRecord(float("inf"), 0, "x"),
+        })
+        self.assertEqual(["Valid"], index.expired(100))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import unittest
+import time
+from threading import Thread
+from src.group_commit import GroupCommitter, parse_durability
+
+
+class GroupCommitTest(unittest.TestCase):
+    def setUp(self):
+        self.batches = []
+
+    def write_batch(self, items):
+        # Simulate a slow disk so concurrent writes pile up
+        time.sleep(0.01)
+        self.batches.append(items)
+
+    def test_parse_durability(self):
+        self.assertEqual(("always", 0), parse_durability("always"))
+        self.assertEqual(("ms", 100), parse_durability("100ms"))
+        self.assertEqual(("writes", 50), parse_durability("50writes"))
+        self.assertRaises(ValueError, parse_durability, "sometimes")
+        self.assertRaises(ValueError, parse_durability, "0ms")
+
+    def test_always(self):
+        committer = GroupCommitter(self.write_batch, ("always", 0))
+
+        def write(number):
+            committer.wait(committer.append(number))
+            # The write must be on disk when wait returns
+            self.assertIn(number, [item for batch in self.batches for item in batch])
+
+        threads = [Thread(target=write, args=(i,)) for i in range(50)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        committer.close()
+
+        self.assertEqual(list(range(50)), sorted(item for batch in self.batches for item in batch))
+        # Concurrent writes are grouped
+        self.assertLess(len(self.batches), 50)
+
+    def test_every_n_writes(self):
+        committer = GroupCommitter(self.write_batch, ("writes", 3))
+        committer.wait(committer.append(0))
+        committer.wait(committer.append(1))
+        time.sleep(0.1)
+        self.assertEqual([], self.batches)
+
+        committer.append(2)
+        time.sleep(0.1)
+        self.assertEqual([[0, 1, 2]], self.batches)
+
+        # The remaining writes are flushed when closing
+        committer.append(3)
+        committer.close()
+        self.assertEqual([[0, 1, 2], [3]], self.batches)
+
+    def test_max_delay(self):
+        # Fewer than N writes are flushed after the maximum delay
+        committer = GroupCommitter(self.write_batch, ("writes", 3), max_delay=0.1)
+        committer.append(0)
+        time.sleep(0.3)
+        self.assertEqual([[0]], self.batches)
+        committer.append(1)
+        committer.append(2)
+        committer.append(3)
+        time.sleep(0.05)
+        self.assertEqual([[0], [1, 2, 3]], self.batches)
+        committer.close()
+
+    def test_failed_write(self):
+        def write_batch(items):
+            if "fail" in items:
+                raise OSError("Disk full")
+            self.batches.append(items)
+
+        # The writers of a failed batch are not acknowledged
+        committer = GroupCommitter(write_batch, ("always", 0))
+        self.assertTrue(committer.wait(committer.append("first")))
+        self.assertFalse(committer.wait(committer.append("fail")))
+        self.assertTrue(committer.wait(committer.append("second")))
+        committer.close()
+        self.assertEqual([["first"], ["second"]], self.batches)
+
+    def test_every_n_ms(self):
+        committer = GroupCommitter(self.write_batch, ("ms", 50))
+        committer.append(1)
+        committer.append(2)
+        self.assertEqual([], self.batches)
+        time.sleep(0.2)
+        self.assertEqual([[1, 2]], self.batches)
+        committer.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
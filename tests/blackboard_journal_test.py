@@ -0,0 +1,76 @@
+import unittest
+import os
+import tempfile
+from src.journal import Journal, replay_journal
+from src.board_record import BoardRecord
+
+
+class JournalTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, 'boards.journal')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_replay_journal(self):
+        journal = Journal(self.filename)
+        journal.append({"op": "create", "name": "TestBoard", "valid_sec": 1000, "entry_time": 1.0})
+        journal.append({"op": "create", "name": "Deleted", "valid_sec": float("inf"), "entry_time": 1.0})
+        journal.append({"op": "display", "name": "TestBoard", "entry_time": 2.0, "data": "DataString"})
+        journal.append({"op": "delete", "name": "Deleted"})
+        journal.append({"op": "display", "name": "TestBoard", "entry_time": 2.0, "data": "DataString", "version": 7})
+        journal.close()
+
+        boards = replay_journal(self.filename)
+        self.assertEqual({"TestBoard": BoardRecord(1000, 2.0, "DataString", 7)}, boards)
+
+    def test_replay_damaged_journal(self):
+        journal = Journal(self.filename)
+        journal.append({"op": "create", "name": "TestBoard", "valid_sec": 1000, "entry_time": 1.0})
+        journal.append({"op": "delete_all"})
+        journal.append({"op": "restore", "boards": {"Restored": {"valid_sec": 5, "entry_time": 3.0, "data": "x"}}})
+        journal.append({"op": "clear", "name": "Restored"})
+        journal.close()
+
+        # Simulate a crash while writing the last record
+        with open(self.filename, 'a', encoding='UTF8') as file:
+            file.write('{"op":"display","name":"Rest')
+
+        boards = replay_journal(self.filename)
+        self.assertEqual({"Restored": BoardRecord(5, 3.0, None, 1)}, boards)
+
+    def test_append_after_torn_record(self):
+        journal = Journal(self.filename)
+        journal.append({"op": "create", "name": "TestBoard", "valid_sec": 1000, "entry_time": 1.0})
+        journal.close()
+        with open(self.filename, 'a', encoding='UTF8') as file:
+            file.write('{"op":"display","name":"Test' + "x" * 5000)
+
+        # The torn record is removed on open, so the next record starts on its own line
+        journal = Journal(self.filename)
+        journal.append({"op": "display", "name": "TestBoard", "entry_time": 2.0, "data": "DataString", "version": 1})
+        journal.close()
+        boards = replay_journal(self.filename)
+        self.assertEqual({"TestBoard": BoardRecord(1000, 2.0, "DataString", 1)}, boards)
+        with open(self.filename, 'r', encoding='UTF8') as file:
+            self.assertEqual(2, len(file.readlines()))
+
+        # A journal consisting of a torn record only
+        with open(self.filename, 'w', encoding='UTF8') as file:
+            file.write('{"op":"create"')
+        Journal(self.filename).close()
+        self.assertEqual(0, os.path.getsize(self.filename))
+
+    def test_replay_binary_data(self):
+        journal = Journal(self.filename)
+        journal.append({"op": "create", "name": "Binary", "valid_sec": 5, "entry_time": 1.0})
+        journal.append({"op": "display", "name": "Binary", "entry_time": 2.0, "data": b"\x00\n\xff", "version": 1})
+        journal.close()
+
+        boards = replay_journal(self.filename)
+        self.assertEqual({"Binary": BoardRecord(5, 2.0, b"\x00\n\xff", 1)}, boards)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,8 @@
 import unittest
 import os
+import glob
+import gzip
+import threading
 import src.logger as logger
 
 
@@ -10,6 +13,9 @@ class LoggerTest(unittest.TestCase):
 
     @classmethod
     def setUpClass(cls):
+        # Close the log file, it is moved away
+        logger.close_log()
+
         # Remove random backup file
         if os.path.isfile(cls.backup_filename):
             os.remove(cls.backup_filename)
@@ -22,7 +28,6 @@ class LoggerTest(unittest.TestCase):
     @classmethod
     def tearDownClass(cls):
         # Restore Log
-        os.remove(cls.filename)
         if cls.backup_exists:
             os.rename(cls.backup_filename, cls.filename)
 
@@ -31,22 +36,143 @@ class LoggerTest(unittest.TestCase):
         self.assertFalse(fileExists)
 
     def tearDown(self):
+        logger.close_log()
         fileExists = os.path.isfile(self.filename)
         self.assertTrue(fileExists)
+        os.remove(self.filename)
 
     def test_write_in_log(self):
         testitems = ["Hallo", "Welt"]
         logger.write_in_log(testitems)
+        logger.flush_log()
         fileExists = os.path.isfile(self.filename)
         self.assertTrue(fileExists)
 
         fileSize1 = os.path.getsize(self.filename)
 
         logger.write_in_log(testitems)
+        logger.flush_log()
         fileSize2 = os.path.getsize(self.filename)
 
         self.assertTrue(fileSize1 < fileSize2)
 
+    def test_write_header_once(self):
+        for i in range(100):
+            logger.write_in_log(["Hallo", i])
+        logger.close_log()
+        logger.write_in_log(["Welt"])
+        logger.flush_log()
+
+        with open(self.filename, 'r', encoding='UTF8') as file:
+            lines = file.read().splitlines()
+        self.assertEqual(",".join(logger.HEADER), lines[0])
+        self.assertEqual(102, len(lines))
+        self.assertEqual("Welt", lines[-1])
+
+    def test_close_while_writing(self):
+        # Writers which start the writer again while it is closed must not make close_log hang
+        stop = threading.Event()
+
+        def write():
+            while not stop.is_set():
+                logger.write_in_log(["Hallo"])
+
+        writers = [threading.Thread(target=write) for _ in range(4)]
+        for writer in writers:
+            writer.start()
+        try:
+            for _ in range(50):
+                closer = threading.Thread(target=logger.close_log, daemon=True)
+                closer.start()
+                closer.join(10)
+                self.assertFalse(closer.is_alive())
+        finally:
+            stop.set()
+            # Start the writer again for the entries queued after the last close
+            logger.flush_log()
+            for writer in writers:
+                writer.join()
+
+    def test_drop_when_full(self):
+        logger.configure_log(max_queue_size=1, drop_when_full=True)
+        try:
+            dropped = logger.get_dropped_entries()
+            for i in range(1000):
+                logger.write_in_log(["Hallo", i])
+            self.assertGreater(logger.get_dropped_entries(), dropped)
+        finally:
+            logger.configure_log()
+
+    def test_log_filter(self):
+        try:
+            logger.set_log_level("WARNING")
+            self.assertFalse(logger.is_enabled("INFO"))
+            self.assertTrue(logger.is_enabled("ERROR"))
+            logger.write_in_log(["Filtered"], "INFO")
+
+            logger.set_log_level("INFO")
+            logger.set_sampling_rate("exposed_read_blackboard", 0)
+            self.assertFalse(logger.is_enabled("INFO", "exposed_read_blackboard"))
+            # Warnings are never sampled
+            self.assertTrue(logger.is_enabled("WARNING", "exposed_read_blackboard"))
+            self.assertTrue(logger.is_enabled("INFO", "exposed_list_blackboards"))
+            logger.write_in_log(["Written"])
+        finally:
+            logger.set_log_level("INFO")
+            logger.set_sampling_rate("exposed_read_blackboard", 1)
+        logger.flush_log()
+
+        with open(self.filename, 'r', encoding='UTF8') as file:
+            content = file.read()
+        self.assertNotIn("Filtered", content)
+        self.assertIn("Written", content)
+
+    def test_truncation(self):
+        payload = "x" * 1000000
+        self.assertEqual("'" + "x" * 9 + "...", logger.short_repr(payload, 10))
+        self.assertEqual("x" * 10 + "...", logger.short_str(payload, 10))
+        self.assertEqual("(True, 'xx...", logger.short_repr((True, payload, False), 10))
+        self.assertEqual("(True, 'x')", logger.short_repr((True, "x"), 20))
+
+        logger.set_max_length(20)
+        try:
+            logger.write_in_log(["Payload", logger.LazyText(logger.short_repr, (True, payload))])
+            logger.flush_log()
+        finally:
+            logger.set_max_length(1000)
+        self.assertLess(os.path.getsize(self.filename), 200)
+
+    def test_rotation(self):
+        logger.configure_rotation(max_bytes=500)
+        try:
+            for i in range(50):
+                logger.write_in_log(["Hallo", i])
+                # A batch is written before the size is checked again
+                logger.flush_log()
+            logger.close_log()
+        finally:
+            logger.configure_rotation()
+
+        archives = glob.glob("log-*.csv.gz")
+        try:
+            self.assertGreater(len(archives), 0)
+            self.assertEqual([], glob.glob("log-*.csv"))
+            lines = 0
+            for archive in archives + [self.filename]:
+                if archive.endswith(".gz"):
+                    with gzip.open(archive, 'rt', encoding='UTF8') as file:
+                        content = file.read().splitlines()
+                else:
+                    with open(archive, 'r', encoding='UTF8') as file:
+                        content = file.read().splitlines()
+                # Every segment starts with the header
+                self.assertEqual(",".join(logger.HEADER), content[0])
+                lines += len(content) - 1
+            self.assertEqual(50, lines)
+        finally:
+            for archive in archives:
+                os.remove(archive)
+
 
 if __name__ == "__main__":
     unittest.main()
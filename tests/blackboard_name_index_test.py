@@ -0,0 +1,58 @@
+import unittest
+from src.name_index import NameIndex, CHUNK_SIZE
+
+
+class NameIndexTest(unittest.TestCase):
+    def test_add_and_remove(self):
+        index = NameIndex()
+        for name in ("b", "a", "c", "a"):
+            index.add(name)
+        self.assertEqual(3, len(index))
+        self.assertEqual((("a", "b", "c"), None), index.page("", None, 10))
+        index.remove("b")
+        index.remove("x")
+        self.assertEqual((("a", "c"), None), index.page("", None, 10))
+
+    def test_page(self):
+        index = NameIndex()
+        index.reset([f"Board{i:03}" for i in range(250)] + ["Other", "Apple"])
+
+        names = []
+        cursor = None
+        while True:
+            page, cursor = index.page("Board", cursor, 100)
+            names.extend(page)
+            if cursor is None:
+                break
+        self.assertEqual([f"Board{i:03}" for i in range(250)], names)
+
+        self.assertEqual((("Board000", "Board001"), "Board001"), index.page("Board", None, 2))
+        self.assertEqual((("Board249",), None), index.page("Board", "Board248", 2))
+        self.assertEqual(((), None), index.page("Missing", None, 2))
+        # The cursor doesn't need to be an existing name
+        self.assertEqual((("Other",), None), index.page("", "Board5", 10))
+
+    def test_many_chunks(self):
+        index = NameIndex()
+        # Added in reverse order, so every name is inserted at the front and the chunks are split
+        count = 3 * CHUNK_SIZE
+        for i in reversed(range(count)):
+            index.add(f"Board{i:05}")
+        self.assertEqual(count, len(index))
+        for i in range(0, count, 2):
+            index.remove(f"Board{i:05}")
+        self.assertEqual(count // 2, len(index))
+
+        names = []
+        cursor = None
+        while True:
+            page, cursor = index.page("Board", cursor, 333)
+            names.extend(page)
+            if cursor is None:
+                break
+        self.assertEqual([f"Board{i:05}" for i in range(1, count, 2)], names)
+        self.assertEqual((("Board00003",), "Board00003"), index.page("", "Board00001", 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
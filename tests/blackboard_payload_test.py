@@ -0,0 +1,62 @@
+import unittest
+import io
+import src.payload as payload
+
+
+class PayloadTest(unittest.TestCase):
+    def test_normalize_data(self):
+        data = b"\x00\x01binary\xff"
+        self.assertIs(data, payload.normalize_data(data))
+        self.assertEqual(data, payload.normalize_data(bytearray(data)))
+        self.assertEqual(data, payload.normalize_data(memoryview(data)))
+        self.assertEqual("123", payload.normalize_data(123))
+
+    def test_payload_size(self):
+        self.assertEqual(0, payload.payload_size(None))
+        self.assertEqual(4, payload.payload_size(b"\x00\x01\x02\x03"))
+        self.assertEqual(5, payload.payload_size("Hello"))
+        self.assertEqual(2, payload.payload_size("ä"))
+
+    def test_json_roundtrip(self):
+        boards = {"Binary": {"valid_sec": 5, "entry_time": 1.0, "data": b"\x00\xff" * 10},
+                  "Text": {"valid_sec": 5, "entry_time": 1.0, "data": "Text"}}
+        text = payload.dumps(boards)
+        self.assertIn('"__bytes__"', text)
+        self.assertEqual(boards, payload.loads(text))
+
+        file = io.StringIO()
+        payload.dump(boards, file, sort_keys=True, indent=4)
+        file.seek(0)
+        self.assertEqual(boards, payload.load(file))
+
+        # Objects which only look similar are kept
+        self.assertEqual({"__bytes__": 1}, payload.loads('{"__bytes__": 1}'))
+        with self.assertRaises(ValueError):
+            payload.loads('{"__bytes__": "no base64!"}')
+
+    def test_compress_data(self):
+        text = "Compressible text " * 100
+        compressed = payload.compress_data(text, 100)
+        self.assertIsInstance(compressed, payload.CompressedData)
+        self.assertEqual(text, payload.decompress_data(compressed))
+        self.assertEqual((len(text), len(compressed.compressed)), payload.stored_size(compressed))
+
+        data = b"\x00" * 1000
+        self.assertEqual(data, payload.decompress_data(payload.compress_data(data, 100)))
+
+        # Small, incompressible or disabled
+        self.assertIs(text, payload.compress_data(text, None))
+        self.assertIs(text, payload.compress_data(text, len(text)))
+        random = bytes(range(256))
+        self.assertIs(random, payload.compress_data(random, 10))
+        self.assertIsNone(payload.compress_data(None, 10))
+
+        # Persisted as tagged base64 string
+        boards = {"Compressed": {"valid_sec": 5, "entry_time": 1.0, "data": compressed}}
+        text = payload.dumps(boards)
+        self.assertIn('"__zlib__"', text)
+        self.assertEqual(boards, payload.loads(text))
+
+
+if __name__ == "__main__":
+    unittest.main()
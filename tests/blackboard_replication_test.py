@@ -0,0 +1,168 @@
+import unittest
+import os
+import sys
+import time
+import signal
+import tempfile
+import subprocess
+import rpyc
+from operator import itemgetter
+from src.replication import ReplicationLog, Replicator
+
+SERVER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "blackboard_server.py")
+
+
+class ReplicationLogTest(unittest.TestCase):
+    def test_since(self):
+        log = ReplicationLog(max_records=3)
+        self.assertEqual((0, ()), itemgetter(0, 2)(log.since(0, 0)))
+        log.append(({"op": "delete_all"}, {"op": "delete", "name": "a"}))
+        self.assertEqual(2, log.get_sequence())
+        self.assertEqual((2, ({"op": "delete", "name": "a"},), 2), itemgetter(0, 2, 3)(log.since(1, 0)))
+
+        # Too far behind or unknown sequence number: a snapshot is needed
+        log.append(({"op": "delete", "name": "b"}, {"op": "delete", "name": "c"}))
+        self.assertIsNone(log.since(0, 0))
+        self.assertIsNone(log.since(10, 0))
+        self.assertEqual(4, log.since(1, 0)[0])
+
+    def test_wait(self):
+        log = ReplicationLog()
+        start = time.time()
+        self.assertEqual((0, ()), itemgetter(0, 2)(log.since(0, 0.2)))
+        self.assertGreaterEqual(time.time() - start, 0.2)
+
+    def test_max_batch(self):
+        log = ReplicationLog(max_batch=2)
+        log.append(({"op": "delete", "name": "a"},))
+        time.sleep(0.05)
+        log.append(({"op": "delete", "name": "b"}, {"op": "delete", "name": "c"}))
+        start = time.time()
+
+        # The primary has more records than one response contains
+        last_sequence, last_time, records, head_sequence, head_time = log.since(0, 0)
+        self.assertEqual((2, 3), (last_sequence, head_sequence))
+        self.assertEqual(({"op": "delete", "name": "a"}, {"op": "delete", "name": "b"}), records)
+        self.assertEqual((head_time, head_time), (last_time, log.get_head()[1]))
+        self.assertEqual((3, ({"op": "delete", "name": "c"},), 3), itemgetter(0, 2, 3)(log.since(2, 0)))
+
+        # The replica reports the records it has not fetched and the age of the last applied one
+        replicator = Replicator("localhost", 0, lambda records: None, lambda boards: None)
+        replicator._Replicator__apply((True, log.id, 1, False, "[]", start - 10, 3, ""))
+        connected, applied, primary_sequence, records_behind, lag = replicator.get_status()
+        self.assertEqual((True, 1, 3, 2), (connected, applied, primary_sequence, records_behind))
+        self.assertGreaterEqual(lag, 10)
+        replicator._Replicator__apply((True, log.id, 3, False, "[]", head_time, 3, ""))
+        self.assertEqual((True, 3, 3, 0, 0.0), replicator.get_status())
+
+
+class ReplicationTest(unittest.TestCase):
+    primary_port = 18895
+    replica_port = 18896
+
+    def setUp(self):
+        self.directories = [tempfile.TemporaryDirectory(), tempfile.TemporaryDirectory()]
+        self.processes = [
+            self.start_server(self.directories[0].name, "-p", str(self.primary_port), "--primary"),
+            self.start_server(self.directories[1].name, "-p", str(self.replica_port), "-s", "journal",
+                              "--replica-of", f"localhost:{self.primary_port}"),
+        ]
+        self.primary = self.connect(self.primary_port)
+        self.replica = self.connect(self.replica_port)
+
+    def tearDown(self):
+        self.primary.close()
+        self.replica.close()
+        for process in self.processes:
+            if process.poll() is None:
+                process.send_signal(signal.SIGINT)
+                process.wait(30)
+        for directory in self.directories:
+            directory.cleanup()
+
+    def test_replication(self):
+        self.assertTrue(self.primary.root.create_blackboard("TestBoard", 1000)[0])
+        self.assertTrue(self.primary.root.display_blackboard("TestBoard", "DataString")[0])
+        self.wait_for(lambda: self.replica.root.read_blackboard("TestBoard")[0])
+        result = self.replica.root.read_blackboard("TestBoard")
+        self.assertEqual("DataString", result[1])
+        self.assertEqual(["TestBoard"], list(self.replica.root.list_blackboards()[1]))
+        self.assertFalse(self.replica.root.get_blackboard_status("TestBoard")[1])
+
+        # Replicas are read-only
+        result = self.replica.root.display_blackboard("TestBoard", "Other")
+        self.assertFalse(result[0])
+        self.assertEqual("[ERROR] This server is a read-only replica! Please send changes to the primary.",
+                         result[1])
+
+        status = self.replica.root.get_replication_status()
+        self.assertEqual("replica", status[1])
+        self.assertEqual(self.primary.root.get_replication_status()[2], status[3])
+
+        # Deleting all Boards is replicated as well
+        self.assertTrue(self.primary.root.delete_all_blackboards()[0])
+        self.wait_for(lambda: not self.replica.root.read_blackboard("TestBoard")[0])
+
+    def test_promote(self):
+        self.assertTrue(self.primary.root.create_blackboard("TestBoard", 1000)[0])
+        self.wait_for(lambda: self.replica.root.read_blackboard("TestBoard")[0])
+
+        # The primary fails, the lag of the replica grows
+        self.processes[0].kill()
+        self.processes[0].wait()
+        self.wait_for(lambda: self.replica.root.get_replication_status()[4] > 0)
+
+        # The replica takes over with its Boards
+        self.assertTrue(self.replica.root.promote_to_primary()[0])
+        self.assertEqual("primary", self.replica.root.get_replication_status()[1])
+        self.assertTrue(self.replica.root.display_blackboard("TestBoard", "DataString")[0])
+        self.assertEqual("DataString", self.replica.root.read_blackboard("TestBoard")[1])
+
+    def test_promote_keeps_versions_increasing(self):
+        # The primary deletes and recreates a Board, the replica sees every version
+        self.assertTrue(self.primary.root.create_blackboard("Versioned", 1000)[0])
+        self.assertTrue(self.primary.root.display_blackboard("Versioned", "Old")[0])
+        seen = self.primary.root.read_blackboard_versioned("Versioned")[3]
+        self.assertTrue(self.primary.root.delete_blackboard("Versioned")[0])
+        self.assertTrue(self.primary.root.create_blackboard("Versioned", 1000)[0])
+        self.assertTrue(self.primary.root.display_blackboard("Versioned", "New")[0])
+        seen = max(seen, self.primary.root.read_blackboard_versioned("Versioned")[3])
+        self.wait_for(lambda: self.replica.root.read_blackboard("Versioned")[1] == "New")
+
+        self.processes[0].kill()
+        self.processes[0].wait()
+        self.assertTrue(self.replica.root.promote_to_primary()[0])
+
+        # Writes of the promoted replica continue after every version of the old primary
+        result = self.replica.root.compare_and_set_blackboard("Versioned", seen, "Promoted")
+        self.assertTrue(result[0])
+        self.assertGreater(result[1], seen)
+        self.assertTrue(self.replica.root.delete_blackboard("Versioned")[0])
+        self.assertTrue(self.replica.root.create_blackboard("Versioned", 1000)[0])
+        self.assertGreater(self.replica.root.read_blackboard_versioned("Versioned")[3], result[1])
+
+    @staticmethod
+    def start_server(directory, *args):
+        return subprocess.Popen([sys.executable, SERVER, "--log-level", "OFF", *args], cwd=directory,
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    @staticmethod
+    def connect(port):
+        deadline = time.time() + 20
+        while True:
+            try:
+                return rpyc.connect("localhost", port)
+            except OSError:
+                if time.time() > deadline:
+                    raise
+                time.sleep(0.1)
+
+    def wait_for(self, condition, timeout=10):
+        deadline = time.time() + timeout
+        while not condition():
+            self.assertLess(time.time(), deadline)
+            time.sleep(0.05)
+
+
+if __name__ == "__main__":
+    unittest.main()
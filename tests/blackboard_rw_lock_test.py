@@ -0,0 +1,59 @@
+import unittest
+import time
+from threading import Thread, Barrier
+from src.rw_lock import ReadWriteLock
+from src.lock_timeout import lock_timeout
+
+
+class ReadWriteLockTest(unittest.TestCase):
+    def setUp(self):
+        self.lock = ReadWriteLock()
+
+    def test_shared_readers(self):
+        readers = 5
+        barrier = Barrier(readers, timeout=2)
+        results = []
+
+        def read():
+            with lock_timeout(self.lock.read, 1) as acquired:
+                # All readers have to hold the lock at the same time to pass the barrier
+                barrier.wait()
+                results.append(acquired)
+
+        threads = [Thread(target=read) for _ in range(readers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual([True] * readers, results)
+
+    def test_exclusive_writer(self):
+        with lock_timeout(self.lock.write, 1) as acquired:
+            self.assertTrue(acquired)
+            self.assertFalse(self.lock.acquire_read(timeout=0.1))
+            self.assertFalse(self.lock.acquire_write(timeout=0.1))
+
+        with lock_timeout(self.lock.read, 1) as acquired:
+            self.assertTrue(acquired)
+            self.assertFalse(self.lock.acquire_write(timeout=0.1))
+            # The writer gave up, so readers are not blocked anymore
+            self.assertTrue(self.lock.acquire_read(blocking=False))
+            self.lock.release_read()
+
+    def test_writer_preferred(self):
+        self.lock.acquire_read()
+        writer = Thread(target=self.lock.acquire_write, kwargs={"timeout": 5})
+        writer.start()
+        time.sleep(0.1)
+
+        # A waiting writer blocks new readers
+        self.assertFalse(self.lock.acquire_read(timeout=0.1))
+        self.lock.release_read()
+        writer.join()
+        self.assertFalse(self.lock.acquire_read(blocking=False))
+        self.lock.release_write()
+        self.assertTrue(self.lock.acquire_read(blocking=False))
+
+
+if __name__ == "__main__":
+    unittest.main()
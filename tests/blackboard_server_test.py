@@ -1,7 +1,11 @@
 import unittest
 from blackboard_server import BlackBoardHost
+import src.logger as logger
+from src.lock_timeout import lock_timeout
 import time
 import os
+from queue import Queue, Empty
+from threading import Thread
 
 
 class ServerTest(unittest.TestCase):
@@ -11,6 +15,9 @@ class ServerTest(unittest.TestCase):
 
     @classmethod
     def setUpClass(cls):
+        # Close the log file, it is moved away
+        logger.close_log()
+
         # Remove random backup file
         if os.path.isfile(cls.backup_filename):
             os.remove(cls.backup_filename)
@@ -23,6 +30,7 @@ class ServerTest(unittest.TestCase):
     @classmethod
     def tearDownClass(cls):
         # Restore Log
+        logger.close_log()
         os.remove(cls.filename)
         if cls.backup_exists:
             os.rename(cls.backup_filename, cls.filename)
@@ -200,6 +208,320 @@ class ServerTest(unittest.TestCase):
         self.assertFalse(result[0])
         self.assertEqual("[ERROR] Board does not exist!", result[1])
 
+    def test_batch_methods(self):
+        self.host.exposed_create_blackboard("TestBoard", 1000)
+        self.host.exposed_create_blackboard("AnotherTestBoard", 1000)
+
+        result = self.host.exposed_display_blackboards((("TestBoard", "DataString"), ("AnotherTestBoard", 42)))
+        self.assertTrue(result[0])
+        self.assertEqual("[INFO] Successfully updated 2 Boards!", result[2])
+
+        result = self.host.exposed_display_blackboards({"TestBoard": "NewData", "NotExistingBlackboard": "Data"})
+        self.assertEqual((False, "[ERROR] Board does not exist!"), dict(result[1])["NotExistingBlackboard"])
+        self.assertEqual("[WARNING] Only updated 1 of 2 Boards! See the single results.", result[2])
+
+        result = self.host.exposed_read_blackboards(("TestBoard", "AnotherTestBoard", "NotExistingBlackboard"))
+        self.assertTrue(result[0])
+        self.assertEqual(("TestBoard", self.host.exposed_read_blackboard("TestBoard")), result[1][0])
+        self.assertEqual("42", result[1][1][1][1])
+        self.assertFalse(result[1][2][1][0])
+
+        result = self.host.exposed_get_blackboard_statuses(("TestBoard",))
+        self.assertEqual(("TestBoard", self.host.exposed_get_blackboard_status("TestBoard")), result[1][0])
+        self.assertEqual("[INFO] Successfully read 1 Boards!", result[2])
+
+    def test_subscribe(self):
+        self.host.exposed_create_blackboard("TestBoard", 1000)
+        notifications = Queue()
+
+        result = self.host.exposed_subscribe("TestBoard", lambda *args: notifications.put(args))
+        self.assertTrue(result[0])
+        subscription_id = result[1]
+        self.assertFalse(self.host.exposed_subscribe("NotExistingBlackboard", print)[0])
+
+        self.host.exposed_display_blackboard("TestBoard", "DataString")
+        self.host.exposed_clear_blackboard("TestBoard")
+        self.assertEqual(("TestBoard", "updated", "DataString"), notifications.get(timeout=1)[:3])
+        self.assertEqual(("TestBoard", "cleared", None), notifications.get(timeout=1)[:3])
+
+        self.assertTrue(self.host.exposed_unsubscribe(subscription_id)[0])
+        self.assertFalse(self.host.exposed_unsubscribe(subscription_id)[0])
+        self.host.exposed_display_blackboard("TestBoard", "DataString")
+        self.assertRaises(Empty, notifications.get, timeout=0.1)
+
+        # A slow subscriber (another client) doesn't block the writer or the other subscribers
+        slow_host = BlackBoardHost()
+        slow_host._BlackBoardHost__client_address = ('123.123.123.124', 52322)
+        slow_host.exposed_subscribe("TestBoard", lambda *args: time.sleep(1))
+        self.host.exposed_subscribe("TestBoard", lambda *args: notifications.put(args))
+        start = time.time()
+        self.host.exposed_display_blackboard("TestBoard", "DataString")
+        self.host.exposed_delete_blackboard("TestBoard")
+        self.assertLess(time.time() - start, 0.5)
+        self.assertEqual("updated", notifications.get(timeout=1)[1])
+        self.assertEqual("deleted", notifications.get(timeout=1)[1])
+
+    def test_read_blackboard_if_newer(self):
+        self.host.exposed_create_blackboard("TestBoard", 1000)
+        self.host.exposed_display_blackboard("TestBoard", "DataString")
+        entry_time = self.host.exposed_get_blackboard_status("TestBoard")[2]
+
+        # Already newer
+        result = self.host.exposed_read_blackboard_if_newer("TestBoard", entry_time - 1, 5)
+        self.assertEqual((True, True, "DataString", True, entry_time), result[:5])
+
+        # Not modified within the timeout
+        start = time.time()
+        result = self.host.exposed_read_blackboard_if_newer("TestBoard", entry_time, 0.2)
+        self.assertGreaterEqual(time.time() - start, 0.2)
+        self.assertEqual((True, False, None, True, entry_time), result[:5])
+        self.assertEqual("[INFO] Board not modified since the given entry time!", result[5])
+
+        # Woken up by a change
+        Thread(target=lambda: (time.sleep(0.2), self.host.exposed_display_blackboard("TestBoard", "NewData"))).start()
+        start = time.time()
+        result = self.host.exposed_read_blackboard_if_newer("TestBoard", entry_time, 5)
+        self.assertLess(time.time() - start, 2)
+        self.assertEqual((True, True, "NewData"), result[:3])
+
+        result = self.host.exposed_read_blackboard_if_newer("NotExistingBlackboard", 0, 5)
+        self.assertEqual((False, "[ERROR] Board does not exist!"), result)
+
+    def test_per_board_locking(self):
+        stripe_lock = BlackBoardHost._BlackBoardHost__stripe_lock
+        # Find a Board in another stripe (string hashes differ between runs)
+        other = next(f"OtherBoard{i}" for i in range(1000)
+                     if stripe_lock(f"OtherBoard{i}") is not stripe_lock("TestBoard"))
+        self.host.exposed_create_blackboard("TestBoard", 1000)
+        self.host.exposed_create_blackboard(other, 1000)
+
+        # A held lock of one Board must not block a Board in another stripe
+        with lock_timeout(stripe_lock("TestBoard").write, 1):
+            start = time.time()
+            result = self.host.exposed_display_blackboard(other, "DataString")
+            self.assertTrue(result[0])
+            result = self.host.exposed_read_blackboard(other)
+            self.assertEqual("DataString", result[1])
+            self.assertLess(time.time() - start, 1)
+
+    def test_copy_on_write(self):
+        BlackBoardHost.set_copy_on_write(True)
+        try:
+            self.host.exposed_create_blackboard("TestBoard", 1000)
+            self.host.exposed_display_blackboard("TestBoard", "DataString")
+            snapshot = BlackBoardHost._BlackBoardHost__boards
+
+            # Reads need no lock in copy-on-write mode
+            with lock_timeout(BlackBoardHost._BlackBoardHost__stripe_lock("TestBoard").write, 1):
+                result = self.host.exposed_read_blackboard("TestBoard")
+                self.assertEqual("DataString", result[1])
+                result = self.host.exposed_get_blackboard_status("TestBoard")
+                self.assertFalse(result[1])
+
+            # Writers publish a new version, the old snapshot stays unchanged
+            self.host.exposed_display_blackboard("TestBoard", "NewData")
+            self.host.exposed_delete_all_blackboards()
+            self.assertEqual("DataString", snapshot["TestBoard"].data)
+            self.assertFalse(self.host.exposed_read_blackboard("TestBoard")[0])
+        finally:
+            BlackBoardHost.set_copy_on_write(False)
+
+    def test_admission_control(self):
+        BlackBoardHost.set_admission(1, 0)
+        try:
+            self.host.exposed_create_blackboard("TestBoard", 1000)
+            # Occupy the only slot
+            with BlackBoardHost._BlackBoardHost__admission.admit():
+                start = time.time()
+                result = self.host.exposed_read_blackboard("TestBoard")
+                self.assertFalse(result[0])
+                self.assertEqual("[OVERLOAD] The server is overloaded. Request rejected. Try again later.", result[1])
+                self.assertLess(time.time() - start, 1)
+            self.assertTrue(self.host.exposed_read_blackboard("TestBoard")[0])
+            # Keyword arguments are passed through the decorators
+            self.assertTrue(self.host.exposed_display_blackboard(name="TestBoard", data="DataString")[0])
+            self.assertEqual("DataString", self.host.exposed_read_blackboard(name="TestBoard")[1])
+        finally:
+            BlackBoardHost.set_admission(0)
+
+    def test_list_expired_blackboards(self):
+        self.host.exposed_create_blackboard("Expired", 0.1)
+        self.host.exposed_create_blackboard("Valid", 1000)
+        self.host.exposed_create_blackboard("Empty", 0.1)
+        self.host.exposed_display_blackboard("Expired", "DataString")
+        self.host.exposed_display_blackboard("Valid", "DataString")
+        self.assertEqual((), self.host.exposed_list_expired_blackboards()[1])
+        time.sleep(0.2)
+        self.assertEqual(("Expired",), self.host.exposed_list_expired_blackboards()[1])
+
+        # Updated Boards are valid again, cleared Boards are not listed
+        self.host.exposed_display_blackboard("Expired", "DataString")
+        self.assertEqual((), self.host.exposed_list_expired_blackboards()[1])
+        time.sleep(0.2)
+        self.host.exposed_clear_blackboard("Expired")
+        self.assertEqual((), self.host.exposed_list_expired_blackboards()[1])
+
+    def test_sweeper(self):
+        for policy in ("clear", "evict"):
+            self.host.exposed_create_blackboard("Expired", 0.1)
+            self.host.exposed_display_blackboard("Expired", "DataString")
+            BlackBoardHost.start_sweeper(policy, 0.05)
+            try:
+                time.sleep(0.5)
+            finally:
+                BlackBoardHost.stop_sweeper()
+            result = self.host.exposed_read_blackboard("Expired")
+            if policy == "clear":
+                self.assertEqual((True, None, False, "[WARNING] Successfully read but data is empty!"), result)
+                self.host.exposed_delete_blackboard("Expired")
+            else:
+                self.assertFalse(result[0])
+
+    def test_list_blackboards_page(self):
+        for i in range(25):
+            self.host.exposed_create_blackboard(f"Page{i:02}", 1000)
+        self.host.exposed_create_blackboard("Other", 1000)
+        self.host.exposed_delete_blackboard("Page03")
+
+        names = []
+        cursor = None
+        while True:
+            result = self.host.exposed_list_blackboards_page("Page", cursor, 10)
+            self.assertTrue(result[0])
+            names.extend(result[1])
+            cursor = result[2]
+            if cursor is None:
+                break
+        self.assertEqual([f"Page{i:02}" for i in range(25) if i != 3], names)
+
+        result = self.host.exposed_list_blackboards_page("", None, 0)
+        self.assertFalse(result[0])
+        self.assertEqual("[ERROR] The limit must be greater than 0! Given value: 0.", result[1])
+
+        self.host.exposed_delete_all_blackboards()
+        self.assertEqual((True, (), None, "[INFO] Successfully read the last 0 Board names!"),
+                         self.host.exposed_list_blackboards_page())
+
+    def test_compare_and_set(self):
+        self.host.exposed_create_blackboard("Versioned", 1000)
+        result = self.host.exposed_read_blackboard_versioned("Versioned")
+        self.assertEqual((True, None, False, "[WARNING] Successfully read but data is empty!"), result[:3] + result[4:])
+        created = result[3]
+
+        result = self.host.exposed_compare_and_set_blackboard("Versioned", created, "First")
+        self.assertEqual((True, "[INFO] Board successfully updated!"), result[::2])
+        self.assertGreater(result[1], created)
+        self.host.exposed_display_blackboard("Versioned", "Second")
+        _, data, is_valid, second, message = self.host.exposed_read_blackboard_versioned("Versioned")
+        self.assertEqual(("Second", True, "[INFO] Successfully read with valid data!"), (data, is_valid, message))
+        self.assertGreater(second, result[1])
+
+        # Stale version
+        self.assertEqual((False, second, "[WARNING] Board not updated, it was changed in between! Version conflict."),
+                         self.host.exposed_compare_and_set_blackboard("Versioned", result[1], "Lost"))
+        self.assertEqual("Second", self.host.exposed_read_blackboard("Versioned")[1])
+
+        self.host.exposed_clear_blackboard("Versioned")
+        cleared = self.host.exposed_read_blackboard_versioned("Versioned")[3]
+        self.assertTrue(self.host.exposed_compare_and_set_blackboard("Versioned", str(cleared), "Third")[0])
+
+        # A recreated Board doesn't get a version again which a client may still hold (ABA)
+        self.host.exposed_delete_blackboard("Versioned")
+        self.host.exposed_create_blackboard("Versioned", 1000)
+        self.assertGreater(self.host.exposed_read_blackboard_versioned("Versioned")[3], cleared + 1)
+        self.assertFalse(self.host.exposed_compare_and_set_blackboard("Versioned", created, "Stale")[0])
+
+        self.assertEqual((False, "[ERROR] Invalid parameters! Please give the version as Int!"),
+                         self.host.exposed_compare_and_set_blackboard("Versioned", "x", "Data"))
+        self.assertEqual((False, "[ERROR] Invalid parameters! Please give the version as Int!"),
+                         self.host.exposed_compare_and_set_blackboard("Versioned", None, "Data"))
+        self.assertEqual((False, "[ERROR] Board does not exist!"),
+                         self.host.exposed_compare_and_set_blackboard("Missing", 0, "Data"))
+        self.assertEqual((False, "[ERROR] Board does not exist!"),
+                         self.host.exposed_read_blackboard_versioned("Missing"))
+
+    def test_replicated_versions(self):
+        # Versions given by a primary are never given out again by this server
+        version = 10 ** 17
+        BlackBoardHost._BlackBoardHost__apply_replicated((
+            {"op": "create", "name": "Replicated", "valid_sec": 1000, "entry_time": 1.0, "version": version},
+            {"op": "delete", "name": "Replicated"}))
+        self.host.exposed_create_blackboard("Replicated", 1000)
+        self.assertGreater(self.host.exposed_read_blackboard_versioned("Replicated")[3], version)
+
+    def test_compare_and_set_concurrent(self):
+        self.host.exposed_create_blackboard("Counter", 1000)
+        self.host.exposed_display_blackboard("Counter", "0")
+
+        def increment():
+            host = BlackBoardHost()
+            host._BlackBoardHost__client_address = ('123.123.123.123', 52321)
+            for _ in range(20):
+                while True:
+                    _, data, _, version, _ = host.exposed_read_blackboard_versioned("Counter")
+                    if host.exposed_compare_and_set_blackboard("Counter", version, str(int(data) + 1))[0]:
+                        break
+
+        threads = [Thread(target=increment) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual("80", self.host.exposed_read_blackboard("Counter")[1])
+
+    def test_binary_payload(self):
+        data = bytes(range(256)) * 4
+        self.host.exposed_create_blackboard("Binary", 1000)
+        self.assertEqual((True, "[INFO] Board successfully updated!"),
+                         self.host.exposed_display_blackboard("Binary", data))
+        result = self.host.exposed_read_blackboard("Binary")
+        self.assertIs(data, result[1])
+
+        self.assertTrue(self.host.exposed_display_blackboards((("Binary", bytearray(b"\x00\x01")),))[0])
+        self.assertEqual(b"\x00\x01", self.host.exposed_read_blackboard("Binary")[1])
+
+    def test_max_payload_size(self):
+        self.host.exposed_create_blackboard("Limited", 1000)
+        BlackBoardHost.set_max_payload_size(4)
+        try:
+            message = "[ERROR] Data too large! The maximum payload size is 4 bytes."
+            self.assertEqual((True, "[INFO] Board successfully updated!"),
+                             self.host.exposed_display_blackboard("Limited", b"1234"))
+            self.assertEqual((False, message), self.host.exposed_display_blackboard("Limited", b"12345"))
+            self.assertEqual((False, message), self.host.exposed_display_blackboard("Limited", "\u00e4\u00e4\u00e4"))
+            self.assertEqual((False, message), self.host.exposed_compare_and_set_blackboard("Limited", 1, "12345"))
+            self.assertEqual(("Limited", (False, message)),
+                             self.host.exposed_display_blackboards((("Limited", "12345"),))[1][0])
+            self.assertEqual(b"1234", self.host.exposed_read_blackboard("Limited")[1])
+        finally:
+            BlackBoardHost.set_max_payload_size(None)
+
+    def test_compression(self):
+        text = "Compressible text " * 100
+        data = b"\x00" * 1000
+        self.host.exposed_create_blackboard("Text", 1000)
+        self.host.exposed_create_blackboard("Binary", 1000)
+        self.host.exposed_create_blackboard("Small", 1000)
+        BlackBoardHost.set_compression_threshold(100)
+        try:
+            self.host.exposed_display_blackboard("Text", text)
+            self.host.exposed_display_blackboards((("Binary", data), ("Small", "small")))
+        finally:
+            BlackBoardHost.set_compression_threshold(None)
+
+        boards = self.host._BlackBoardHost__boards
+        self.assertLess(len(boards["Text"].data.compressed), len(text))
+        self.assertEqual("small", boards["Small"].data)
+        self.assertEqual(text, self.host.exposed_read_blackboard("Text")[1])
+        self.assertEqual(data, self.host.exposed_read_blackboards(("Binary",))[1][0][1][1])
+
+        result = self.host.exposed_get_compression_stats()
+        self.assertTrue(result[0])
+        self.assertEqual(2, result[1])
+        self.assertEqual(len(text) + len(data) + len("small"), result[2])
+        self.assertEqual(result[2] - result[3], result[4])
+        self.assertGreater(result[5], 10)
+
     def test_log_call(self):
         pass
 
@@ -0,0 +1,89 @@
+import unittest
+import os
+import sys
+import time
+import signal
+import tempfile
+import subprocess
+import rpyc
+from src.shard_router import shard_index
+
+SERVER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "blackboard_server.py")
+
+
+class ShardRouterTest(unittest.TestCase):
+    port = 18890
+
+    def test_shard_index(self):
+        # Stable across processes (unlike hash)
+        self.assertEqual(shard_index("TestBoard", 4), shard_index("TestBoard", 4))
+        indices = {shard_index(f"Board{i}", 4) for i in range(100)}
+        self.assertEqual({0, 1, 2, 3}, indices)
+
+    def test_sharded_server(self):
+        with tempfile.TemporaryDirectory() as directory:
+            process = subprocess.Popen([sys.executable, SERVER, "-p", str(self.port), "--shards", "2",
+                                        "--log-level", "OFF"], cwd=directory,
+                                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            try:
+                connection = self.connect()
+                names = [f"Board{i}" for i in range(10)]
+                for name in names:
+                    self.assertTrue(connection.root.create_blackboard(name, 1000)[0])
+                self.assertTrue(connection.root.display_blackboard("Board1", "DataString")[0])
+                self.assertEqual("DataString", connection.root.read_blackboard("Board1")[1])
+
+                # Batches are split by shard and merged in the original order
+                result = connection.root.read_blackboards(("Board3", "Board1", "Missing"))
+                self.assertEqual(("Board3", "Board1", "Missing"), tuple(name for name, _ in result[1]))
+                self.assertEqual("DataString", result[1][1][1][1])
+                self.assertFalse(result[1][2][1][0])
+
+                # Listing fans out to every shard
+                self.assertEqual(sorted(names), sorted(connection.root.list_blackboards()[1]))
+                result = connection.root.list_blackboards_page("Board", None, 4)
+                self.assertEqual(tuple(sorted(names)[:4]), result[1])
+                result = connection.root.list_blackboards_page("Board", result[2], 100)
+                self.assertEqual(tuple(sorted(names)[4:]), result[1])
+                self.assertIsNone(result[2])
+
+                # The expired Boards of every shard are merged
+                expired = [f"Expired{i}" for i in range(6)]
+                for name in expired:
+                    self.assertTrue(connection.root.create_blackboard(name, 0.1)[0])
+                    self.assertTrue(connection.root.display_blackboard(name, "DataString")[0])
+                self.assertEqual({0, 1}, {shard_index(name, 2) for name in expired})
+                time.sleep(0.2)
+                result = connection.root.list_expired_blackboards()
+                self.assertTrue(result[0])
+                self.assertEqual(sorted(expired), sorted(result[1]))
+                self.assertEqual((False, "[ERROR] Invalid parameters! Please give the subscription id as Int!"),
+                                 tuple(connection.root.unsubscribe("x")))
+                self.assertEqual((False, "[ERROR] Invalid parameters! Please give the subscription id as Int!"),
+                                 tuple(connection.root.unsubscribe(None)))
+                self.assertTrue(connection.root.delete_all_blackboards()[0])
+                self.assertEqual((True, (), "[INFO] No expired Boards found!"),
+                                 tuple(connection.root.list_expired_blackboards()))
+                self.assertEqual([], list(connection.root.list_blackboards()[1]))
+                connection.close()
+            finally:
+                process.send_signal(signal.SIGINT)
+                process.wait(30)
+
+            # Every shard has its own persistence file
+            self.assertTrue(os.path.isfile(os.path.join(directory, "boards-shard0.json")))
+            self.assertTrue(os.path.isfile(os.path.join(directory, "boards-shard1.json")))
+
+    def connect(self):
+        deadline = time.time() + 20
+        while True:
+            try:
+                return rpyc.connect("localhost", self.port)
+            except OSError:
+                if time.time() > deadline:
+                    raise
+                time.sleep(0.1)
+
+
+if __name__ == "__main__":
+    unittest.main()
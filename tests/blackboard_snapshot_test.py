@@ -0,0 +1,115 @@
+import unittest
+import os
+import tempfile
+import src.logger as logger
+from blackboard_server import BlackBoardHost
+from src.board_record import BoardRecord
+from src.payload import CompressedData, compress_data
+from src.journal import read_checkpoint
+from src.snapshot import write_snapshot, read_snapshot
+
+
+class SnapshotTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'boards')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_write_read_snapshot(self):
+        compressed = compress_data("Compressible " * 100, 10)
+        self.assertIsInstance(compressed, CompressedData)
+        boards = {"Text": BoardRecord(10, 1.0, "Text", 3), "Binary": BoardRecord(float("inf"), 2.0, b"\x00\xff"),
+                  "Empty": BoardRecord(5, 3.0), "Compressed": BoardRecord(5, 4.0, compressed, 1)}
+        write_snapshot(self.path + '.snapshot', "id", boards)
+        self.assertEqual(("id", boards), read_snapshot(self.path + '.snapshot'))
+        self.assertFalse(os.path.exists(self.path + '.snapshot.tmp'))
+
+        with open(self.path + '.json', 'w') as file:
+            file.write("{}")
+        with self.assertRaises(ValueError):
+            read_snapshot(self.path + '.json')
+
+
+class CompactionTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'boards')
+        logger.set_log_level("OFF")
+        BlackBoardHost.set_storage("journal")
+        BlackBoardHost.set_storage_path(self.path)
+        BlackBoardHost.set_snapshot_records(0)
+        BlackBoardHost.load_boards()
+        self.host = BlackBoardHost()
+        self.host._BlackBoardHost__client_address = ('123.123.123.123', 52321)
+
+    def tearDown(self):
+        self.host.exposed_delete_all_blackboards()
+        BlackBoardHost.close_storage()
+        BlackBoardHost.set_storage("json")
+        BlackBoardHost.set_storage_path("boards")
+        BlackBoardHost.set_snapshot_records(100000)
+        logger.set_log_level("INFO")
+        self.directory.cleanup()
+
+    def reload(self) -> dict:
+        boards = dict(BlackBoardHost._BlackBoardHost__boards)
+        BlackBoardHost.close_storage()
+        BlackBoardHost._BlackBoardHost__boards = {}
+        BlackBoardHost.load_boards()
+        return boards
+
+    def test_compact_journal(self):
+        for i in range(20):
+            self.host.exposed_create_blackboard(f"Board{i}", 1000)
+            self.host.exposed_display_blackboard(f"Board{i}", f"Data{i}")
+        self.assertTrue(BlackBoardHost.compact_journal())
+        self.assertTrue(os.path.isfile(self.path + '.snapshot'))
+        self.assertFalse(os.path.exists(self.path + '.journal.compacting'))
+
+        # Only the records after the snapshot are in the journal
+        self.host.exposed_delete_blackboard("Board0")
+        self.host.exposed_display_blackboard("Board1", b"\x00")
+        with open(self.path + '.journal', 'r') as file:
+            self.assertEqual(3, len(file.readlines()))
+
+        boards = self.reload()
+        self.assertEqual(boards, BlackBoardHost._BlackBoardHost__boards)
+        self.assertEqual(19, len(boards))
+        self.assertEqual((True, b"\x00", True, boards["Board1"].version, "[INFO] Successfully read with valid data!"),
+                         self.host.exposed_read_blackboard_versioned("Board1"))
+
+        # The versions continue after the restart, also for a recreated Board
+        self.host.exposed_create_blackboard("Board0", 1000)
+        self.assertGreater(self.host.exposed_read_blackboard_versioned("Board0")[3],
+                           max(board.version for board in boards.values()))
+
+    def test_interrupted_compaction(self):
+        self.host.exposed_create_blackboard("Board", 1000)
+        self.host.exposed_display_blackboard("Board", "Old")
+        self.assertTrue(BlackBoardHost.compact_journal())
+        self.host.exposed_display_blackboard("Board", "New")
+        self.host.exposed_create_blackboard("Other", 1000)
+        BlackBoardHost.close_storage()
+
+        # Crash after the rotation, before the snapshot was written
+        snapshot_id = read_checkpoint(self.path + '.journal')
+        os.replace(self.path + '.journal', self.path + '.journal.compacting')
+        with open(self.path + '.journal', 'w') as file:
+            file.write('{"op":"checkpoint","id":"lost"}\n{"op":"delete","name":"Other"}\n')
+
+        BlackBoardHost._BlackBoardHost__boards = {}
+        BlackBoardHost.load_boards()
+        boards = BlackBoardHost._BlackBoardHost__boards
+        self.assertEqual(["Board"], list(boards))
+        self.assertEqual("New", boards["Board"].data)
+
+        # The compaction was finished on startup
+        self.assertFalse(os.path.exists(self.path + '.journal.compacting'))
+        self.assertNotEqual(snapshot_id, read_checkpoint(self.path + '.journal'))
+        self.assertEqual(boards, self.reload())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import unittest
+import os
+import tempfile
+import src.logger as logger
+from blackboard_server import BlackBoardHost
+from src.board_record import BoardRecord
+from src.storage import MemoryStorage, JsonStorage, JournalStorage
+
+
+class StorageBackendTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'boards')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_memory_storage(self):
+        storage = MemoryStorage(self.path)
+        self.assertFalse(storage.persistent)
+        storage.write([{"op": "create", "name": "Board", "valid_sec": 10, "entry_time": 1.0}],
+                      {"Board": BoardRecord(10, 1.0)})
+        self.assertEqual({}, storage.load())
+        self.assertEqual("Data", storage.offload("Board", "Data"))
+        self.assertEqual([], os.listdir(self.directory.name))
+
+    def test_json_storage(self):
+        storage = JsonStorage(self.path)
+        self.assertEqual({}, storage.load())
+        self.assertTrue(os.path.isfile(self.path + '.json'))
+
+        boards = {"Text": BoardRecord(10, 1.0, "Text", 3), "Binary": BoardRecord(5, 2.0, b"\x00\xff")}
+        storage.write([], boards)
+        self.assertEqual(boards, JsonStorage(self.path).load())
+
+    def test_journal_storage(self):
+        storage = JournalStorage(self.path, 2)
+        self.assertEqual({}, storage.load())
+        self.assertFalse(storage.needs_compaction())
+        storage.write([{"op": "create", "name": "Board", "valid_sec": 10, "entry_time": 1.0},
+                       {"op": "display", "name": "Board", "entry_time": 2.0, "data": "Data", "version": 1}], {})
+        self.assertTrue(storage.needs_compaction())
+
+        # Compaction: The checkpoint rotates the journal, the records after it continue the snapshot
+        boards = {"Board": BoardRecord(10, 2.0, "Data", 1)}
+        snapshot_id = storage.begin_compaction()
+        storage.write([{"op": "checkpoint", "id": snapshot_id},
+                       {"op": "clear", "name": "Board", "version": 2}], {})
+        self.assertTrue(storage.finish_compaction(snapshot_id, boards))
+        self.assertFalse(storage.needs_compaction())
+        storage.close()
+        self.assertEqual({"Board": BoardRecord(10, 2.0, None, 2)}, JournalStorage(self.path).load())
+
+
+class MemoryModeTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'boards')
+        logger.set_log_level("OFF")
+        BlackBoardHost.set_storage("memory")
+        BlackBoardHost.set_storage_path(self.path)
+        BlackBoardHost.load_boards()
+        self.host = BlackBoardHost()
+        self.host._BlackBoardHost__client_address = ('123.123.123.123', 52321)
+
+    def tearDown(self):
+        self.host.exposed_delete_all_blackboards()
+        BlackBoardHost.close_storage()
+        BlackBoardHost.set_storage("json")
+        BlackBoardHost.set_storage_path("boards")
+        logger.set_log_level("INFO")
+        self.directory.cleanup()
+
+    def test_nothing_persisted(self):
+        self.assertTrue(self.host.exposed_create_blackboard("Board", 1000)[0])
+        self.assertTrue(self.host.exposed_display_blackboard("Board", "Data")[0])
+        self.assertEqual("Data", self.host.exposed_read_blackboard("Board")[1])
+        self.assertEqual([], os.listdir(self.directory.name))
+
+        BlackBoardHost.close_storage()
+        BlackBoardHost.load_boards()
+        self.assertEqual({}, BlackBoardHost._BlackBoardHost__boards)
+
+
+class PersistenceErrorTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'boards')
+        logger.set_log_level("OFF")
+        BlackBoardHost.set_storage_path(self.path)
+        BlackBoardHost.load_boards()
+        self.host = BlackBoardHost()
+        self.host._BlackBoardHost__client_address = ('123.123.123.123', 52321)
+
+    def tearDown(self):
+        BlackBoardHost._BlackBoardHost__backend.path = self.path
+        self.host.exposed_delete_all_blackboards()
+        BlackBoardHost.close_storage()
+        BlackBoardHost.set_storage_path("boards")
+        logger.set_log_level("INFO")
+        self.directory.cleanup()
+
+    def test_write_error(self):
+        self.assertTrue(self.host.exposed_create_blackboard("Board", 1000)[0])
+        # The json file can't be written anymore, the change is not acknowledged
+        BlackBoardHost._BlackBoardHost__backend.path = os.path.join(self.directory.name, 'missing', 'boards')
+        self.assertEqual((False, "[ERROR] The change could not be persisted! It may be lost on a restart."),
+                         self.host.exposed_display_blackboard("Board", "Data"))
+
+
+if __name__ == '__main__':
+    unittest.main()